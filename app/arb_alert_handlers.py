@@ -0,0 +1,66 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from database import Database
+
+
+MIN_THRESHOLD_CENTS = 0.5
+MAX_THRESHOLD_CENTS = 50.0
+
+USAGE_TEXT = (
+    "Usage:\n"
+    "/arb_alerts <cents> – alert me when Opinion and Polymarket prices differ by at least this much\n"
+    "/arb_alerts off – stop alerts\n\n"
+    "Example: /arb_alerts 3"
+)
+
+db = Database()
+
+
+def _parse_threshold_cents(text: str):
+    try:
+        cents = float(text.strip().rstrip("¢c").replace(",", "."))
+    except ValueError:
+        return None
+    if not MIN_THRESHOLD_CENTS <= cents <= MAX_THRESHOLD_CENTS:
+        return None
+    return cents
+
+
+async def arb_alerts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    # The scanner brings numpy; load it only when the command is used.
+    from arbitrage_scanner import mapped_markets
+
+    telegram_id = update.message.from_user.id
+    markets = ", ".join(mapped_markets()) or "none yet"
+
+    if not context.args:
+        subscription = db.get_arb_subscription(telegram_id)
+        if subscription:
+            status = f"🔔 Arbitrage alerts are on at {subscription['threshold'] * 100:.1f}¢."
+        else:
+            status = "🔕 Arbitrage alerts are off."
+        await update.message.reply_text(f"{status}\nMarkets scanned: {markets}\n\n{USAGE_TEXT}")
+        return
+
+    argument = context.args[0].lower()
+    if argument in ("off", "stop"):
+        if db.remove_arb_subscription(telegram_id):
+            await update.message.reply_text("🔕 Arbitrage alerts turned off.")
+        else:
+            await update.message.reply_text("Arbitrage alerts were not on.")
+        return
+
+    cents = _parse_threshold_cents(argument)
+    if cents is None:
+        await update.message.reply_text(
+            f"Threshold must be a number of cents between {MIN_THRESHOLD_CENTS:g} and "
+            f"{MAX_THRESHOLD_CENTS:g}.\n\n{USAGE_TEXT}"
+        )
+        return
+
+    db.set_arb_subscription(telegram_id, cents / 100)
+    await update.message.reply_text(
+        f"🔔 You will be alerted when an Opinion vs Polymarket gap reaches {cents:.1f}¢.\n"
+        f"Markets scanned: {markets}"
+    )
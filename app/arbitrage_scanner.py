@@ -0,0 +1,139 @@
+"""
+Arbitrage Scanner
+In-memory Opinion vs Polymarket best asks with vectorized spread alerts
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from market_config import get_all_markets
+
+VENUES = ("opinion", "polymarket")
+SIDES = ("yes", "no")
+# Column of each (venue, side) best ask in ArbitrageBoard.prices
+COLUMNS = {(venue, side): 2 * v + s for v, venue in enumerate(VENUES) for s, side in enumerate(SIDES)}
+
+
+def mapped_markets(markets: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """Markets listed on both venues with known Polymarket CLOB tokens."""
+    mapped = {}
+    for alias, market in (markets if markets is not None else get_all_markets()).items():
+        tokens = market.get("clob_token_ids") or market.get("tokens") or {}
+        if not market.get("opinion_id") or not market.get("polymarket_id"):
+            continue
+        if any(not tokens.get(side) or tokens.get(side) == "TBD" for side in SIDES):
+            continue
+        mapped[alias] = market
+    return mapped
+
+
+class ArbitrageBoard:
+    """
+    Best YES/NO asks of every mapped market on both venues, one row per market.
+
+    Each update rewrites one cell; detect() then recomputes every market's gap
+    (largest |Opinion - Polymarket| over YES and NO) and hedge edge (1 minus the
+    cheapest cross-venue YES+NO cost) in one pass and compares the gaps against
+    every subscriber's threshold at once. An alert fires when a gap rises to a
+    subscriber's threshold and re-arms once it falls back below it; markets
+    missing a price keep their previous state.
+    """
+
+    def __init__(self, aliases: Iterable[str]):
+        self.aliases: List[str] = list(aliases)
+        self._rows = {alias: row for row, alias in enumerate(self.aliases)}
+        self.prices = np.full((len(self.aliases), len(COLUMNS)), np.nan)
+
+        self.subscribers: List[int] = []
+        self.thresholds = np.empty(0)
+        self._above = np.zeros((0, len(self.aliases)), dtype=bool)
+
+    def update(self, alias: str, venue: str, side: str, price: Optional[float]) -> bool:
+        """Store one best ask; returns whether it changed."""
+        row = self._rows.get(alias)
+        if row is None:
+            return False
+        value = np.nan if price is None else float(price)
+        column = COLUMNS[(venue, side)]
+        previous = self.prices[row, column]
+        if previous == value or (np.isnan(previous) and np.isnan(value)):
+            return False
+        self.prices[row, column] = value
+        return True
+
+    def spreads(self):
+        """(gap, edge) per market; NaN where a venue has no price."""
+        opinion, polymarket = self.prices[:, 0:2], self.prices[:, 2:4]
+        delta = np.abs(opinion - polymarket)
+        gap = np.fmax(delta[:, 0], delta[:, 1])
+        cost = np.fmin(opinion[:, 0] + polymarket[:, 1], polymarket[:, 0] + opinion[:, 1])
+        return gap, 1 - cost
+
+    def set_subscriptions(self, subscriptions: Iterable[Dict]) -> None:
+        """Replace subscribers; unchanged ones keep their armed state."""
+        previous = {
+            telegram_id: (threshold, self._above[row])
+            for row, (telegram_id, threshold) in enumerate(zip(self.subscribers, self.thresholds))
+        }
+        subscribers, thresholds, above = [], [], []
+        for subscription in subscriptions:
+            telegram_id = int(subscription["telegram_id"])
+            threshold = float(subscription["threshold"])
+            known = previous.get(telegram_id)
+            subscribers.append(telegram_id)
+            thresholds.append(threshold)
+            if known is not None and known[0] == threshold:
+                above.append(known[1])
+            else:
+                above.append(np.zeros(len(self.aliases), dtype=bool))
+
+        self.subscribers = subscribers
+        self.thresholds = np.array(thresholds, dtype=float)
+        self._above = np.array(above, dtype=bool).reshape(len(subscribers), len(self.aliases))
+
+    def rearm(self, telegram_id: int, alias: str) -> None:
+        """Let an alert that could not be delivered fire again on the next detect()."""
+        column = self._rows.get(alias)
+        if column is None or telegram_id not in self.subscribers:
+            return
+        self._above[self.subscribers.index(telegram_id), column] = False
+
+    def detect(self) -> List[Dict]:
+        """Alerts for every (subscriber, market) whose gap just crossed the threshold."""
+        if not self.subscribers or not self.aliases:
+            return []
+
+        gap, edge = self.spreads()
+        known = ~np.isnan(gap)
+        above = np.where(known, gap >= self.thresholds[:, None], self._above)
+        fired = above & ~self._above
+        self._above = above
+
+        rows, columns = np.nonzero(fired)
+        if not len(rows):
+            return []
+
+        thresholds = self.thresholds.tolist()
+        gaps, edges = gap.tolist(), edge.tolist()
+        prices = {column: self.row_prices(self.aliases[column]) for column in set(columns.tolist())}
+        return [
+            {
+                "telegram_id": self.subscribers[row],
+                "threshold": thresholds[row],
+                "alias": self.aliases[column],
+                "gap": gaps[column],
+                "edge": edges[column],
+                "prices": prices[column],
+            }
+            for row, column in zip(rows.tolist(), columns.tolist())
+        ]
+
+    def row_prices(self, alias: str) -> Dict[str, Dict[str, Optional[float]]]:
+        row = self.prices[self._rows[alias]]
+        return {
+            venue: {
+                side: None if np.isnan(row[COLUMNS[(venue, side)]]) else float(row[COLUMNS[(venue, side)]])
+                for side in SIDES
+            }
+            for venue in VENUES
+        }
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
+
+from arbitrage_scanner import ArbitrageBoard, SIDES, mapped_markets
+from database import Database
+from opinion_client import get_opinion_binary_prices
+from polymarket_market_feed import PolymarketMarketFeed
+from price_service import best_bid_ask, get_price_service
+from rate_limit import RateLimiter
+
+OPINION_POLL_SEC = float(os.getenv("ARB_OPINION_POLL_SEC", "5"))
+# Polymarket books are polled only while the market feed is down.
+POLYMARKET_FALLBACK_SEC = float(os.getenv("ARB_POLYMARKET_FALLBACK_SEC", "10"))
+SUBSCRIPTION_REFRESH_SEC = float(os.getenv("ARB_SUBSCRIPTION_REFRESH_SEC", "15"))
+# Alerts share the bot's ~30 msg/s Bot API budget.
+ALERTS_PER_SEC = float(os.getenv("ARB_ALERTS_PER_SEC", "20"))
+SEND_CONCURRENCY = int(os.getenv("ARB_SEND_CONCURRENCY", "8"))
+SEND_ATTEMPTS = 3
+
+
+def _cents(value: Optional[float]) -> str:
+    return f"{value * 100:.1f}¢" if value is not None else "N/A"
+
+
+def _price(value: Optional[float]) -> str:
+    return f"{value:.3f}" if value is not None else "N/A"
+
+
+def format_arb_alert(alert: Dict, market: Dict) -> str:
+    prices = alert["prices"]
+    lines = [
+        "*Arbitrage Alert*",
+        "",
+        f"{market.get('emoji', '')} {market.get('title', alert['alias'])}".strip(),
+        f"Gap: {_cents(alert['gap'])} (your threshold {_cents(alert['threshold'])})",
+        f"Opinion:    YES {_price(prices['opinion']['yes'])} | NO {_price(prices['opinion']['no'])}",
+        f"Polymarket: YES {_price(prices['polymarket']['yes'])} | NO {_price(prices['polymarket']['no'])}",
+    ]
+    if alert["edge"] > 0:
+        lines.append(f"YES + NO across venues costs {_cents(1 - alert['edge'])} ({_cents(alert['edge'])} edge)")
+    lines.extend(["", "Change or stop: /arb_alerts"])
+    return "\n".join(lines)
+
+
+class ArbitrageWorker:
+    """
+    Keeps both venues' best asks for every mapped market in an ArbitrageBoard
+    and alerts subscribers as soon as an update pushes a gap over their
+    threshold. Polymarket quotes stream from the market channel (REST books
+    while it is down); Opinion has no stream and is polled.
+    """
+
+    def __init__(self, telegram_token: str, db=None, markets: Optional[Dict[str, Dict]] = None):
+        self.db = db or Database()
+        request = HTTPXRequest(
+            connection_pool_size=SEND_CONCURRENCY,
+            pool_timeout=30.0,
+            connect_timeout=30.0,
+            read_timeout=30.0,
+        )
+        self.bot = Bot(token=telegram_token, request=request)
+        self.send_limiter = RateLimiter(ALERTS_PER_SEC, burst=max(1, int(ALERTS_PER_SEC)))
+        self.send_slots = asyncio.Semaphore(max(1, SEND_CONCURRENCY))
+        self.send_retry_delay = 1.0
+        self.markets = mapped_markets() if markets is None else markets
+        self.board = ArbitrageBoard(self.markets)
+
+        self.token_sides = {
+            str((market.get("clob_token_ids") or market["tokens"])[side]): (alias, side)
+            for alias, market in self.markets.items()
+            for side in SIDES
+        }
+        self.feed = PolymarketMarketFeed(list(self.token_sides), on_quote=self.on_polymarket_quote)
+        self.changed = asyncio.Event()
+        self.alerts_sent = 0
+
+        print(f"[Arb] Worker initialized for {len(self.markets)} markets: {', '.join(self.markets)}")
+
+    def on_polymarket_quote(self, asset_id: str, best_bid: Optional[float], best_ask: Optional[float]) -> None:
+        alias, side = self.token_sides[asset_id]
+        if self.board.update(alias, "polymarket", side, best_ask):
+            self.changed.set()
+
+    def apply_opinion_prices(self, alias: str, prices: Dict) -> None:
+        changed = False
+        for side in SIDES:
+            changed = self.board.update(alias, "opinion", side, prices.get(side)) or changed
+        if changed:
+            self.changed.set()
+
+    async def poll_opinion(self) -> None:
+        aliases = list(self.markets)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(get_opinion_binary_prices, self.markets[alias]["opinion_id"]) for alias in aliases),
+            return_exceptions=True,
+        )
+        for alias, result in zip(aliases, results):
+            if isinstance(result, Exception):
+                print(f"[Arb] Opinion price for '{alias}' failed: {result}")
+                continue
+            self.apply_opinion_prices(alias, result)
+
+    async def poll_polymarket_books(self) -> None:
+        books = await asyncio.to_thread(get_price_service().get_order_books, list(self.token_sides))
+        for asset_id, book in books.items():
+            if asset_id in self.token_sides:
+                self.on_polymarket_quote(asset_id, *best_bid_ask(book))
+
+    async def refresh_subscriptions(self) -> None:
+        subscriptions = await asyncio.to_thread(self.db.get_arb_subscriptions)
+        current = list(zip(self.board.subscribers, self.board.thresholds))
+        if [(row["telegram_id"], row["threshold"]) for row in subscriptions] != current:
+            # New or changed subscribers are checked against the current board right away.
+            self.board.set_subscriptions(subscriptions)
+            self.changed.set()
+
+    async def send_alert(self, alert: Dict) -> bool:
+        """Send one alert; False when it failed for a reason worth retrying later."""
+        telegram_id = alert["telegram_id"]
+        text = format_arb_alert(alert, self.markets[alert["alias"]])
+        parse_mode = "Markdown"
+        for attempt in range(SEND_ATTEMPTS):
+            await self.send_limiter.acquire()
+            try:
+                async with self.send_slots:
+                    await self.bot.send_message(chat_id=telegram_id, text=text, parse_mode=parse_mode)
+                self.alerts_sent += 1
+                return True
+            except RetryAfter as e:
+                # Flood control applies to the whole bot, so every send waits.
+                self.send_limiter.block_for(float(e.retry_after))
+            except Forbidden as e:
+                print(f"[Arb] Alert to {telegram_id} not allowed: {e}")
+                return True
+            except BadRequest as e:
+                if parse_mode is None:
+                    print(f"[Arb] Alert to {telegram_id} rejected: {e}")
+                    return True
+                # A market title broke the Markdown; plain text still carries the alert.
+                parse_mode = None
+            except TelegramError as e:
+                print(f"[Arb] Alert to {telegram_id} failed (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(self.send_retry_delay * (2 ** attempt))
+        return False
+
+    async def send_alerts(self, alerts: List[Dict]) -> None:
+        delivered = await asyncio.gather(*(self.send_alert(alert) for alert in alerts))
+        failed = [alert for alert, ok in zip(alerts, delivered) if not ok]
+        for alert in failed:
+            # detect() already marked it sent; let the next pass fire it again.
+            self.board.rearm(alert["telegram_id"], alert["alias"])
+        if failed:
+            self.changed.set()
+
+    async def detect_forever(self) -> None:
+        while True:
+            await self.changed.wait()
+            # Updates that land while alerts go out are folded into the next pass.
+            self.changed.clear()
+            started = time.perf_counter()
+            alerts = self.board.detect()
+            if alerts:
+                print(
+                    f"[Arb] {len(alerts)} alert(s) detected in "
+                    f"{(time.perf_counter() - started) * 1000:.2f}ms"
+                )
+                await self.send_alerts(alerts)
+
+    async def _every(self, interval: float, step, name: str, when=lambda: True) -> None:
+        while True:
+            if when():
+                try:
+                    await step()
+                except Exception as e:
+                    print(f"[Arb] {name} failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def run(self) -> None:
+        if not self.markets:
+            print("[Arb] No markets are mapped on both venues; nothing to scan.")
+            return
+
+        print(
+            f"[Arb] Worker started at {datetime.now().strftime('%H:%M:%S')} "
+            f"(Opinion every {OPINION_POLL_SEC:g}s, Polymarket via market feed)"
+        )
+        tasks = [
+            asyncio.create_task(self.feed.run()),
+            asyncio.create_task(self.detect_forever()),
+            asyncio.create_task(self._every(OPINION_POLL_SEC, self.poll_opinion, "Opinion poll")),
+            asyncio.create_task(self._every(
+                POLYMARKET_FALLBACK_SEC,
+                self.poll_polymarket_books,
+                "Polymarket book poll",
+                when=lambda: not self.feed.connected,
+            )),
+            asyncio.create_task(self._every(
+                SUBSCRIPTION_REFRESH_SEC, self.refresh_subscriptions, "Subscription refresh"
+            )),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.feed.close()
+
+
+async def main():
+    telegram_token = os.getenv("TELEGRAM_TOKEN")
+
+    if not telegram_token:
+        print("[Arb] TELEGRAM_TOKEN not found in environment.")
+        return
+
+    worker = ArbitrageWorker(telegram_token)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print("=" * 60)
+    print("OpiPoliX Arbitrage Worker")
+    print("=" * 60)
+
+    asyncio.run(main())
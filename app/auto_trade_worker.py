@@ -12,6 +12,7 @@ from wallet_manager import WalletManager
 from market_config import get_market
 from clob_trading import trade_market
 from worker_health import get_monitor
+from balance_cache import invalidate_wallet_snapshot
 
 
 class AutoTradeWorker:
@@ -123,6 +124,7 @@ class AutoTradeWorker:
                 if result['status'] == 'success':
                     
                     print(f"✅ Order executed successfully on attempt {attempt}")
+                    invalidate_wallet_snapshot(wallet['safe_address'])
                     
                     await self.send_notification(
                         telegram_id,
@@ -0,0 +1,200 @@
+"""
+Balance Snapshot Cache
+Short-lived per-Safe cache for USDC and positions snapshots
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+SNAPSHOT_TTL_SEC = float(os.getenv("BALANCE_SNAPSHOT_TTL_SEC", "20"))
+SNAPSHOT_MAX_STALE_SEC = float(os.getenv("BALANCE_SNAPSHOT_MAX_STALE_SEC", "180"))
+# How often other processes' invalidations are pulled from the database.
+INVALIDATION_REFRESH_SEC = float(os.getenv("BALANCE_INVALIDATION_REFRESH_SEC", "5"))
+# Each poll re-reads this much history so a marker committed late is not skipped.
+INVALIDATION_OVERLAP_SEC = 30.0
+
+CacheKey = Tuple[str, str, str]
+
+
+def _normalize_address(address: Optional[str]) -> str:
+    return str(address or "").strip().lower()
+
+
+class BalanceSnapshotCache:
+    """
+    Per-Safe snapshot cache.
+
+    Fresh entries (younger than ttl_sec) are returned as is. Expired entries are
+    still returned up to max_stale_sec while a background refresh runs. Entries
+    fetched before the wallet was invalidated are never served: local
+    invalidations apply at once, other processes' ones (changes_lookup) are
+    polled every changes_refresh_sec.
+    """
+
+    def __init__(
+        self,
+        ttl_sec: float = SNAPSHOT_TTL_SEC,
+        max_stale_sec: float = SNAPSHOT_MAX_STALE_SEC,
+        changes_lookup: Optional[Callable[[float], Dict[str, float]]] = None,
+        changes_refresh_sec: float = INVALIDATION_REFRESH_SEC,
+    ):
+        self.ttl_sec = ttl_sec
+        self.max_stale_sec = max(max_stale_sec, ttl_sec)
+        self.changes_refresh_sec = changes_refresh_sec
+        self._changes_lookup = changes_lookup
+        self._entries: Dict[CacheKey, Tuple[Any, float]] = {}
+        # address -> when its balances last changed (epoch seconds)
+        self._changed_at: Dict[str, float] = {}
+        # Nothing older than max_stale_sec can be served, so older changes never matter.
+        self._changes_since = time.time() - self.max_stale_sec
+        self._changes_polled_at: Optional[float] = None
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="balance-refresh")
+
+    def _poll_changes(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            polled_at = self._changes_polled_at
+            if polled_at is not None and now - polled_at < self.changes_refresh_sec:
+                return
+            self._changes_polled_at = now
+            since = self._changes_since
+            horizon = time.time() - self.max_stale_sec
+            for address in [a for a, changed_at in self._changed_at.items() if changed_at < horizon]:
+                del self._changed_at[address]
+
+        if not self._changes_lookup:
+            return
+        try:
+            changes = self._changes_lookup(since - INVALIDATION_OVERLAP_SEC)
+        except Exception as e:
+            print(f"Balance cache invalidation lookup failed: {e}")
+            return
+
+        with self._lock:
+            for address, changed_at in changes.items():
+                address = _normalize_address(address)
+                if changed_at > self._changed_at.get(address, 0.0):
+                    self._changed_at[address] = changed_at
+                self._changes_since = max(self._changes_since, changed_at)
+
+    def _changed_at_for(self, address: str) -> Optional[float]:
+        self._poll_changes()
+        with self._lock:
+            return self._changed_at.get(address)
+
+    def get(
+        self,
+        kind: str,
+        address: Optional[str],
+        loader: Callable[[], Any],
+        key_extra: Optional[str] = None,
+    ) -> Any:
+        """Return cached snapshot for (kind, address) or load it with loader()."""
+        normalized = _normalize_address(address)
+        key = (kind, normalized, _normalize_address(key_extra))
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            changed_at = self._changed_at_for(normalized)
+            if changed_at is None or changed_at < fetched_at:
+                age = time.time() - fetched_at
+                if age < self.ttl_sec:
+                    return value
+                if age < self.max_stale_sec:
+                    self._schedule_refresh(key, loader)
+                    return value
+
+        return self._load(key, loader)
+
+    def _load(self, key: CacheKey, loader: Callable[[], Any]) -> Any:
+        # Timestamp taken before loading so an invalidation that lands mid-fetch
+        # still marks the result as outdated.
+        started_at = time.time()
+        value = loader()
+        if value is not None:
+            with self._lock:
+                current = self._entries.get(key)
+                if current is None or current[1] <= started_at:
+                    self._entries[key] = (value, started_at)
+        return value
+
+    def _schedule_refresh(self, key: CacheKey, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, loader)
+
+    def _refresh(self, key: CacheKey, loader: Callable[[], Any]) -> None:
+        try:
+            self._load(key, loader)
+        except Exception as e:
+            print(f"Background balance refresh failed for {key[0]}:{key[1]}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, address: Optional[str]) -> None:
+        normalized = _normalize_address(address)
+        if not normalized:
+            return
+        with self._lock:
+            # Also outdates loads that are still in flight.
+            self._changed_at[normalized] = time.time()
+            for key in [k for k in self._entries if k[1] == normalized]:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[BalanceSnapshotCache] = None
+_cache_lock = threading.Lock()
+_db = None
+
+
+def _get_db():
+    global _db
+    if _db is None:
+        from database import Database
+        _db = Database()
+    return _db
+
+
+def _lookup_changes(since: float) -> Dict[str, float]:
+    return _get_db().get_wallet_changes_since(since)
+
+
+def get_snapshot_cache() -> BalanceSnapshotCache:
+    """Get the process-wide snapshot cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = BalanceSnapshotCache(changes_lookup=_lookup_changes)
+    return _cache
+
+
+def invalidate_wallet_snapshot(safe_address: Optional[str]) -> None:
+    """
+    Drop cached snapshots for a wallet after a trade or withdrawal.
+    The marker is also stored in the database so other processes
+    (auto-trade worker, bot) stop serving their copies.
+    """
+    normalized = _normalize_address(safe_address)
+    if not normalized:
+        return
+
+    get_snapshot_cache().invalidate(normalized)
+    try:
+        _get_db().mark_wallet_changed(normalized, time.time())
+    except Exception as e:
+        print(f"Failed to persist balance invalidation for {normalized}: {e}")
@@ -5,11 +5,12 @@ Balance Checker для OpiPoliX бота
 import os
 import time
 import math
-from typing import Dict, Optional
-from web3 import Web3
+import threading
+from typing import Dict, Optional, Tuple
 from dotenv import load_dotenv
 import requests
-from integrations.dome_client import DomeClient
+from balance_cache import get_snapshot_cache
+from price_service import get_price_service
 
 load_dotenv()
 
@@ -17,6 +18,15 @@ load_dotenv()
 POLYGON_RPC = os.environ.get("POLY_RPC_URL") or os.environ.get("POLYGON_RPC", "https://polygon-rpc.com")
 POLY_DATA_API_BASE = os.environ.get("POLY_DATA_API_BASE_URL", "https://data-api.polymarket.com")
 
+# Dome market-price fallback cache, shared by all BalanceChecker instances
+DOME_PRICE_TTL_SEC = 60.0
+_DOME_PRICE_CACHE: Dict[str, Tuple[Optional[float], float]] = {}
+_DOME_PRICE_LOCK = threading.Lock()
+
+# Long-lived checkers (one Web3 provider each), keyed by enable_dome
+_CHECKERS: Dict[bool, "BalanceChecker"] = {}
+_CHECKERS_LOCK = threading.Lock()
+
 # Contract addresses (Polygon Mainnet)
 USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 CTF_ADDRESS = "0x4d97dcd97ec945f40cf65f87097ace5ea0476045"
@@ -66,6 +76,10 @@ class BalanceChecker:
     
     
     def __init__(self, enable_dome: bool = True):
+        # web3 and the Dome client (aiohttp) are slow to import; processes that
+        # never check balances skip them.
+        from web3 import Web3
+
         self.w3 = Web3(Web3.HTTPProvider(POLYGON_RPC))
         
         
@@ -105,11 +119,13 @@ class BalanceChecker:
                 if token_id != "TBD":
                     self.token_to_market[str(token_id)] = (market_name, side)
 
+        self.price_service = get_price_service()
         self.dome_client = None
-        self._dome_price_cache: Dict[str, Optional[float]] = {}
         if enable_dome:
             try:
-                self.dome_client = DomeClient()
+                from integrations.dome_client import get_dome_client
+
+                self.dome_client = get_dome_client()
             except Exception as e:
                 print(f"Dome client unavailable, fallback to on-chain: {e}")
 
@@ -157,16 +173,18 @@ class BalanceChecker:
             return None
 
     def get_token_price_via_dome(self, token_id: str) -> Optional[float]:
-        """Get token price from Dome market-price endpoint with local cache."""
+        """Get token price from Dome market-price endpoint with shared TTL cache."""
         token_key = str(token_id or "").strip()
         if not token_key:
             return None
 
-        if token_key in self._dome_price_cache:
-            return self._dome_price_cache[token_key]
+        now = time.monotonic()
+        with _DOME_PRICE_LOCK:
+            cached = _DOME_PRICE_CACHE.get(token_key)
+        if cached and cached[1] > now:
+            return cached[0]
 
         if not self.dome_client:
-            self._dome_price_cache[token_key] = None
             return None
 
         try:
@@ -178,7 +196,8 @@ class BalanceChecker:
         if price is not None and price < 0:
             price = None
 
-        self._dome_price_cache[token_key] = price
+        with _DOME_PRICE_LOCK:
+            _DOME_PRICE_CACHE[token_key] = (price, time.monotonic() + DOME_PRICE_TTL_SEC)
         return price
 
     @staticmethod
@@ -301,6 +320,22 @@ class BalanceChecker:
 
         token_metrics = self.get_position_metrics_via_polymarket(proxy_wallet)
 
+        # Tokens without a Data API value are priced in one batched CLOB call.
+        tokens_to_price = []
+        for market_name, market_positions in positions.items():
+            for side in ("yes", "no"):
+                if float(market_positions.get(side, 0) or 0) <= 0:
+                    continue
+                token_id = MARKET_TOKENS.get(market_name, {}).get(side)
+                if not token_id or token_id == "TBD":
+                    continue
+                metric_value = self._coerce_float(
+                    token_metrics.get(str(token_id), {}).get("current_value")
+                )
+                if metric_value is None or metric_value < 0:
+                    tokens_to_price.append(str(token_id))
+        batch_prices = self.price_service.get_prices(tokens_to_price)
+
         for market_name, market_positions in positions.items():
             for side in ("yes", "no"):
                 raw_shares = float(market_positions.get(side, 0) or 0)
@@ -320,7 +355,9 @@ class BalanceChecker:
                 metric_value = self._coerce_float(metric.get("current_value"))
                 price = None
                 if metric_value is None or metric_value < 0:
-                    price = self.get_token_price_via_dome(token_id)
+                    price = batch_prices.get(token_key)
+                    if price is None:
+                        price = self.get_token_price_via_dome(token_id)
                 if metric_value is not None and metric_value >= 0:
                     usd_value = metric_value
                 elif price is not None:
@@ -354,7 +391,7 @@ class BalanceChecker:
             "outcomes_with_position": outcomes_with_position,
             "outcomes_with_price": outcomes_with_price,
             "outcomes_with_pnl": outcomes_with_pnl,
-            "price_source": "dome_market_price",
+            "price_source": "clob_prices",
             "pnl_source": "polymarket_positions",
         }
 
@@ -364,7 +401,7 @@ class BalanceChecker:
             return 0.0
 
         try:
-            checksum_address = Web3.to_checksum_address(address)
+            checksum_address = self.w3.to_checksum_address(address)
         except Exception as e:
             print(f"Error checksum address: {e}")
             return 0.0
@@ -388,7 +425,7 @@ class BalanceChecker:
     
     def get_position_balance(self, address: str, token_id: str, retry_count: int = 3) -> float:
         """Get position balance with retry logic for rate limiting"""
-        checksum_address = Web3.to_checksum_address(address)
+        checksum_address = self.w3.to_checksum_address(address)
 
         for attempt in range(retry_count):
             try:
@@ -419,7 +456,7 @@ class BalanceChecker:
         if market_name not in MARKET_TOKENS:
             return {"yes": 0.0, "no": 0.0, "yes_usd": 0.0, "no_usd": 0.0}
 
-        checksum_address = Web3.to_checksum_address(address)
+        checksum_address = self.w3.to_checksum_address(address)
         yes_token = MARKET_TOKENS[market_name]['yes']
         no_token = MARKET_TOKENS[market_name]['no']
 
@@ -432,8 +469,9 @@ class BalanceChecker:
         yes_shares = yes_balance / 1e6
         no_shares = no_balance / 1e6
 
-        yes_price = self.get_token_price(yes_token)
-        no_price = self.get_token_price(no_token)
+        prices = self.price_service.get_prices([yes_token, no_token])
+        yes_price = prices.get(str(yes_token)) or 0.0
+        no_price = prices.get(str(no_token)) or 0.0
 
         yes_usd = yes_shares * yes_price if yes_price > 0 else 0
         no_usd = no_shares * no_price if no_price > 0 else 0
@@ -446,45 +484,10 @@ class BalanceChecker:
         }
 
     def get_token_price(self, token_id: str) -> float:
-        """Get current price of token from Polymarket CLOB API"""
+        """Get current price of token (batched CLOB prices with book midpoint fallback)"""
         try:
-            # Use CLOB API to get price
-            response = requests.get(
-                f"https://clob.polymarket.com/prices-history",
-                params={
-                    "interval": "1m",
-                    "market": token_id,
-                    "fidelity": 1
-                },
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0:
-                    # Get latest price
-                    latest = data[-1]
-                    price = float(latest.get('price', 0))
-                    return price
-            
-            # Fallback: try orderbook
-            response = requests.get(
-                f"https://clob.polymarket.com/book",
-                params={"token_id": token_id},
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                book = response.json()
-                # Mid price = (best_bid + best_ask) / 2
-                if book.get('bids') and book.get('asks'):
-                    best_bid = float(book['bids'][0]['price']) if book['bids'] else 0
-                    best_ask = float(book['asks'][0]['price']) if book['asks'] else 0
-                    if best_bid > 0 and best_ask > 0:
-                        return (best_bid + best_ask) / 2
-            
-            return 0.0
-            
+            price = self.price_service.get_price(token_id)
+            return price if price is not None else 0.0
         except Exception as e:
             print(f"Error getting token price: {e}")
             return 0.0
@@ -644,8 +647,18 @@ def format_balance_message(balance: Dict) -> str:
     positions = balance['positions']
     has_positions = False
     
-    # Get prices for calculation
-    checker = BalanceChecker()
+    # Get prices for calculation (one batched request for every held outcome)
+    held_tokens = [
+        MARKET_TOKENS[market_name][side]
+        for market_name, market_positions in positions.items()
+        if market_name in MARKET_TOKENS
+        for side in ("yes", "no")
+        if float(market_positions.get(side, 0) or 0) > 0
+    ]
+    prices = get_price_service().get_prices(held_tokens)
+
+    def price_of(token_id: str) -> float:
+        return prices.get(str(token_id)) or 0.0
     
     lines.append("*Positions:*")
     
@@ -658,7 +671,7 @@ def format_balance_message(balance: Dict) -> str:
         if mm_yes > 0:
             # Convert raw balance to actual shares (divide by 1e6)
             shares = mm_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['metamask']['yes'])
+            price = price_of(MARKET_TOKENS['metamask']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -666,7 +679,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if mm_no > 0:
             shares = mm_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['metamask']['no'])
+            price = price_of(MARKET_TOKENS['metamask']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -681,7 +694,7 @@ def format_balance_message(balance: Dict) -> str:
         lines.append("  Base:")
         if base_yes > 0:
             shares = base_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['base']['yes'])
+            price = price_of(MARKET_TOKENS['base']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -689,7 +702,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if base_no > 0:
             shares = base_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['base']['no'])
+            price = price_of(MARKET_TOKENS['base']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -704,7 +717,7 @@ def format_balance_message(balance: Dict) -> str:
         lines.append("  Abstract:")
         if abstract_yes > 0:
             shares = abstract_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['abstract']['yes'])
+            price = price_of(MARKET_TOKENS['abstract']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -712,7 +725,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if abstract_no > 0:
             shares = abstract_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['abstract']['no'])
+            price = price_of(MARKET_TOKENS['abstract']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -727,7 +740,7 @@ def format_balance_message(balance: Dict) -> str:
         lines.append("  Extended:")
         if extended_yes > 0:
             shares = extended_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['extended']['yes'])
+            price = price_of(MARKET_TOKENS['extended']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -735,7 +748,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if extended_no > 0:
             shares = extended_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['extended']['no'])
+            price = price_of(MARKET_TOKENS['extended']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -750,7 +763,7 @@ def format_balance_message(balance: Dict) -> str:
         lines.append("  MegaETH:")
         if megaeth_yes > 0:
             shares = megaeth_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['megaeth']['yes'])
+            price = price_of(MARKET_TOKENS['megaeth']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -758,7 +771,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if megaeth_no > 0:
             shares = megaeth_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['megaeth']['no'])
+            price = price_of(MARKET_TOKENS['megaeth']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -773,7 +786,7 @@ def format_balance_message(balance: Dict) -> str:
         lines.append("  Opinion Token:")
         if opinion_yes > 0:
             shares = opinion_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['opinion']['yes'])
+            price = price_of(MARKET_TOKENS['opinion']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -781,7 +794,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if opinion_no > 0:
             shares = opinion_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['opinion']['no'])
+            price = price_of(MARKET_TOKENS['opinion']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -796,7 +809,7 @@ def format_balance_message(balance: Dict) -> str:
         lines.append("  OpenSea Token:")
         if opensea_yes > 0:
             shares = opensea_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['opensea']['yes'])
+            price = price_of(MARKET_TOKENS['opensea']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -804,7 +817,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if opensea_no > 0:
             shares = opensea_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['opensea']['no'])
+            price = price_of(MARKET_TOKENS['opensea']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -819,7 +832,7 @@ def format_balance_message(balance: Dict) -> str:
         lines.append("  Opinion FDV:")
         if fdv_yes > 0:
             shares = fdv_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['opinion_fdv']['yes'])
+            price = price_of(MARKET_TOKENS['opinion_fdv']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -827,7 +840,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if fdv_no > 0:
             shares = fdv_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['opinion_fdv']['no'])
+            price = price_of(MARKET_TOKENS['opinion_fdv']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -842,7 +855,7 @@ def format_balance_message(balance: Dict) -> str:
         lines.append("  Opensea FDV:")
         if opensea_yes > 0:
             shares = opensea_yes / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['opensea_fdv']['yes'])
+            price = price_of(MARKET_TOKENS['opensea_fdv']['yes'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    YES: {shares:.2f} shares (~${usd_value:.2f})")
@@ -850,7 +863,7 @@ def format_balance_message(balance: Dict) -> str:
                 lines.append(f"    YES: {shares:.2f} shares")
         if opensea_no > 0:
             shares = opensea_no / 1e6
-            price = checker.get_token_price(MARKET_TOKENS['opensea_fdv']['no'])
+            price = price_of(MARKET_TOKENS['opensea_fdv']['no'])
             usd_value = shares * price if price > 0 else 0
             if usd_value > 0:
                 lines.append(f"    NO: {shares:.2f} shares (~${usd_value:.2f})")
@@ -980,27 +993,48 @@ def format_positions_only_message(data: Dict) -> str:
     return "\n".join(lines).strip()
 
 
+def get_balance_checker(enable_dome: bool = True) -> BalanceChecker:
+    """Shared BalanceChecker, created on first use and reused across handlers and threads."""
+    with _CHECKERS_LOCK:
+        checker = _CHECKERS.get(enable_dome)
+        if checker is None:
+            checker = BalanceChecker(enable_dome=enable_dome)
+            _CHECKERS[enable_dome] = checker
+        return checker
+
+
 def check_user_usdc_balance(eoa_address: str, safe_address: str = None) -> str:
-    """Fast path: only fetch USDC balances."""
-    checker = BalanceChecker(enable_dome=False)
+    """Fast path: only fetch USDC balances (cached per Safe)."""
 
-    eoa_usdc = checker.get_usdc_balance(eoa_address)
-    safe_usdc = checker.get_usdc_balance(safe_address) if safe_address else 0.0
+    def load() -> Dict:
+        checker = get_balance_checker(enable_dome=False)
+        eoa_usdc = checker.get_usdc_balance(eoa_address)
+        safe_usdc = checker.get_usdc_balance(safe_address) if safe_address else 0.0
+        return {
+            "eoa_usdc": eoa_usdc,
+            "safe_usdc": safe_usdc,
+            "total_usdc": eoa_usdc + safe_usdc,
+        }
 
-    return format_usdc_only_message({
-        "eoa_usdc": eoa_usdc,
-        "safe_usdc": safe_usdc,
-        "total_usdc": eoa_usdc + safe_usdc,
-    })
+    balance = get_snapshot_cache().get(
+        "usdc",
+        safe_address or eoa_address,
+        load,
+        key_extra=eoa_address,
+    )
+    return format_usdc_only_message(balance)
 
 
 def check_user_positions_only(safe_address: str = None) -> str:
-    """Fetch positions only (Dome first, no USDC RPC calls)."""
+    """Fetch positions only (Dome first, no USDC RPC calls, cached per Safe)."""
     if not safe_address:
         return "Safe wallet is not deployed yet.\nDeploy Safe first to track positions."
 
-    checker = BalanceChecker()
-    snapshot = checker.get_positions_snapshot_via_dome(safe_address)
+    def load() -> Dict | None:
+        checker = get_balance_checker()
+        return checker.get_positions_snapshot_via_dome(safe_address)
+
+    snapshot = get_snapshot_cache().get("positions", safe_address, load)
 
     if snapshot is None:
         return "Could not load positions from Dome API right now.\nPlease try again in a few seconds."
@@ -1011,6 +1045,6 @@ def check_user_positions_only(safe_address: str = None) -> str:
 # Helper function
 def check_user_balance(eoa_address: str, safe_address: str = None) -> str:
   
-    checker = BalanceChecker()
+    checker = get_balance_checker()
     balance = checker.get_full_balance(eoa_address, safe_address)
     return format_balance_message(balance)
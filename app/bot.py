@@ -1,6 +1,6 @@
 import os
 import asyncio
-import requests
+import logging
 from telegram import (
     Update,
     ReplyKeyboardMarkup,
@@ -8,6 +8,7 @@ from telegram import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
 )
+from telegram.error import TelegramError
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -19,14 +20,18 @@ from telegram.ext import (
 
 from opinion_client import get_opinion_binary_prices
 from polymarket_client import get_polymarket_binary_prices
+from spread_matrix import SpreadMatrix, format_spread_matrix
 
 
 from wallet_manager import WalletManager
 from balance_checker import check_user_usdc_balance, check_user_positions_only
+from balance_cache import invalidate_wallet_snapshot
+from price_service import best_bid_ask, get_price_service
 from withdraw_manager import withdraw_usdc_from_safe
 from market_config import get_market, get_all_markets, is_market_ready
 from clob_trading import trade_market
-from balance_checker import BalanceChecker
+from trade_queue import TradeQueue, TradeQueueFull
+from balance_checker import get_balance_checker
 
 
 from auto_trade_handlers import (
@@ -71,8 +76,11 @@ from widget_handlers import (
     widget_resume_command,
 )
 from cancel_order_handler import cancel_auto_order
+from arb_alert_handlers import arb_alerts_command
 from agent_handlers import show_agent_menu_message, handle_agent_input, AGENT_HANDLERS
 
+logger = logging.getLogger(__name__)
+
 TOKEN = os.environ.get("TELEGRAM_TOKEN")
 
 
@@ -92,11 +100,14 @@ HELP_TEXT = (
     "/o_markets – show active Opinion markets\n"
     "/p_markets – show active Polymarket markets\n"
     "/widget – open Telegram Widget menu\n"
+    "/spread – spread matrix for all tracked markets\n"
     "/spread <alias> – spread check (metamask / base)\n"
+    "/arb_alerts <cents> – alert me on Opinion vs Polymarket gaps\n"
     "/wallet – show your trading wallet\n"
     "/balance – check your balance\n"
     "/deploy_safe – deploy Safe wallet (if not done automatically)\n\n"
     "Examples:\n"
+    "/spread\n"
     "/spread metamask\n"
     "/spread base\n"
 )
@@ -147,6 +158,14 @@ COMMON_MARKETS = [
     },
 ]
 
+SPREAD_MATRIX = SpreadMatrix({
+    "opinion": get_opinion_binary_prices,
+    "polymarket": get_polymarket_binary_prices,
+})
+
+# Manual trades run here, in order per user, so handlers answer right away
+TRADE_QUEUE = TradeQueue()
+
 
 BTN_SPREAD_TGE = "✨ Spread TGE Tokens ✨"
 BTN_TGE_ALERTS = TGE_ALERTS_MENU_TEXT
@@ -184,25 +203,27 @@ def format_tx_hash(tx_hash):
     return "`—`"
 
 
-def get_orderbook_spread(token_id: str) -> tuple[float | None, float | None, float | None]:
-    """Return best bid/ask spread for a token from Polymarket CLOB."""
-    try:
-        resp = requests.get(
-            "https://clob.polymarket.com/book",
-            params={"token_id": token_id},
-            timeout=5,
-        )
-        resp.raise_for_status()
-        book = resp.json() if resp.content else {}
-
-        bids = book.get("bids") or []
-        asks = book.get("asks") or []
+def format_setup_transactions(result: dict) -> str:
+    """Transaction list and timing of a Safe deploy + approvals setup"""
+    tx_lines = []
+    if result.get('safe_tx_hash'):
+        tx_lines.append(f"• Safe deploy: {format_tx_hash(result['safe_tx_hash'])}")
+    if result.get('approvals_tx_hash'):
+        tx_lines.append(f"• USDC + CTF approve: {format_tx_hash(result['approvals_tx_hash'])}")
+    
+    tx_text = "\n".join(tx_lines) if tx_lines else "All transactions completed"
+    
+    timings = result.get('timings')
+    if timings:
+        tx_text += f"\n⏱️ Done in {timings['total']:.0f}s"
+    return tx_text
 
-        bid_prices = [float(b.get("price", 0)) for b in bids if b.get("price") is not None]
-        ask_prices = [float(a.get("price", 0)) for a in asks if a.get("price") is not None]
 
-        best_bid = max(bid_prices) if bid_prices else None
-        best_ask = min(ask_prices) if ask_prices else None
+def get_orderbook_spread(token_id: str) -> tuple[float | None, float | None, float | None]:
+    """Return best bid/ask spread for a token from Polymarket CLOB (shared book cache)."""
+    try:
+        book = get_price_service().get_order_book(token_id)
+        best_bid, best_ask = best_bid_ask(book)
 
         # Normalize if API returns cents (e.g., 12 instead of 0.12)
         max_price = max(p for p in [best_bid, best_ask] if p is not None)
@@ -497,21 +518,28 @@ async def _spread_for_alias(update: Update, context: ContextTypes.DEFAULT_TYPE,
 
     await update.message.reply_text(f"⏳ Checking spread for '{alias}'...")
 
+    # Opinion and Polymarket are fetched concurrently, off the event loop
+    op_result, poly_result = await asyncio.gather(
+        asyncio.to_thread(get_opinion_binary_prices, market["opinion_id"]),
+        asyncio.to_thread(get_polymarket_binary_prices, market["polymarket_id"]),
+        return_exceptions=True,
+    )
+
     # Opinion
-    try:
-        op_prices = get_opinion_binary_prices(market["opinion_id"])
-        op_error = None
-    except Exception as e:
+    if isinstance(op_result, Exception):
         op_prices = {"yes": None, "no": None}
-        op_error = str(e)
+        op_error = str(op_result)
+    else:
+        op_prices = op_result
+        op_error = None
 
     # Polymarket
-    try:
-        poly_prices = get_polymarket_binary_prices(market["polymarket_id"])
-        poly_error = None
-    except Exception as e:
+    if isinstance(poly_result, Exception):
         poly_prices = {"yes": None, "no": None}
-        poly_error = str(e)
+        poly_error = str(poly_result)
+    else:
+        poly_prices = poly_result
+        poly_error = None
 
     lines = [
         f"🧠 Spread for '{alias}' ({market['title']})\n",
@@ -543,9 +571,8 @@ async def _spread_for_alias(update: Update, context: ContextTypes.DEFAULT_TYPE,
 
 async def spread(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not context.args:
-        return await update.message.reply_text(
-            "⚠ Usage: /spread <alias>\nExamples:\n/spread metamask\n/spread base"
-        )
+        rows = await SPREAD_MATRIX.get_rows(COMMON_MARKETS)
+        return await update.message.reply_text(format_spread_matrix(rows))
     await _spread_for_alias(update, context, context.args[0])
 
 
@@ -570,7 +597,7 @@ async def trading_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         
         try:
             # 1. Create EOA wallet
-            wallet = wallet_manager.create_wallet_for_user(telegram_id)
+            wallet = await asyncio.to_thread(wallet_manager.create_wallet_for_user, telegram_id)
             
             await update.message.reply_text(
                 "✅ EOA Wallet created!\n\n"
@@ -581,19 +608,11 @@ async def trading_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             )
             
             # 2. AUTOMATICALLY deploy Safe
-            result = wallet_manager.deploy_safe_and_setup(telegram_id)
+            result = await asyncio.to_thread(wallet_manager.deploy_safe_and_setup, telegram_id)
             
             if result['status'] == 'success':
                 # Success! Format transaction list
-                tx_lines = []
-                if result.get('safe_tx_hash'):
-                    tx_lines.append(f"• Safe deploy: {format_tx_hash(result['safe_tx_hash'])}")
-                if result.get('usdc_tx_hash'):
-                    tx_lines.append(f"• USDC approve: {format_tx_hash(result['usdc_tx_hash'])}")
-                if result.get('ctf_tx_hash'):
-                    tx_lines.append(f"• CTF approve: {format_tx_hash(result['ctf_tx_hash'])}")
-                
-                tx_text = "\n".join(tx_lines) if tx_lines else "All transactions completed"
+                tx_text = format_setup_transactions(result)
                 
                 await update.message.reply_text(
                     "🎉 *Wallet Setup Complete!*\n\n"
@@ -703,19 +722,11 @@ async def deploy_safe_wallet(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     try:
         
-        result = wallet_manager.deploy_safe_and_setup(telegram_id)
+        result = await asyncio.to_thread(wallet_manager.deploy_safe_and_setup, telegram_id)
         
         if result['status'] == 'success':
             
-            tx_lines = []
-            if result.get('safe_tx_hash'):
-                tx_lines.append(f"• Safe deploy: {format_tx_hash(result['safe_tx_hash'])}")
-            if result.get('usdc_tx_hash'):
-                tx_lines.append(f"• USDC approve: {format_tx_hash(result['usdc_tx_hash'])}")
-            if result.get('ctf_tx_hash'):
-                tx_lines.append(f"• CTF approve: {format_tx_hash(result['ctf_tx_hash'])}")
-            
-            tx_text = "\n".join(tx_lines) if tx_lines else "All transactions completed"
+            tx_text = format_setup_transactions(result)
             
             await update.message.reply_text(
                 "🎉 *Safe Deployed Successfully!*\n\n"
@@ -909,7 +920,8 @@ async def withdraw_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         private_key = wallet_manager.get_private_key(telegram_id)
         
         
-        result = withdraw_usdc_from_safe(
+        result = await asyncio.to_thread(
+            withdraw_usdc_from_safe,
             user_private_key=private_key,
             recipient_address=recipient,
             amount_usdc=amount,
@@ -917,6 +929,7 @@ async def withdraw_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         )
         
         if result['status'] == 'success':
+            invalidate_wallet_snapshot(wallet['safe_address'])
             await update.message.reply_text(
                 f"✅ *Withdrawal Successful!*\n\n"
                 f"💰 Amount: {amount} USDC\n"
@@ -1012,7 +1025,7 @@ async def market_trade_menu(update: Update, context: ContextTypes.DEFAULT_TYPE,
     
     market = get_market(market_alias)
 
-    spread_yes = get_orderbook_spread(market['tokens']['yes'])[2]
+    spread_yes = (await asyncio.to_thread(get_orderbook_spread, market['tokens']['yes']))[2]
     spread_block = (
         f"📏 *Order book spread*: {format_spread_value(spread_yes)}\n"
         f"{format_spread_advisory(spread_yes)}\n\n"
@@ -1035,12 +1048,57 @@ async def market_trade_menu(update: Update, context: ContextTypes.DEFAULT_TYPE,
     context.user_data['current_market'] = market_alias
 
 
+async def edit_status(status, text: str, **kwargs) -> None:
+    """Show a queued trade's progress in its status message"""
+    try:
+        await status.edit_text(text, **kwargs)
+    except TelegramError as e:
+        logger.warning("Could not edit trade status: %s", e)
+        await status.reply_text(text, **kwargs)
+
+
+async def finish_status(status, text: str, market_alias: str, **kwargs) -> None:
+    """
+    Replace a queued trade's status message with its result.
+
+    Telegram can't edit a message that carries a reply keyboard, so the status
+    message is sent without one and the result comes back as a new message
+    with the trade keyboard.
+    """
+    try:
+        await status.delete()
+    except TelegramError as e:
+        logger.warning("Could not delete trade status: %s", e)
+    await status.reply_text(text, reply_markup=build_trade_keyboard(market_alias), **kwargs)
+
+
+async def queue_trade(update: Update, telegram_id: int, text: str, job, market_alias: str) -> None:
+    """
+    Acknowledge a trade and queue job(status) behind the user's earlier trades
+    """
+    ahead = TRADE_QUEUE.pending(telegram_id)
+    waiting = f"⏳ Queued after {ahead} trade(s)..." if ahead else "⏳ Please wait..."
+    # No reply keyboard: the status message is edited as the trade progresses
+    status = await update.message.reply_text(f"{text}{waiting}")
+
+    try:
+        TRADE_QUEUE.submit(telegram_id, lambda: job(status))
+    except TradeQueueFull:
+        await finish_status(
+            status,
+            f"❌ You already have {TRADE_QUEUE.max_pending} trades in progress.\n\n"
+            f"Wait for them to finish and try again.",
+            market_alias
+        )
+
+
 async def execute_trade(update: Update, context: ContextTypes.DEFAULT_TYPE, amount: float) -> None:
     """
     Выполнить трейд
     """
     telegram_id = update.message.from_user.id
-    trade_info = context.user_data.get('pending_trade')
+    # Taken now so a second tap can't resubmit it while the trade is queued
+    trade_info = context.user_data.pop('pending_trade', None)
     
     if not trade_info:
         await update.message.reply_text("❌ Trade info not found")
@@ -1066,61 +1124,193 @@ async def execute_trade(update: Update, context: ContextTypes.DEFAULT_TYPE, amou
     
     action_emoji = "📈" if action == "buy" else "📊"
     action_text = "Buying" if action == "buy" else "Selling"
-    
-    await update.message.reply_text(
+    header = (
         f"{action_emoji} {action_text} {outcome.upper()} shares...\n\n"
         f"💰 Amount: ${amount} USDC\n"
         f"{market['emoji']} {market['title']}\n\n"
-        f"⏳ Please wait..."
     )
     
-    try:
-        
-        private_key = wallet_manager.get_private_key(telegram_id)
-        
-        
-        side = "BUY" if action == "buy" else "SELL"
-        
-        result = trade_market(
-            user_private_key=private_key,
-            token_id=token_id,
-            side=side,
-            amount_usdc=amount,
-            telegram_id=telegram_id,
-            funder_address=wallet["safe_address"],  
-        )
-
-        
-        if result['status'] == 'success':
-            await update.message.reply_text(
-                f"✅ *Trade Successful!*\n\n"
-                f"{action_emoji} {action_text} {outcome.upper()}\n"
-                f"💰 Amount: ${result['amount']} USDC\n\n"
-                f"🎯 Order ID: `{result['order_id'][:16]}...`\n\n"
-                f"⚡ Gasless transaction!\n"
-                f"🏆 OpiPoliX!",
-                parse_mode="Markdown",
-                reply_markup=build_trade_keyboard(market_alias)
+    async def run_trade(status) -> None:
+        try:
+            await edit_status(status, f"{header}⏳ Placing order...")
+            
+            private_key = wallet_manager.get_private_key(telegram_id)
+            
+            
+            side = "BUY" if action == "buy" else "SELL"
+            
+            result = await asyncio.to_thread(
+                trade_market,
+                user_private_key=private_key,
+                token_id=token_id,
+                side=side,
+                amount_usdc=amount,
+                telegram_id=telegram_id,
+                funder_address=wallet["safe_address"],  
             )
-        else:
-            error_msg = result.get('error', 'Unknown error')
-            await update.message.reply_text(
-                f"❌ Trade failed\n\n"
-                f"Error: {error_msg}\n\n"
-                f"Please try again.",
-                reply_markup=build_trade_keyboard(market_alias)
+
+            
+            if result['status'] == 'success':
+                invalidate_wallet_snapshot(wallet["safe_address"])
+                await finish_status(
+                    status,
+                    f"✅ *Trade Successful!*\n\n"
+                    f"{action_emoji} {action_text} {outcome.upper()}\n"
+                    f"💰 Amount: ${result['amount']} USDC\n\n"
+                    f"🎯 Order ID: `{result['order_id'][:16]}...`\n\n"
+                    f"⚡ Gasless transaction!\n"
+                    f"🏆 OpiPoliX!",
+                    market_alias,
+                    parse_mode="Markdown"
+                )
+            else:
+                error_msg = result.get('error', 'Unknown error')
+                await finish_status(
+                    status,
+                    f"❌ Trade failed\n\n"
+                    f"Error: {error_msg}\n\n"
+                    f"Please try again.",
+                    market_alias
+                )
+            
+        except Exception as e:
+            await finish_status(
+                status,
+                f"❌ Error: {str(e)}\n\n"
+                f"Please try again or contact support.",
+                market_alias
             )
-        
-    except Exception as e:
+
+    await queue_trade(
+        update,
+        telegram_id,
+        header,
+        run_trade,
+        market_alias,
+    )
+
+
+async def execute_sell(update: Update, context: ContextTypes.DEFAULT_TYPE, percentage: int) -> None:
+    """
+    Sell a percentage of the pending outcome position
+    """
+    # Taken now so a second tap can't resubmit it while the sell is queued
+    pending_sell = context.user_data.pop('pending_sell', None)
+    
+    if not pending_sell:
         await update.message.reply_text(
-            f"❌ Error: {str(e)}\n\n"
-            f"Please try again or contact support.",
-            reply_markup=build_trade_keyboard(market_alias)
+            "❌ No pending sell operation",
+            reply_markup=build_main_keyboard()
         )
+        return
     
-    finally:
-        
-        context.user_data.pop('pending_trade', None)
+    telegram_id = update.message.from_user.id
+    wallet = wallet_manager.get_wallet(telegram_id)
+    
+    if not wallet or not wallet['safe_address']:
+        await update.message.reply_text(
+            "❌ You need a Safe wallet to trade!",
+            reply_markup=build_main_keyboard()
+        )
+        return
+    
+    market_alias = pending_sell['market']
+    outcome = pending_sell['outcome']
+    market = get_market(market_alias)
+    token_id = market['tokens'][outcome]
+    
+    async def run_sell(status) -> None:
+        try:
+            
+            private_key = wallet_manager.get_private_key(telegram_id)
+            
+            # Read after any earlier queued trade of this user has settled
+            token_balance_raw = await asyncio.to_thread(
+                get_balance_checker().get_position_balance,
+                wallet['safe_address'],
+                token_id
+            )
+            
+            
+            token_balance = token_balance_raw / 1e6
+            
+            print(f"📊 Token balance: {token_balance_raw} raw = {token_balance} tokens")
+            
+            if token_balance <= 0:
+                await finish_status(
+                    status,
+                    f"❌ You have no {outcome.upper()} tokens to sell!\n\n"
+                    f"📊 Current balance: 0",
+                    market_alias
+                )
+                return
+            
+           
+            amount_to_sell = (token_balance * percentage) / 100
+            
+            await edit_status(
+                status,
+                f"📊 Selling {percentage}% of {outcome.upper()} tokens...\n\n"
+                f"📉 Your balance: {token_balance:.2f} tokens\n"
+                f"💰 Selling: {amount_to_sell:.2f} tokens\n\n"
+                f"⏳ Please wait..."
+            )
+            
+           
+            result = await asyncio.to_thread(
+                trade_market,
+                user_private_key=private_key,
+                token_id=token_id,
+                side="SELL",
+                amount_usdc=amount_to_sell,  
+                telegram_id=telegram_id,
+                funder_address=wallet['safe_address']
+            )
+            
+            if result['status'] == 'success':
+                invalidate_wallet_snapshot(wallet['safe_address'])
+                order_id = result.get('order_id', 'N/A')
+                
+                if isinstance(order_id, dict):
+                    order_id = order_id.get('orderID', str(order_id)[:16])
+                
+                await finish_status(
+                    status,
+                    f"✅ *Sell Successful!*\n\n"
+                    f"📊 Sold {percentage}% of {outcome.upper()}\n"
+                    f"💰 Amount: {amount_to_sell:.2f} tokens\n\n"
+                    f"🎯 Order ID: `{str(order_id)[:16]}...`\n\n"
+                    f"⚡ Gasless transaction!\n"
+                    f"🏆 OpiPoliX!",
+                    market_alias,
+                    parse_mode="Markdown"
+                )
+            else:
+                error_msg = result.get('error', 'Unknown error')
+                await finish_status(
+                    status,
+                    f"❌ Sell failed\n\n"
+                    f"Error: {error_msg}\n\n"
+                    f"Please try again.",
+                    market_alias
+                )
+            
+        except Exception as e:
+            await finish_status(
+                status,
+                f"❌ Error: {str(e)}\n\n"
+                f"Please try again or contact support.",
+                market_alias
+            )
+
+    await queue_trade(
+        update,
+        telegram_id,
+        f"📊 Selling {percentage}% of {outcome.upper()} tokens\n"
+        f"{market['emoji']} {market['title']}\n\n",
+        run_sell,
+        market_alias,
+    )
 
 
 async def auto_trade_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, market_alias: str):
@@ -1174,7 +1364,7 @@ async def show_market_info(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     
     try:
         # Get Polymarket prices
-        poly_prices = get_polymarket_binary_prices(market['polymarket_id'])
+        poly_prices = await asyncio.to_thread(get_polymarket_binary_prices, market['polymarket_id'])
         
         if poly_prices['yes'] is not None and poly_prices['no'] is not None:
             message = (
@@ -1563,119 +1753,7 @@ async def handle_buttons(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     
     if text in ["25%", "50%", "75%", "100%"]:
-        pending_sell = context.user_data.get('pending_sell')
-        
-        if not pending_sell:
-            await update.message.reply_text(
-                "❌ No pending sell operation",
-                reply_markup=build_main_keyboard()
-            )
-            return
-        
-        telegram_id = update.message.from_user.id
-        wallet = wallet_manager.get_wallet(telegram_id)
-        
-        if not wallet or not wallet['safe_address']:
-            await update.message.reply_text(
-                "❌ You need a Safe wallet to trade!",
-                reply_markup=build_main_keyboard()
-            )
-            return
-        
-        market_alias = pending_sell['market']
-        outcome = pending_sell['outcome']
-        percentage = int(text.strip('%'))
-        
-        market = get_market(market_alias)
-        token_id = market['tokens'][outcome]
-        
-        await update.message.reply_text(
-            f"🔍 Getting your {outcome.upper()} token balance...\n"
-            f"⏳ Please wait..."
-        )
-        
-        try:
-            
-            private_key = wallet_manager.get_private_key(telegram_id)
-            
-            
-            balance_checker = BalanceChecker()
-            token_balance_raw = balance_checker.get_position_balance(
-                wallet['safe_address'],
-                token_id
-            )
-            
-            
-            token_balance = token_balance_raw / 1e6
-            
-            print(f"📊 Token balance: {token_balance_raw} raw = {token_balance} tokens")
-            
-            if token_balance <= 0:
-                await update.message.reply_text(
-                    f"❌ You have no {outcome.upper()} tokens to sell!\n\n"
-                    f"📊 Current balance: 0",
-                    reply_markup=build_trade_keyboard(market_alias)
-                )
-                context.user_data.pop('pending_sell', None)
-                return
-            
-           
-            amount_to_sell = (token_balance * percentage) / 100
-            
-            await update.message.reply_text(
-                f"📊 Selling {percentage}% of {outcome.upper()} tokens...\n\n"
-                f"📉 Your balance: {token_balance:.2f} tokens\n"
-                f"💰 Selling: {amount_to_sell:.2f} tokens\n\n"
-                f"⏳ Please wait..."
-            )
-            
-           
-            result = trade_market(
-                user_private_key=private_key,
-                token_id=token_id,
-                side="SELL",
-                amount_usdc=amount_to_sell,  
-                telegram_id=telegram_id,
-                funder_address=wallet['safe_address']
-            )
-            
-            if result['status'] == 'success':
-                order_id = result.get('order_id', 'N/A')
-                
-                if isinstance(order_id, dict):
-                    order_id = order_id.get('orderID', str(order_id)[:16])
-                
-                await update.message.reply_text(
-                    f"✅ *Sell Successful!*\n\n"
-                    f"📊 Sold {percentage}% of {outcome.upper()}\n"
-                    f"💰 Amount: {amount_to_sell:.2f} tokens\n\n"
-                    f"🎯 Order ID: `{str(order_id)[:16]}...`\n\n"
-                    f"⚡ Gasless transaction!\n"
-                    f"🏆 OpiPoliX!",
-                    parse_mode="Markdown",
-                    reply_markup=build_trade_keyboard(market_alias)
-                )
-            else:
-                error_msg = result.get('error', 'Unknown error')
-                await update.message.reply_text(
-                    f"❌ Sell failed\n\n"
-                    f"Error: {error_msg}\n\n"
-                    f"Please try again.",
-                    reply_markup=build_trade_keyboard(market_alias)
-                )
-            
-        except Exception as e:
-            await update.message.reply_text(
-                f"❌ Error: {str(e)}\n\n"
-                f"Please try again or contact support.",
-                reply_markup=build_trade_keyboard(market_alias)
-            )
-        
-        finally:
-            
-            context.user_data.pop('pending_sell', None)
-        
-        return
+        return await execute_sell(update, context, int(text.strip('%')))
     
    
     if text == "📈 Buy YES on Pump":
@@ -1764,7 +1842,7 @@ async def opinion_tracker_menu(update: Update, context: ContextTypes.DEFAULT_TYP
             
             try:
                 # Get USDT balance
-                balances_data = get_user_balances(address)
+                balances_data = await asyncio.to_thread(get_user_balances, address)
                 
                 if balances_data.get('status') == 'success':
                     usdt = balances_data.get('usdt_balance', 0)
@@ -1773,7 +1851,7 @@ async def opinion_tracker_menu(update: Update, context: ContextTypes.DEFAULT_TYP
                     message += f"   \U0001F4B5 USDT: Error\n"
                 
                 # Get positions
-                positions_data = get_user_positions(address)
+                positions_data = await asyncio.to_thread(get_user_positions, address)
                 
                 if positions_data.get('status') == 'success':
                     result = positions_data.get('positions')
@@ -1899,7 +1977,7 @@ async def show_address_positions(update: Update, context: ContextTypes.DEFAULT_T
     )
     
     # Get positions
-    positions = get_user_positions(address)
+    positions = await asyncio.to_thread(get_user_positions, address)
     positions_msg = format_positions_message(positions)
     
     await update.message.reply_text(
@@ -1908,7 +1986,7 @@ async def show_address_positions(update: Update, context: ContextTypes.DEFAULT_T
     )
     
     # Get balances
-    balances = get_user_balances(address)
+    balances = await asyncio.to_thread(get_user_balances, address)
     balances_msg = format_balances_message(balances)
     
     await update.message.reply_text(
@@ -1921,18 +1999,47 @@ def main():
     if not TOKEN:
         raise SystemExit("Set TELEGRAM_TOKEN env var first.")
 
+    # Webhook mode: Telegram pushes updates, handled concurrently across chats
+    webhook_url = os.environ.get("WEBHOOK_URL")
+    connection_pool_size = 8
+    if webhook_url:
+        from webhook_server import PerChatUpdateProcessor, WEBHOOK_MAX_CONCURRENT_UPDATES
+
+        # Every concurrent handler may be sending a reply
+        connection_pool_size = max(8, WEBHOOK_MAX_CONCURRENT_UPDATES)
+
     # Add retry logic with increased timeouts to prevent httpx.ReadError crashes
     from telegram.request import HTTPXRequest
     
     # Create request with retries and longer timeouts
     request = HTTPXRequest(
-        connection_pool_size=8,
+        connection_pool_size=connection_pool_size,
         pool_timeout=30.0,      # Increased from 5s to 30s
         connect_timeout=30.0,    # Increased from 5s to 30s  
         read_timeout=30.0,       # Increased from 5s to 30s
     )
     
-    app = Application.builder().token(TOKEN).request(request).build()
+    async def warm_spread_matrix(application: Application) -> None:
+        # First /spread is served from a warm cache
+        SPREAD_MATRIX.refresh(COMMON_MARKETS)
+
+    async def finish_queued_trades(application: Application) -> None:
+        # Trades already acknowledged to users are placed before the bot exits
+        await TRADE_QUEUE.join(timeout=60)
+
+    builder = (
+        Application.builder()
+        .token(TOKEN)
+        .request(request)
+        .post_init(warm_spread_matrix)
+        .post_stop(finish_queued_trades)
+    )
+    if webhook_url:
+        builder = builder.updater(None).concurrent_updates(
+            PerChatUpdateProcessor(WEBHOOK_MAX_CONCURRENT_UPDATES)
+        )
+
+    app = builder.build()
     
     # Commands
     app.add_handler(CommandHandler("start", start))
@@ -1942,6 +2049,7 @@ def main():
     app.add_handler(CommandHandler("o_markets", o_markets))
     app.add_handler(CommandHandler("p_markets", p_markets))
     app.add_handler(CommandHandler("spread", spread))
+    app.add_handler(CommandHandler("arb_alerts", arb_alerts_command))
     
     # Wallet
     app.add_handler(CommandHandler("balance", check_balance))
@@ -1985,7 +2093,12 @@ def main():
     # Text handler
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_buttons))
     
-    app.run_polling()
+    if webhook_url:
+        from webhook_server import run_webhook
+
+        asyncio.run(run_webhook(app, webhook_url.rstrip("/")))
+    else:
+        app.run_polling()
 
 
 if __name__ == "__main__":
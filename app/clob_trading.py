@@ -1,9 +1,9 @@
 
 import os
-from typing import Dict, Literal, Optional
-from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import OrderType, MarketOrderArgs
-from py_builder_signing_sdk.config import BuilderConfig, RemoteBuilderConfig
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Literal, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,6 +18,22 @@ BUILDER_API_KEY = os.environ.get("BUILDER_API_KEY")
 BUILDER_SECRET = os.environ.get("BUILDER_SECRET")
 BUILDER_PASS_PHRASE = os.environ.get("BUILDER_PASS_PHRASE")
 
+# One client per (telegram_id, funder): building one derives API credentials
+# over the network, so trades after the first reuse it. Entries (and the
+# decrypted key they hold) are evicted least-recently-used beyond the size
+# bound, re-derived after the TTL and dropped when an order fails on auth.
+CLOB_CLIENT_CACHE_SIZE = int(os.environ.get("CLOB_CLIENT_CACHE_SIZE", "256"))
+CLOB_CLIENT_TTL_SEC = float(os.environ.get("CLOB_CLIENT_TTL_SEC", "3600"))
+_CLIENTS: "OrderedDict[Tuple[int, Optional[str]], Tuple[UserClobClient, float]]" = OrderedDict()
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _is_auth_error(error: Exception) -> bool:
+    if getattr(error, "status_code", None) in (401, 403):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in ("unauthorized", "api key", "status_code=401", "status_code=403"))
+
 
 class UserClobClient:
     
@@ -34,6 +50,10 @@ class UserClobClient:
             telegram_id: 
             funder_address: 
         """
+        # py_clob_client pulls in web3; only processes that trade pay for the import.
+        from py_clob_client.client import ClobClient
+        from py_builder_signing_sdk.config import BuilderConfig, RemoteBuilderConfig
+
         self.telegram_id = telegram_id
         self.private_key = user_private_key
         self.funder_address = funder_address
@@ -84,6 +104,8 @@ class UserClobClient:
         side: Literal["BUY", "SELL"],
         amount_usdc: float,
     ) -> Dict:
+        from py_clob_client.clob_types import OrderType, MarketOrderArgs
+
         try:
             print(f"📊 Creating {side} order: ${amount_usdc} for token {token_id[:16]}...")
             order_args = MarketOrderArgs(
@@ -122,7 +144,7 @@ class UserClobClient:
             import traceback
 
             traceback.print_exc()
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), "auth_error": _is_auth_error(e)}
 
     def get_market_price(self, token_id: str, side: Literal["BUY", "SELL"]) -> float:
         try:
@@ -199,6 +221,38 @@ class UserClobClient:
             return 0.0
 
 
+def get_user_clob_client(
+    user_private_key: str,
+    telegram_id: int = None,
+    funder_address: Optional[str] = None,
+) -> UserClobClient:
+    """Cached UserClobClient for a user/funder pair, created on first use."""
+    if telegram_id is None:
+        return UserClobClient(user_private_key, telegram_id, funder_address=funder_address)
+
+    key = (telegram_id, funder_address)
+    now = time.monotonic()
+    with _CLIENTS_LOCK:
+        entry = _CLIENTS.get(key)
+        if entry is not None and now - entry[1] < CLOB_CLIENT_TTL_SEC:
+            _CLIENTS.move_to_end(key)
+            return entry[0]
+
+    client = UserClobClient(user_private_key, telegram_id, funder_address=funder_address)
+    with _CLIENTS_LOCK:
+        _CLIENTS[key] = (client, now)
+        _CLIENTS.move_to_end(key)
+        while len(_CLIENTS) > CLOB_CLIENT_CACHE_SIZE:
+            _CLIENTS.popitem(last=False)
+    return client
+
+
+def drop_user_clob_client(telegram_id: int, funder_address: Optional[str] = None) -> None:
+    """Forget a cached client so the next trade derives fresh API credentials."""
+    with _CLIENTS_LOCK:
+        _CLIENTS.pop((telegram_id, funder_address), None)
+
+
 def trade_market(
     user_private_key: str,
     token_id: str,
@@ -212,8 +266,12 @@ def trade_market(
 
     funder_address: 
     """
-    client = UserClobClient(user_private_key, telegram_id, funder_address=funder_address)
-    return client.create_market_order(token_id, side, amount_usdc)
+    client = get_user_clob_client(user_private_key, telegram_id, funder_address=funder_address)
+    result = client.create_market_order(token_id, side, amount_usdc)
+    if result.get("auth_error") and telegram_id is not None:
+        print(f"🔑 CLOB credentials rejected for user {telegram_id}; re-deriving on next trade")
+        drop_user_clob_client(telegram_id, funder_address)
+    return result
 
 
 def get_token_balance(
@@ -228,5 +286,5 @@ def get_token_balance(
     Returns:
         float: 
     """
-    client = UserClobClient(user_private_key, telegram_id, funder_address=funder_address)
+    client = get_user_clob_client(user_private_key, telegram_id, funder_address=funder_address)
     return client.get_token_balance(token_id)
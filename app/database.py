@@ -20,6 +20,13 @@ else:
     DB_FILE = "opipolix.db"
 
 
+# Global, monotonically increasing change version for opinion_alerts so the
+# alert worker can pick up new/cancelled alerts with one cursor query.
+NEXT_OPINION_ALERT_VERSION_SQL = (
+    "(SELECT COALESCE(MAX(change_version), 0) + 1 FROM opinion_alerts)"
+)
+
+
 class Database:
     
     
@@ -97,7 +104,25 @@ class Database:
                     trigger_percent REAL NOT NULL,
                     status TEXT DEFAULT 'active',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    triggered_at TIMESTAMP
+                    triggered_at TIMESTAMP,
+                    baseline_price REAL,
+                    change_version INTEGER DEFAULT 0
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS wallet_snapshot_invalidations (
+                    safe_address TEXT PRIMARY KEY,
+                    changed_at DOUBLE PRECISION NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS arb_subscriptions (
+                    telegram_id BIGINT PRIMARY KEY,
+                    threshold REAL NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
         else:
@@ -153,14 +178,59 @@ class Database:
                     trigger_percent REAL NOT NULL,
                     status TEXT DEFAULT 'active',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    triggered_at TIMESTAMP
+                    triggered_at TIMESTAMP,
+                    baseline_price REAL,
+                    change_version INTEGER DEFAULT 0
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS wallet_snapshot_invalidations (
+                    safe_address TEXT PRIMARY KEY,
+                    changed_at REAL NOT NULL
                 )
             """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS arb_subscriptions (
+                    telegram_id INTEGER PRIMARY KEY,
+                    threshold REAL NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+        self._ensure_opinion_alert_columns(cursor)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_opinion_alerts_change_version "
+            "ON opinion_alerts (change_version)"
+        )
         
         conn.commit()
         conn.close()
         print("✅ Database initialized!")
     
+    def _ensure_opinion_alert_columns(self, cursor):
+        if self.use_postgres:
+            cursor.execute(
+                "ALTER TABLE opinion_alerts ADD COLUMN IF NOT EXISTS baseline_price REAL"
+            )
+            cursor.execute(
+                "ALTER TABLE opinion_alerts "
+                "ADD COLUMN IF NOT EXISTS change_version INTEGER DEFAULT 0"
+            )
+            return
+        
+        cursor.execute("PRAGMA table_info(opinion_alerts)")
+        existing = {row[1] for row in cursor.fetchall()}
+        
+        if "baseline_price" not in existing:
+            cursor.execute("ALTER TABLE opinion_alerts ADD COLUMN baseline_price REAL")
+        if "change_version" not in existing:
+            cursor.execute(
+                "ALTER TABLE opinion_alerts ADD COLUMN change_version INTEGER DEFAULT 0"
+            )
+    
     # ===== WALLET METHODS =====
     
     def get_wallet(self, telegram_id: int) -> Optional[Dict[str, Any]]:
@@ -238,6 +308,47 @@ class Database:
         conn.close()
         return True
     
+    def mark_wallet_changed(self, safe_address: str, changed_at: float):
+        """Record that a wallet's balances changed (epoch seconds)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if self.use_postgres:
+            cursor.execute("""
+                INSERT INTO wallet_snapshot_invalidations (safe_address, changed_at)
+                VALUES (%s, %s)
+                ON CONFLICT (safe_address) DO UPDATE SET changed_at = EXCLUDED.changed_at
+            """, (safe_address, changed_at))
+        else:
+            cursor.execute("""
+                INSERT OR REPLACE INTO wallet_snapshot_invalidations (safe_address, changed_at)
+                VALUES (?, ?)
+            """, (safe_address, changed_at))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_wallet_changes_since(self, since: float) -> Dict[str, float]:
+        """Wallets whose balances changed after `since` (epoch seconds) -> changed_at"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if self.use_postgres:
+            cursor.execute(
+                "SELECT safe_address, changed_at FROM wallet_snapshot_invalidations WHERE changed_at > %s",
+                (since,)
+            )
+        else:
+            cursor.execute(
+                "SELECT safe_address, changed_at FROM wallet_snapshot_invalidations WHERE changed_at > ?",
+                (since,)
+            )
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return {row[0]: float(row[1]) for row in rows}
+    
     # ===== AUTO ORDER METHODS =====
     
     def create_auto_order(self, telegram_id: int, market_alias: str,
@@ -347,18 +458,18 @@ class Database:
         cursor = conn.cursor()
         
         if self.use_postgres:
-            cursor.execute("""
+            cursor.execute(f"""
                 INSERT INTO opinion_alerts
-                (telegram_id, market_id, alert_type, trigger_percent)
-                VALUES (%s, %s, %s, %s)
+                (telegram_id, market_id, alert_type, trigger_percent, change_version)
+                VALUES (%s, %s, %s, %s, {NEXT_OPINION_ALERT_VERSION_SQL})
                 RETURNING id
             """, (telegram_id, market_id, alert_type, trigger_percent))
             alert_id = cursor.fetchone()[0]
         else:
-            cursor.execute("""
+            cursor.execute(f"""
                 INSERT INTO opinion_alerts
-                (telegram_id, market_id, alert_type, trigger_percent)
-                VALUES (?, ?, ?, ?)
+                (telegram_id, market_id, alert_type, trigger_percent, change_version)
+                VALUES (?, ?, ?, ?, {NEXT_OPINION_ALERT_VERSION_SQL})
             """, (telegram_id, market_id, alert_type, trigger_percent))
             alert_id = cursor.lastrowid
         
@@ -418,34 +529,181 @@ class Database:
         
         if status == 'triggered':
             if self.use_postgres:
-                cursor.execute("""
+                cursor.execute(f"""
                     UPDATE opinion_alerts
-                    SET status = %s, triggered_at = CURRENT_TIMESTAMP
+                    SET status = %s, triggered_at = CURRENT_TIMESTAMP,
+                        change_version = {NEXT_OPINION_ALERT_VERSION_SQL}
                     WHERE id = %s
                 """, (status, alert_id))
             else:
-                cursor.execute("""
+                cursor.execute(f"""
                     UPDATE opinion_alerts
-                    SET status = ?, triggered_at = CURRENT_TIMESTAMP
+                    SET status = ?, triggered_at = CURRENT_TIMESTAMP,
+                        change_version = {NEXT_OPINION_ALERT_VERSION_SQL}
                     WHERE id = ?
                 """, (status, alert_id))
         else:
             if self.use_postgres:
-                cursor.execute("""
+                cursor.execute(f"""
                     UPDATE opinion_alerts
-                    SET status = %s
+                    SET status = %s,
+                        change_version = {NEXT_OPINION_ALERT_VERSION_SQL}
                     WHERE id = %s
                 """, (status, alert_id))
             else:
-                cursor.execute("""
+                cursor.execute(f"""
                     UPDATE opinion_alerts
-                    SET status = ?
+                    SET status = ?,
+                        change_version = {NEXT_OPINION_ALERT_VERSION_SQL}
                     WHERE id = ?
                 """, (status, alert_id))
         
         conn.commit()
         conn.close()
     
+    def get_opinion_alert_version(self) -> int:
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COALESCE(MAX(change_version), 0) FROM opinion_alerts")
+        row = cursor.fetchone()
+        conn.close()
+        
+        return int(row[0] or 0)
+    
+    def get_opinion_alerts_changed_since(self, change_version: int) -> list:
+        """Alerts of any status whose change_version is >= the cursor"""
+        conn = self.get_connection()
+        
+        if self.use_postgres:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute("""
+                SELECT * FROM opinion_alerts
+                WHERE change_version >= %s
+                ORDER BY change_version
+            """, (change_version,))
+        else:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM opinion_alerts
+                WHERE change_version >= ?
+                ORDER BY change_version
+            """, (change_version,))
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [dict(row) for row in rows]
+    
+    def set_opinion_alert_baselines(self, alert_ids: list, baseline_price: float):
+        
+        if not alert_ids:
+            return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if self.use_postgres:
+            cursor.executemany("""
+                UPDATE opinion_alerts
+                SET baseline_price = %s
+                WHERE id = %s
+            """, [(baseline_price, alert_id) for alert_id in alert_ids])
+        else:
+            cursor.executemany("""
+                UPDATE opinion_alerts
+                SET baseline_price = ?
+                WHERE id = ?
+            """, [(baseline_price, alert_id) for alert_id in alert_ids])
+        
+        conn.commit()
+        conn.close()
+    
+    # ===== ARBITRAGE ALERT METHODS =====
+    
+    def set_arb_subscription(self, telegram_id: int, threshold: float):
+        """Subscribe (or change the threshold) to cross-venue spread alerts"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if self.use_postgres:
+            cursor.execute("""
+                INSERT INTO arb_subscriptions (telegram_id, threshold)
+                VALUES (%s, %s)
+                ON CONFLICT (telegram_id) DO UPDATE
+                SET threshold = EXCLUDED.threshold, updated_at = CURRENT_TIMESTAMP
+            """, (telegram_id, threshold))
+        else:
+            cursor.execute("""
+                INSERT INTO arb_subscriptions (telegram_id, threshold)
+                VALUES (?, ?)
+                ON CONFLICT(telegram_id) DO UPDATE SET
+                    threshold = excluded.threshold,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (telegram_id, threshold))
+        
+        conn.commit()
+        conn.close()
+    
+    def remove_arb_subscription(self, telegram_id: int) -> bool:
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if self.use_postgres:
+            cursor.execute(
+                "DELETE FROM arb_subscriptions WHERE telegram_id = %s",
+                (telegram_id,)
+            )
+        else:
+            cursor.execute(
+                "DELETE FROM arb_subscriptions WHERE telegram_id = ?",
+                (telegram_id,)
+            )
+        removed = cursor.rowcount > 0
+        
+        conn.commit()
+        conn.close()
+        
+        return removed
+    
+    def get_arb_subscription(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        
+        conn = self.get_connection()
+        
+        if self.use_postgres:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                "SELECT * FROM arb_subscriptions WHERE telegram_id = %s",
+                (telegram_id,)
+            )
+        else:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM arb_subscriptions WHERE telegram_id = ?",
+                (telegram_id,)
+            )
+        
+        row = cursor.fetchone()
+        conn.close()
+        
+        return dict(row) if row else None
+    
+    def get_arb_subscriptions(self) -> list:
+        
+        conn = self.get_connection()
+        
+        if self.use_postgres:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+        else:
+            cursor = conn.cursor()
+        
+        cursor.execute("SELECT telegram_id, threshold FROM arb_subscriptions")
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [dict(row) for row in rows]
+    
     # ===== TRANSACTION METHODS =====
     
     def add_transaction(self, telegram_id: int, market_alias: str,
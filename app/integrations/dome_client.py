@@ -4,13 +4,335 @@ Docs: https://api.domeapi.io/
 SDK: pip install dome-api-sdk
 """
 
+import asyncio
 import os
+import threading
 import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
 import requests
-from typing import Dict, List, Optional
+
+from rate_limit import RateLimiter
 # Note: dome-api-sdk has a bug with 'status' field, so we use direct HTTP requests
 # from dome_api_sdk import DomeClient as DomeSDK
 
+# Dome allows around 1 request/sec on the positions endpoint.
+# Every client in the process draws from this one budget.
+DOME_POSITIONS_LIMITER = RateLimiter(rate_per_sec=0.95)
+POSITIONS_CACHE_TTL_SEC = float(os.getenv("DOME_POSITIONS_TTL_SEC", "60"))
+POSITIONS_MAX_PAGES = 20
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# wallet -> {"pages": [[position, ...]], "cursors": [None, key, ...], "per_page": int, "fetched_at": float}
+_POSITIONS_CACHE: Dict[str, Dict] = {}
+_POSITIONS_CACHE_LOCK = threading.Lock()
+
+SEARCH_CACHE_TTL_SEC = float(os.getenv("DOME_SEARCH_TTL_SEC", "120"))
+# Query variants of one search run side by side on this pool.
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix="dome-search")
+
+
+def _run_coroutine_sync(coro):
+    """Run a coroutine from sync code (worker threads have no running loop)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Waiting here would freeze every other task on the calling loop.
+    coro.close()
+    raise RuntimeError(
+        "DomeClient blocks; call it via asyncio.to_thread or use DomeClientAsync on an event loop"
+    )
+
+
+class DomeSearchCache:
+    """
+    TTL cache for market search results keyed by normalized search term.
+
+    Concurrent misses for the same key are coalesced: the first caller runs the
+    search and everyone else waits for its result. Failed searches raise to
+    every waiter and are not cached. Cached results are shared, treat them as
+    read-only.
+    """
+
+    def __init__(self, ttl_sec: float = SEARCH_CACHE_TTL_SEC):
+        self.ttl_sec = ttl_sec
+        self._entries: Dict[Tuple, Tuple[float, Dict]] = {}
+        self._inflight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(project_name: str, limit: int) -> Tuple[str, int]:
+        return " ".join((project_name or "").lower().split()), int(limit)
+
+    def peek(self, key: Tuple) -> Optional[Dict]:
+        with self._lock:
+            return self._fresh(key)
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Dict]) -> Dict:
+        cached, future, owner = self._begin(key)
+        if cached is not None:
+            return cached
+        if not owner:
+            return future.result()
+
+        try:
+            result = compute()
+        except BaseException as exc:
+            self._finish(key, future, error=exc)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def get_or_compute_async(
+        self, key: Tuple, compute: Callable[[], Awaitable[Dict]]
+    ) -> Dict:
+        """Async twin of get_or_compute; shares entries and in-flight searches with it."""
+        cached, future, owner = self._begin(key)
+        if cached is not None:
+            return cached
+        if not owner:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await compute()
+        except BaseException as exc:
+            self._finish(key, future, error=exc)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def _begin(self, key: Tuple) -> Tuple[Optional[Dict], Optional[Future], bool]:
+        with self._lock:
+            cached = self._fresh(key)
+            if cached is not None:
+                return cached, None, False
+            future = self._inflight.get(key)
+            if future is not None:
+                self.hits += 1
+                return None, future, False
+            future = Future()
+            self._inflight[key] = future
+            self.misses += 1
+            return None, future, True
+
+    def _finish(
+        self,
+        key: Tuple,
+        future: Future,
+        result: Optional[Dict] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None:
+                self._entries[key] = (time.monotonic(), result)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _fresh(self, key: Tuple) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.ttl_sec:
+            self._entries.pop(key, None)
+            return None
+        self.hits += 1
+        return result
+
+
+DOME_SEARCH_CACHE = DomeSearchCache()
+
+
+class DomePositionsPaginator:
+    """
+    Async walker for /polymarket/positions/wallet/{wallet}.
+
+    The assembled position set and the pagination key of every page are cached per
+    wallet. A refresh re-requests all known pages concurrently (paced by the shared
+    rate budget) and only walks page by page from the point where the chain of
+    pagination keys stops matching the cached one.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        limiter: Optional[RateLimiter] = None,
+        ttl_sec: float = POSITIONS_CACHE_TTL_SEC,
+        max_pages: int = POSITIONS_MAX_PAGES,
+        timeout_sec: float = 10.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.limiter = limiter or DOME_POSITIONS_LIMITER
+        self.ttl_sec = ttl_sec
+        self.max_pages = max_pages
+        self.timeout_sec = timeout_sec
+
+    async def get_positions(
+        self,
+        wallet_address: str,
+        per_page: int = 50,
+        force_refresh: bool = False,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> List[Dict]:
+        wallet = (wallet_address or "").lower()
+
+        with _POSITIONS_CACHE_LOCK:
+            entry = _POSITIONS_CACHE.get(wallet)
+        if entry and entry["per_page"] != per_page:
+            entry = None
+
+        if entry and not force_refresh and time.monotonic() - entry["fetched_at"] < self.ttl_sec:
+            return self._assemble(entry["pages"])
+
+        try:
+            if session is not None:
+                pages, cursors = await self._refresh(session, wallet, per_page, entry)
+            else:
+                timeout = aiohttp.ClientTimeout(total=self.timeout_sec)
+                async with aiohttp.ClientSession(headers=self.headers, timeout=timeout) as own_session:
+                    pages, cursors = await self._refresh(own_session, wallet, per_page, entry)
+        except Exception as e:
+            if entry:
+                print(f"[WARN] Dome positions refresh failed for {wallet}, serving cached set: {e}")
+                return self._assemble(entry["pages"])
+            raise
+
+        with _POSITIONS_CACHE_LOCK:
+            _POSITIONS_CACHE[wallet] = {
+                "pages": pages,
+                "cursors": cursors,
+                "per_page": per_page,
+                "fetched_at": time.monotonic(),
+            }
+        return self._assemble(pages)
+
+    async def _refresh(
+        self,
+        session: aiohttp.ClientSession,
+        wallet: str,
+        per_page: int,
+        entry: Optional[Dict],
+    ) -> Tuple[List[List[Dict]], List[Optional[str]]]:
+        pages: List[List[Dict]] = []
+        cursors: List[Optional[str]] = []
+        pending_cursor: Optional[str] = None
+        more = True
+
+        known = list(entry["cursors"]) if entry else []
+        if known:
+            results = await asyncio.gather(
+                *(self._fetch_page(session, wallet, per_page, cursor) for cursor in known),
+                return_exceptions=True,
+            )
+            for index, result in enumerate(results):
+                if isinstance(result, BaseException):
+                    pending_cursor, more = known[index], True
+                    break
+                page_positions, has_more, next_key = result
+                pages.append(page_positions)
+                cursors.append(known[index])
+                pending_cursor, more = next_key, bool(has_more and next_key)
+                expected = known[index + 1] if index + 1 < len(known) else None
+                if not more or next_key != expected:
+                    break
+
+        seen = {cursor for cursor in cursors if cursor}
+        while more:
+            if len(pages) >= self.max_pages:
+                print(f"[WARN] Dome positions pagination exceeded {self.max_pages} pages for {wallet}, stopping early")
+                break
+            if pending_cursor in seen:
+                print(f"[WARN] Dome positions repeated pagination_key for {wallet}, stopping loop")
+                break
+            if pending_cursor:
+                seen.add(pending_cursor)
+
+            page_positions, has_more, next_key = await self._fetch_page(
+                session, wallet, per_page, pending_cursor
+            )
+            pages.append(page_positions)
+            cursors.append(pending_cursor)
+            pending_cursor, more = next_key, bool(has_more and next_key)
+
+        return pages, cursors
+
+    async def _fetch_page(
+        self,
+        session: aiohttp.ClientSession,
+        wallet: str,
+        per_page: int,
+        cursor: Optional[str],
+    ) -> Tuple[List[Dict], bool, Optional[str]]:
+        params: Dict[str, object] = {"limit": per_page}
+        if cursor:
+            params["pagination_key"] = cursor
+
+        url = f"{self.base_url}/polymarket/positions/wallet/{wallet}"
+        data: Dict = {}
+        for attempt in range(3):
+            await self.limiter.acquire()
+            try:
+                async with session.get(url, params=params, headers=self.headers) as response:
+                    if response.status == 429:
+                        self.limiter.block_for(self._retry_after(response.headers))
+                    response.raise_for_status()
+                    data = await response.json(content_type=None) or {}
+                break
+            except aiohttp.ClientResponseError as exc:
+                if exc.status not in RETRYABLE_STATUSES or attempt == 2:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == 2:
+                    raise
+            await asyncio.sleep(0.9 * (2 ** attempt))
+
+        pagination = data.get("pagination") or {}
+        return (
+            data.get("positions") or [],
+            bool(pagination.get("has_more")),
+            pagination.get("pagination_key"),
+        )
+
+    @staticmethod
+    def _retry_after(headers) -> float:
+        try:
+            return max(float(headers.get("Retry-After") or 0), 1.0)
+        except (TypeError, ValueError):
+            return 1.0
+
+    @staticmethod
+    def _assemble(pages: List[List[Dict]]) -> List[Dict]:
+        """Flatten pages; a token seen on several pages (list shifted mid-walk) is kept once."""
+        positions: List[Dict] = []
+        index_by_token: Dict[str, int] = {}
+        for page in pages:
+            for pos in page:
+                token_id = ""
+                if isinstance(pos, dict):
+                    token_id = str(pos.get("token_id") or pos.get("tokenId") or pos.get("asset_id") or "")
+                if token_id and token_id in index_by_token:
+                    positions[index_by_token[token_id]] = pos
+                    continue
+                if token_id:
+                    index_by_token[token_id] = len(positions)
+                positions.append(pos)
+        return positions
+
 
 class DomeClient:
     """
@@ -35,6 +357,8 @@ class DomeClient:
             "Content-Type": "application/json"
         }
 
+        self.positions = DomePositionsPaginator(self.base_url, self.headers)
+
         print(f"✅ Dome API client initialized (direct HTTP mode)")
 
     @staticmethod
@@ -90,81 +414,12 @@ class DomeClient:
             raise
 
     def get_positions_by_wallet(self, wallet_address: str, limit: int = 100) -> List[Dict]:
-        """Fetch all Polymarket positions for wallet via Dome API with pagination."""
-        normalized_wallet = (wallet_address or "").lower()
+        """Fetch all Polymarket positions for wallet via Dome API (cached, see DomePositionsPaginator)."""
         # Keep page size moderate to reduce gateway failures on large payloads.
         per_page = max(1, min(int(limit or 100), 50))
-
-        all_positions: List[Dict] = []
-        pagination_key: Optional[str] = None
-        seen_pagination_keys: set[str] = set()
-        max_pages = 20
-        page = 0
-
-        while True:
-            if page > 0:
-                # Dome allows around 1 request/sec on this endpoint.
-                time.sleep(1.05)
-
-            page += 1
-            if page > max_pages:
-                print(f"[WARN] Dome positions pagination exceeded {max_pages} pages for {normalized_wallet}, stopping early")
-                break
-
-            params: Dict[str, object] = {"limit": per_page}
-            if pagination_key:
-                if pagination_key in seen_pagination_keys:
-                    print(f"[WARN] Dome positions repeated pagination_key for {normalized_wallet}, stopping loop")
-                    break
-                seen_pagination_keys.add(pagination_key)
-                params["pagination_key"] = pagination_key
-
-            response = None
-            last_error: Optional[Exception] = None
-            for attempt in range(3):
-                try:
-                    response = requests.get(
-                        f"{self.base_url}/polymarket/positions/wallet/{normalized_wallet}",
-                        headers=self.headers,
-                        params=params,
-                        timeout=10,
-                    )
-                    response.raise_for_status()
-                    last_error = None
-                    break
-                except requests.exceptions.RequestException as exc:
-                    last_error = exc
-                    status = None
-                    if getattr(exc, "response", None) is not None:
-                        status = exc.response.status_code
-
-                    retryable = status in {429, 500, 502, 503, 504} or status is None
-                    if retryable and attempt < 2:
-                        time.sleep(0.9 * (2 ** attempt))
-                        continue
-                    break
-
-            if response is None or last_error is not None:
-                raise last_error if last_error is not None else RuntimeError(
-                    "Dome positions request failed without response"
-                )
-
-            data = response.json()
-            page_positions = data.get("positions", [])
-            all_positions.extend(page_positions)
-
-            pagination = data.get("pagination", {})
-            has_more = bool(pagination.get("has_more"))
-            next_pagination_key = pagination.get("pagination_key")
-
-            if not has_more:
-                break
-            if not next_pagination_key:
-                break
-
-            pagination_key = next_pagination_key
-
-        return all_positions
+        return _run_coroutine_sync(
+            self.positions.get_positions(wallet_address, per_page=per_page)
+        )
 
     @staticmethod
     def _coerce_price(value: object) -> Optional[float]:
@@ -328,10 +583,13 @@ class DomeClient:
 
     def search_markets(self, project_name: str, limit: int = 20) -> Dict:
         """
-        Search Polymarket markets related to project (synchronous - uses Dome SDK).
+        Search Polymarket markets related to project (synchronous - direct HTTP).
 
-        Uses the Dome ``search`` parameter for server-side filtering, then tries
-        progressively broader search terms if the first query returns nothing.
+        Uses the Dome ``search`` parameter for server-side filtering and tries
+        progressively broader search terms, all in parallel; the first variant
+        (in priority order) with results wins. Results are cached per
+        normalized term in DOME_SEARCH_CACHE and concurrent identical searches
+        share one request.
 
         Args:
             project_name: Project name to search for (e.g. "base", "metamask")
@@ -347,79 +605,90 @@ class DomeClient:
         """
 
         try:
-            # Build search variations: exact term first, then broader phrases
-            search_terms = [
-                project_name,
-                f"{project_name} token",
-                f"{project_name} launch",
-            ]
-
-            all_markets: list = []
-            used_term = project_name
-
-            for term in search_terms:
-                print(f"🔍 Dome search: '{term}'")
-                results = self._dome_search(term, limit)
-                if results:
-                    all_markets = results
-                    used_term = term
-                    break
-
-            if not all_markets:
-                print(f"❌ No Dome results for any variation of '{project_name}'")
-                return self._empty_response()
+            return DOME_SEARCH_CACHE.get_or_compute(
+                DomeSearchCache.key(project_name, limit),
+                lambda: self._search_markets_uncached(project_name, limit),
+            )
+        except Exception as e:
+            import traceback
+            print(f"❌ Error calling Dome API: {type(e).__name__}: {e}")
+            print(f"📋 Full traceback:\n{traceback.format_exc()}")
+            # Return empty response instead of fallback to avoid masking real errors
+            return self._empty_response()
 
-            print(f"✅ Dome found {len(all_markets)} markets for '{used_term}'")
+    def _search_variants(self, project_name: str, limit: int) -> Tuple[list, str]:
+        """Run every search variant concurrently; return the first non-empty one by priority."""
+        search_terms = [
+            project_name,
+            f"{project_name} token",
+            f"{project_name} launch",
+        ]
+
+        futures = []
+        for term in search_terms:
+            print(f"🔍 Dome search: '{term}'")
+            futures.append(_SEARCH_EXECUTOR.submit(self._dome_search, term, limit))
+
+        for term, future in zip(search_terms, futures):
+            results = future.result()
+            if results:
+                return results, term
+        return [], project_name
+
+    def _search_markets_uncached(self, project_name: str, limit: int) -> Dict:
+        all_markets, used_term = self._search_variants(project_name, limit)
+        return self._build_search_response(all_markets, used_term, project_name)
+
+    def _build_search_response(self, all_markets: list, used_term: str, project_name: str) -> Dict:
+        """Enrich, filter and rank raw Dome markets into the search_markets shape."""
+        if not all_markets:
+            print(f"❌ No Dome results for any variation of '{project_name}'")
+            return self._empty_response()
 
-            # Transform to our format and enrich
-            enriched_markets = []
-            for market in all_markets:
-                try:
-                    enriched = self._transform_market(market)
-                    # Calculate relevance score for filtering
-                    enriched['relevance_score'] = self._calculate_relevance(market, project_name)
-                    enriched_markets.append(enriched)
-                except Exception as e:
-                    print(f"⚠️ Failed to transform market: {e}")
+        print(f"✅ Dome found {len(all_markets)} markets for '{used_term}'")
 
-            if not enriched_markets:
-                return self._empty_response()
+        # Transform to our format and enrich
+        enriched_markets = []
+        for market in all_markets:
+            try:
+                enriched = self._transform_market(market)
+                # Calculate relevance score for filtering
+                enriched['relevance_score'] = self._calculate_relevance(market, project_name)
+                enriched_markets.append(enriched)
+            except Exception as e:
+                print(f"⚠️ Failed to transform market: {e}")
+
+        if not enriched_markets:
+            return self._empty_response()
 
-            # Filter for most relevant markets (relevance > 0.3)
-            relevant_markets = [m for m in enriched_markets if m.get('relevance_score', 0) > 0.3]
+        # Filter for most relevant markets (relevance > 0.3)
+        relevant_markets = [m for m in enriched_markets if m.get('relevance_score', 0) > 0.3]
 
-            if not relevant_markets:
-                print(f"⚠️ No relevant markets found (all scored < 0.3), using all results")
-                relevant_markets = enriched_markets
-            else:
-                print(f"📊 Filtered to {len(relevant_markets)} relevant markets (out of {len(enriched_markets)})")
+        if not relevant_markets:
+            print(f"⚠️ No relevant markets found (all scored < 0.3), using all results")
+            relevant_markets = enriched_markets
+        else:
+            print(f"📊 Filtered to {len(relevant_markets)} relevant markets (out of {len(enriched_markets)})")
 
-            # Sort by opportunity score (liquidity, volume, etc.)
-            relevant_markets.sort(key=lambda m: m['opportunity_score'], reverse=True)
+        # Sort by opportunity score (liquidity, volume, etc.)
+        relevant_markets.sort(key=lambda m: m['opportunity_score'], reverse=True)
 
-            # Log top result for debugging
-            if relevant_markets:
-                top = relevant_markets[0]
-                print(f"🎯 Best market: {top.get('question', '?')[:80]}... "
-                      f"(relevance: {top.get('relevance_score', 0):.2f}, "
-                      f"opportunity: {top.get('opportunity_score', 0):.2f})")
+        # Log top result for debugging
+        if relevant_markets:
+            top = relevant_markets[0]
+            print(f"🎯 Best market: {top.get('question', '?')[:80]}... "
+                  f"(relevance: {top.get('relevance_score', 0):.2f}, "
+                  f"opportunity: {top.get('opportunity_score', 0):.2f})")
 
-            enriched_markets = relevant_markets
+        enriched_markets = relevant_markets
 
-            return {
-                "markets_found": enriched_markets,
-                "best_market": enriched_markets[0],
-                "total_count": len(enriched_markets),
-                "source": "Dome API (real)"
-            }
+        return {
+            "markets_found": enriched_markets,
+            "best_market": enriched_markets[0],
+            "total_count": len(enriched_markets),
+            "source": "Dome API (real)"
+        }
 
-        except Exception as e:
-            import traceback
-            print(f"❌ Error calling Dome API: {type(e).__name__}: {e}")
-            print(f"📋 Full traceback:\n{traceback.format_exc()}")
-            # Return empty response instead of fallback to avoid masking real errors
-            return self._empty_response()
-    
     def _transform_market(self, market) -> dict:
         """
         Transform Dome API market (dict or SDK object) to our agent format.
@@ -618,22 +887,203 @@ class DomeClient:
         }
 
 
-# Async wrapper for compatibility with agent code
-import asyncio
+# Native async client (agent code)
+
+DOME_MAX_CONNECTIONS = int(os.getenv("DOME_MAX_CONNECTIONS", "10"))
+
 
 class DomeClientAsync:
-    """Async wrapper for Dome SDK (which is synchronous)"""
-    
-    def __init__(self, api_key: str = None):
+    """
+    Async Dome client on one pooled aiohttp session.
+
+    Return shapes match DomeClient. Parsing and scoring are shared with the
+    sync client, search results share DOME_SEARCH_CACHE and positions share
+    the paginator cache and the ~1 req/s DOME_POSITIONS_LIMITER budget.
+    Requests beyond the connection limit wait on the pool instead of taking
+    executor threads, and retries back off with asyncio.sleep.
+    """
+
+    def __init__(self, api_key: str = None, max_connections: int = DOME_MAX_CONNECTIONS):
         self.client = DomeClient(api_key)
-    
-    async def search_markets(self, project_name: str, limit: int = 20) -> Dict:
-        """Async version of search_markets"""
-        # Run sync Dome SDK call in thread pool
+        self.max_connections = max(1, max_connections)
+        self.timeout_sec = 10.0
+        self.attempts = 3
+        self.retry_delay_sec = 0.9
+        # A session is bound to the loop it was created on; the shared client
+        # keeps one per loop and forgets it when the loop goes away.
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def base_url(self) -> str:
+        return self.client.base_url
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Session for the running event loop, created on first use or after close."""
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
-            self.client.search_markets,
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                headers=self.client.headers,
+                # No total: it would also count the wait for a pooled
+                # connection, and a burst should queue rather than time out.
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=self.timeout_sec, sock_read=self.timeout_sec
+                ),
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def close(self) -> None:
+        """Close the running loop's session (call before that loop shuts down)."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def _get_json(
+        self,
+        path: str,
+        params: Optional[Dict] = None,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        attempts = self.attempts
+        session = await self.session()
+        url = f"{self.base_url}{path}"
+        for attempt in range(attempts):
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status == 429:
+                        retry_after = DomePositionsPaginator._retry_after(response.headers)
+                        if limiter is not None:
+                            limiter.block_for(retry_after)
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            except aiohttp.ClientResponseError as exc:
+                if exc.status not in RETRYABLE_STATUSES or attempt == attempts - 1:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == attempts - 1:
+                    raise
+            await asyncio.sleep(self.retry_delay_sec * (2 ** attempt))
+
+    async def _dome_search(self, query: str, limit: int) -> list:
+        data = await self._get_json(
+            "/polymarket/markets",
+            params={"search": query, "status": "open", "limit": limit},
+        )
+        return (data or {}).get("markets", [])
+
+    async def search_markets(self, project_name: str, limit: int = 20) -> Dict:
+        """Async version of search_markets (same cache and response shape)"""
+        try:
+            return await DOME_SEARCH_CACHE.get_or_compute_async(
+                DomeSearchCache.key(project_name, limit),
+                lambda: self._search_markets_uncached(project_name, limit),
+            )
+        except Exception as e:
+            print(f"❌ Error calling Dome API: {type(e).__name__}: {e}")
+            return self.client._empty_response()
+
+    async def _search_markets_uncached(self, project_name: str, limit: int) -> Dict:
+        search_terms = [
             project_name,
-            limit,
+            f"{project_name} token",
+            f"{project_name} launch",
+        ]
+        tasks = [asyncio.ensure_future(self._dome_search(term, limit)) for term in search_terms]
+        all_markets: list = []
+        used_term = project_name
+        try:
+            for term, task in zip(search_terms, tasks):
+                results = await task
+                if results:
+                    all_markets, used_term = results, term
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return self.client._build_search_response(all_markets, used_term, project_name)
+
+    async def get_positions_by_wallet(self, wallet_address: str, limit: int = 100) -> List[Dict]:
+        """Async version of get_positions_by_wallet (shares cache and rate budget)"""
+        per_page = max(1, min(int(limit or 100), 50))
+        return await self.client.positions.get_positions(
+            wallet_address, per_page=per_page, session=await self.session()
+        )
+
+    async def get_market_price(self, market_id: str) -> Optional[float]:
+        """Async version of get_market_price"""
+        market_id_value = str(market_id or "").strip()
+        if not market_id_value:
+            return None
+
+        try:
+            payload = await self._get_json(f"/polymarket/market-price/{market_id_value}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"[WARN] Dome market-price request failed for {market_id_value}: {e}")
+            return None
+        except Exception as e:
+            print(f"[WARN] Dome market-price parse failed for {market_id_value}: {e}")
+            return None
+
+        return self.client._extract_price_from_payload(payload)
+
+    async def get_wallet_realized_pnl(self, wallet_address: str) -> Optional[float]:
+        """Async version of get_wallet_realized_pnl"""
+        wallet = str(wallet_address or "").strip().lower()
+        if not wallet:
+            return None
+
+        try:
+            payload = await self._get_json(f"/polymarket/wallet/pnl/{wallet}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"[WARN] Dome wallet PnL request failed for {wallet}: {e}")
+            return None
+        except Exception as e:
+            print(f"[WARN] Dome wallet PnL parse failed for {wallet}: {e}")
+            return None
+
+        return self.client._extract_numeric_from_payload(
+            payload,
+            [
+                "realized_pnl",
+                "realizedPnl",
+                "realized",
+                "wallet_realized_pnl",
+                "pnl",
+            ],
         )
+
+
+_shared_clients: Dict[str, object] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_dome_client() -> DomeClient:
+    """Process-wide DomeClient, created on first use."""
+    with _shared_clients_lock:
+        if "sync" not in _shared_clients:
+            _shared_clients["sync"] = DomeClient()
+        return _shared_clients["sync"]
+
+
+def get_dome_client_async() -> DomeClientAsync:
+    """Process-wide DomeClientAsync, created on first use (its session is per event loop)."""
+    with _shared_clients_lock:
+        if "async" not in _shared_clients:
+            _shared_clients["async"] = DomeClientAsync()
+        return _shared_clients["async"]
+
+
+async def close_dome_client_async() -> None:
+    """Close the shared async client's session on the running loop, if it was used."""
+    with _shared_clients_lock:
+        client = _shared_clients.get("async")
+    if client is not None:
+        await client.close()
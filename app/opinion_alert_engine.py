@@ -0,0 +1,161 @@
+"""
+Opinion Alert Engine
+In-memory trigger table for Opinion price alerts
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+
+# Trigger prices are derived from percentages, so candidates are looked up with
+# a small tolerance and confirmed with the exact percent check.
+PRICE_EPSILON = 1e-9
+
+
+def price_change_percent(baseline: float, price: float) -> Optional[float]:
+    if not baseline:
+        return None
+    return ((price - baseline) / baseline) * 100
+
+
+def is_alert_triggered(alert: Dict, price: float) -> bool:
+    change = price_change_percent(alert.get("baseline_price"), price)
+    if change is None:
+        return False
+    trigger_percent = float(alert["trigger_percent"])
+    if alert["alert_type"] == "price_pump":
+        return change >= trigger_percent
+    return change <= -trigger_percent
+
+
+class MarketTriggers:
+    """Pump and dump trigger prices for one market, each kept sorted."""
+
+    def __init__(self):
+        self.pending: Dict[int, Dict] = {}
+        self.pump: List[Tuple[float, int]] = []
+        self.dump: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.pending) + len(self.pump) + len(self.dump)
+
+    def add(self, alert: Dict) -> None:
+        baseline = alert.get("baseline_price")
+        if not baseline or baseline <= 0:
+            self.pending[alert["id"]] = alert
+            return
+        trigger_percent = float(alert["trigger_percent"])
+        if alert["alert_type"] == "price_pump":
+            insort(self.pump, (baseline * (1 + trigger_percent / 100), alert["id"]))
+        else:
+            insort(self.dump, (baseline * (1 - trigger_percent / 100), alert["id"]))
+
+    def remove(self, alert: Dict) -> None:
+        if self.pending.pop(alert["id"], None) is not None:
+            return
+        for entries in (self.pump, self.dump):
+            for index, (_, alert_id) in enumerate(entries):
+                if alert_id == alert["id"]:
+                    del entries[index]
+                    return
+
+    def candidates(self, price: float) -> List[int]:
+        """Alert ids whose trigger price the given price may have crossed."""
+        pump_end = bisect_right(self.pump, (price + PRICE_EPSILON, float("inf")))
+        dump_start = bisect_left(self.dump, (price - PRICE_EPSILON, float("-inf")))
+        return [alert_id for _, alert_id in self.pump[:pump_end]] + [
+            alert_id for _, alert_id in self.dump[dump_start:]
+        ]
+
+
+class OpinionAlertEngine:
+    """
+    Holds active Opinion alerts grouped by market with sorted trigger prices.
+
+    Each alert keeps its own baseline (the first price seen after it was
+    created), persisted in opinion_alerts.baseline_price. New, cancelled and
+    triggered alerts are applied incrementally through the change_version cursor.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.alerts: Dict[int, Dict] = {}
+        self.markets: Dict[int, MarketTriggers] = {}
+        self.cursor = 0
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def market_ids(self) -> List[int]:
+        return [market_id for market_id, triggers in self.markets.items() if len(triggers)]
+
+    def _add(self, alert: Dict) -> None:
+        self._remove(alert["id"])
+        self.alerts[alert["id"]] = alert
+        self.markets.setdefault(alert["market_id"], MarketTriggers()).add(alert)
+
+    def _remove(self, alert_id: int) -> None:
+        alert = self.alerts.pop(alert_id, None)
+        if alert is None:
+            return
+        triggers = self.markets.get(alert["market_id"])
+        if triggers is not None:
+            triggers.remove(alert)
+            if not len(triggers):
+                del self.markets[alert["market_id"]]
+
+    def load(self) -> None:
+        # Read the version first so changes made during the load are re-applied.
+        version = self.db.get_opinion_alert_version()
+        self.alerts.clear()
+        self.markets.clear()
+        for alert in self.db.get_active_opinion_alerts():
+            self._add(alert)
+        self.cursor = version
+        self.loaded = True
+
+    def refresh(self) -> int:
+        """Apply alerts changed since the cursor; returns how many rows were applied."""
+        if not self.loaded:
+            self.load()
+            return len(self.alerts)
+
+        rows = self.db.get_opinion_alerts_changed_since(self.cursor)
+        for alert in rows:
+            if alert.get("status") == "active":
+                known = self.alerts.get(alert["id"])
+                if known is None or known.get("change_version") != alert.get("change_version"):
+                    self._add(alert)
+            else:
+                self._remove(alert["id"])
+            self.cursor = max(self.cursor, int(alert.get("change_version") or 0))
+        return len(rows)
+
+    def remove(self, alert: Dict) -> None:
+        """Drop an alert once its triggered status is persisted."""
+        self._remove(alert["id"])
+
+    def evaluate(self, market_id: int, price: float) -> List[Dict]:
+        """
+        Apply one price to a market: set baselines for new alerts, then return
+        every alert whose threshold the price crossed. Alerts stay loaded until
+        remove() so one whose status write fails is evaluated again next cycle.
+        """
+        triggers = self.markets.get(market_id)
+        if triggers is None or price is None:
+            return []
+
+        if triggers.pending and price > 0:
+            pending = list(triggers.pending.values())
+            self.db.set_opinion_alert_baselines([alert["id"] for alert in pending], price)
+            triggers.pending.clear()
+            for alert in pending:
+                alert["baseline_price"] = price
+                triggers.add(alert)
+
+        triggered = []
+        for alert_id in triggers.candidates(price):
+            alert = self.alerts.get(alert_id)
+            if alert is not None and is_alert_triggered(alert, price):
+                triggered.append(alert)
+        return triggered
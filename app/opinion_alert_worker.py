@@ -5,6 +5,7 @@ from telegram import Bot
 from telegram.error import TelegramError
 
 from database import Database
+from opinion_alert_engine import OpinionAlertEngine
 from opinion_price_monitor import OpinionPriceMonitor
 from opinion_tracked_markets import CHILD_TO_PROJECT
 from worker_health import get_monitor
@@ -14,6 +15,7 @@ class OpinionAlertWorker:
     def __init__(self, telegram_token: str):
         self.db = Database()
         self.price_monitor = OpinionPriceMonitor()
+        self.alert_engine = OpinionAlertEngine(self.db)
         self.bot = Bot(token=telegram_token)
         self.health_monitor = get_monitor()
 
@@ -32,32 +34,41 @@ class OpinionAlertWorker:
         except TelegramError as e:
             print(f"[Opinion] Failed to send notification to {telegram_id}: {e}")
 
-    async def check_and_trigger_alerts(self):
-        active_alerts = self.db.get_active_opinion_alerts()
+    async def check_and_trigger_alerts(self) -> int:
+        """Evaluate active alerts; returns how many are still active."""
+        self.alert_engine.refresh()
+        market_ids = self.alert_engine.market_ids()
 
-        if not active_alerts:
-            return
+        if not market_ids:
+            return 0
 
-        print(f"[Opinion] Checking {len(active_alerts)} active alerts...")
+        print(
+            f"[Opinion] Checking {len(self.alert_engine)} active alerts "
+            f"across {len(market_ids)} markets..."
+        )
 
-        for alert in active_alerts:
-            try:
-                market_id = alert["market_id"]
-                alert_type = alert["alert_type"]
-                trigger_percent = alert["trigger_percent"]
+        prices = await self.price_monitor.get_current_prices(market_ids)
+
+        for market_id in market_ids:
+            price = prices.get(market_id)
+            if price is None:
+                continue
 
-                triggered = await self.price_monitor.check_trigger(
-                    market_id=market_id,
-                    alert_type=alert_type,
-                    trigger_percent=trigger_percent
-                )
+            for alert in self.alert_engine.evaluate(market_id, price):
+                try:
+                    alert_type = alert["alert_type"]
+                    trigger_percent = alert["trigger_percent"]
 
-                if triggered:
                     self.db.update_opinion_alert_status(alert["id"], "triggered")
+                    self.alert_engine.remove(alert)
                     self.health_monitor.mark_order_executed()
 
                     project = CHILD_TO_PROJECT.get(market_id, f"Market {market_id}")
                     type_label = "Pump" if alert_type == "price_pump" else "Dump"
+                    print(
+                        f"[Opinion] {type_label.upper()} TRIGGER {market_id}: alert "
+                        f"#{alert['id']} at ${price:.4f} (target: {trigger_percent}%)"
+                    )
 
                     message = (
                         "*Opinion Alert Triggered*\n\n"
@@ -69,13 +80,13 @@ class OpinionAlertWorker:
 
                     await self.send_notification(alert["telegram_id"], message)
 
-                    self.price_monitor.reset_initial_price(market_id)
+                except Exception as e:
+                    print(f"[Opinion] Error processing alert #{alert.get('id')}: {e}")
+                    self.health_monitor.mark_error(str(e))
+                    import traceback
+                    traceback.print_exc()
 
-            except Exception as e:
-                print(f"[Opinion] Error processing alert #{alert.get('id')}: {e}")
-                self.health_monitor.mark_error(str(e))
-                import traceback
-                traceback.print_exc()
+        return len(self.alert_engine)
 
     async def run(self):
         print("[Opinion] Alert worker started.")
@@ -92,10 +103,7 @@ class OpinionAlertWorker:
 
                 print(f"[{timestamp}] Iteration #{iteration}")
 
-                active_alerts = self.db.get_active_opinion_alerts()
-                active_count = len(active_alerts) if active_alerts else 0
-
-                await self.check_and_trigger_alerts()
+                active_count = await self.check_and_trigger_alerts()
 
                 self.health_monitor.mark_iteration(active_count)
 
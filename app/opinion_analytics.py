@@ -1,6 +1,6 @@
 from typing import Dict, List
 
-from opinion_client import client, _get_orderbook_core
+from opinion_client import get_client, _get_orderbook_core
 
 
 def get_market_liquidity(token_id: str) -> str:
@@ -71,7 +71,7 @@ def get_orderbook_stats(token_id: str) -> Dict:
 def analyze_market(market_id: int) -> Dict:
     """Get full analytics for a market."""
     try:
-        detail = client.get_market(market_id)
+        detail = get_client().get_market(market_id)
         if detail.errno != 0:
             return {"status": "error", "market_id": market_id, "error": detail.errmsg}
 
@@ -1,9 +1,8 @@
 import os
+import threading
 from typing import Optional
 
 from dotenv import load_dotenv
-from opinion_clob_sdk import Client
-from opinion_clob_sdk.model import TopicStatusFilter
 
 
 load_dotenv()
@@ -15,29 +14,54 @@ RPC_URL = os.getenv("RPC_URL", "")
 PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 MULTI_SIG_ADDRESS = os.getenv("MULTI_SIG_ADDRESS")
 
-if not API_KEY:
-    raise RuntimeError("API_KEY is not set in .env")
+# The SDK pulls in web3 and is slow to import, so the client is built on first use.
+_client = None
+_client_lock = threading.Lock()
 
-if not PRIVATE_KEY:
-    raise RuntimeError("PRIVATE_KEY is not set in .env")
 
-if not MULTI_SIG_ADDRESS:
-    raise RuntimeError("MULTI_SIG_ADDRESS is not set in .env")
+def get_client():
+    """Shared Opinion SDK client, created on first call."""
+    global _client
+    if _client is not None:
+        return _client
 
-client = Client(
-    host=HOST,
-    apikey=API_KEY,
-    chain_id=CHAIN_ID,
-    rpc_url=RPC_URL,
-    private_key=PRIVATE_KEY,
-    multi_sig_addr=MULTI_SIG_ADDRESS,
-    
-)
+    with _client_lock:
+        if _client is None:
+            if not API_KEY:
+                raise RuntimeError("API_KEY is not set in .env")
+
+            if not PRIVATE_KEY:
+                raise RuntimeError("PRIVATE_KEY is not set in .env")
+
+            if not MULTI_SIG_ADDRESS:
+                raise RuntimeError("MULTI_SIG_ADDRESS is not set in .env")
+
+            from opinion_clob_sdk import Client
+
+            _client = Client(
+                host=HOST,
+                apikey=API_KEY,
+                chain_id=CHAIN_ID,
+                rpc_url=RPC_URL,
+                private_key=PRIVATE_KEY,
+                multi_sig_addr=MULTI_SIG_ADDRESS,
+                
+            )
+    return _client
+
+
+def __getattr__(name):
+    # `opinion_client.client` still resolves to the shared client.
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def fetch_active_markets(limit: int = 5):
     
-    response = client.get_markets(
+    from opinion_clob_sdk.model import TopicStatusFilter
+
+    response = get_client().get_markets(
         status=TopicStatusFilter.ACTIVATED,
         limit=limit,
     )
@@ -104,7 +128,7 @@ def _extract_best_ask_price(book) -> Optional[float]:
 
 def _get_orderbook_core(token_id) -> Optional[object]:
     
-    resp = client.get_orderbook(token_id)
+    resp = get_client().get_orderbook(token_id)
 
     if getattr(resp, "errno", None) != 0:
         return None
@@ -140,7 +164,7 @@ def get_opinion_binary_prices(market_id: int) -> dict:
     Возвращает {'yes': price_or_None, 'no': price_or_None} для бинарного рынка Opinion.
     Берём лучшую ASK цену (самую дешёвую продажу).
     """
-    detail = client.get_market(market_id)
+    detail = get_client().get_market(market_id)
     if detail.errno != 0:
         raise Exception(f"Opinion get_market error {detail.errno}: {detail.errmsg}")
 
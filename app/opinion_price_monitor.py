@@ -1,8 +1,14 @@
-from typing import Dict, Optional
+import asyncio
+import os
+from typing import Dict, Iterable, Optional
 
 from opinion_tracked_markets import fetch_market
 
 
+# Each market fetch is a detail call plus two order book calls in SDK threads.
+MAX_CONCURRENT_MARKETS = int(os.getenv("OPINION_ALERT_MAX_CONCURRENCY", "8"))
+
+
 class OpinionPriceMonitor:
     """Track Opinion YES prices for alert triggers."""
 
@@ -42,6 +48,22 @@ class OpinionPriceMonitor:
             traceback.print_exc()
             return None
 
+    async def get_current_prices(
+        self,
+        market_ids: Iterable[int],
+        max_concurrency: int = MAX_CONCURRENT_MARKETS,
+    ) -> Dict[int, Optional[float]]:
+        """Fetch each distinct market once, at most max_concurrency at a time."""
+        unique_ids = list(dict.fromkeys(market_ids))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch_one(market_id: int) -> Optional[float]:
+            async with semaphore:
+                return await self.get_current_price(market_id)
+
+        prices = await asyncio.gather(*(fetch_one(market_id) for market_id in unique_ids))
+        return dict(zip(unique_ids, prices))
+
     def calculate_price_change(self, market_id: int) -> Optional[float]:
         if market_id not in self.initial_prices or market_id not in self.current_prices:
             return None
@@ -62,17 +84,13 @@ class OpinionPriceMonitor:
                 f"${self.current_prices[market_id]:.4f}"
             )
 
-    async def check_trigger(
+    def evaluate_trigger(
         self,
         market_id: int,
         alert_type: str,
         trigger_percent: float
     ) -> bool:
-        current_price = await self.get_current_price(market_id)
-
-        if current_price is None:
-            return False
-
+        """Check an alert against the last fetched price without fetching again."""
         change = self.calculate_price_change(market_id)
 
         if change is None:
@@ -94,3 +112,16 @@ class OpinionPriceMonitor:
                 )
 
         return triggered
+
+    async def check_trigger(
+        self,
+        market_id: int,
+        alert_type: str,
+        trigger_percent: float
+    ) -> bool:
+        current_price = await self.get_current_price(market_id)
+
+        if current_price is None:
+            return False
+
+        return self.evaluate_trigger(market_id, alert_type, trigger_percent)
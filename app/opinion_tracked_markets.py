@@ -6,7 +6,7 @@ import threading
 import time
 from typing import Dict, List, Optional, Tuple
 
-from opinion_client import client, _extract_best_ask_price, _get_orderbook_core
+from opinion_client import get_client, _extract_best_ask_price, _get_orderbook_core
 
 logger = logging.getLogger(__name__)
 
@@ -160,7 +160,7 @@ def _combine_parent_child_title(parent_title: str, child_title: str) -> str:
 
 def _get_market_detail_sync(market_id: int) -> Optional[object]:
     try:
-        detail = client.get_market(market_id)
+        detail = get_client().get_market(market_id)
     except Exception:
         logger.exception("Opinion get_market failed for %s", market_id)
         return None
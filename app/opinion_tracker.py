@@ -8,14 +8,27 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from opinion_clob_sdk import Client
-
 OPINION_API_KEY = os.getenv('API_KEY')
 OPINION_HOST = os.getenv('HOST', 'https://proxy.opinion.trade:8443')
 BNB_CHAIN_ID = 56
 BNB_RPC_URL = 'https://bsc.nodereal.io'
 
 
+def _read_only_client(user_address: str):
+    """Read-only Opinion client scoped to a user's address"""
+    # The SDK pulls in web3, so it is only imported once the tracker is used.
+    from opinion_clob_sdk import Client
+
+    return Client(
+        host=OPINION_HOST,
+        apikey=OPINION_API_KEY,  # Our API key
+        chain_id=BNB_CHAIN_ID,
+        rpc_url='',  # Not needed for read-only
+        private_key='0x0000000000000000000000000000000000000000000000000000000000000001',  # Dummy
+        multi_sig_addr=user_address  # User's address!
+    )
+
+
 def get_user_positions(user_address: str) -> Dict:
     """
     Get user's positions on Opinion
@@ -28,14 +41,7 @@ def get_user_positions(user_address: str) -> Dict:
     """
     try:
         # Create read-only client with user's address
-        client = Client(
-            host=OPINION_HOST,
-            apikey=OPINION_API_KEY,  # Our API key
-            chain_id=BNB_CHAIN_ID,
-            rpc_url='',  # Not needed for read-only
-            private_key='0x0000000000000000000000000000000000000000000000000000000000000001',  # Dummy
-            multi_sig_addr=user_address  # User's address!
-        )
+        client = _read_only_client(user_address)
         
         # Get positions
         positions_response = client.get_my_positions()
@@ -73,14 +79,7 @@ def get_user_balances(user_address: str) -> Dict:
     """
     try:
         # Create read-only client
-        client = Client(
-            host=OPINION_HOST,
-            apikey=OPINION_API_KEY,
-            chain_id=BNB_CHAIN_ID,
-            rpc_url='',
-            private_key='0x0000000000000000000000000000000000000000000000000000000000000001',
-            multi_sig_addr=user_address
-        )
+        client = _read_only_client(user_address)
         
         # Get balances from Opinion API
         balances_response = client.get_my_balances()
@@ -143,14 +142,7 @@ def get_user_trades(user_address: str, limit: int = 10) -> Dict:
         Dict with trades data
     """
     try:
-        client = Client(
-            host=OPINION_HOST,
-            apikey=OPINION_API_KEY,
-            chain_id=BNB_CHAIN_ID,
-            rpc_url='',
-            private_key='0x0000000000000000000000000000000000000000000000000000000000000001',
-            multi_sig_addr=user_address
-        )
+        client = _read_only_client(user_address)
         
         # Get trades
         trades_response = client.get_my_trades(limit=limit)
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+
+logger = logging.getLogger(__name__)
+
+POLY_MARKET_WS_URL = os.getenv(
+    "POLY_MARKET_WS_URL", "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+)
+
+# on_quote(asset_id, best_bid, best_ask)
+QuoteHandler = Callable[[str, Optional[float], Optional[float]], None]
+
+
+def _level_price(level) -> Optional[float]:
+    try:
+        return float(level["price"] if isinstance(level, dict) else level[0])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def _level_size(level) -> float:
+    try:
+        return float(level["size"] if isinstance(level, dict) else level[1])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return 0.0
+
+
+class LocalBook:
+    """Price -> size for both sides of one token, kept from snapshots and deltas."""
+
+    def __init__(self):
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+
+    def replace(self, bids: Iterable, asks: Iterable) -> None:
+        self.bids = self._levels(bids)
+        self.asks = self._levels(asks)
+
+    def apply(self, side: str, price: Optional[float], size: float) -> None:
+        if price is None:
+            return
+        levels = self.bids if str(side).upper() == "BUY" else self.asks
+        if size > 0:
+            levels[price] = size
+        else:
+            levels.pop(price, None)
+
+    def best(self) -> Tuple[Optional[float], Optional[float]]:
+        return (max(self.bids) if self.bids else None, min(self.asks) if self.asks else None)
+
+    @staticmethod
+    def _levels(levels: Iterable) -> Dict[float, float]:
+        book = {}
+        for level in levels or []:
+            price = _level_price(level)
+            size = _level_size(level)
+            if price is not None and size > 0:
+                book[price] = size
+        return book
+
+
+class PolymarketMarketFeed:
+    """
+    Streams best bid/ask for CLOB tokens from the Polymarket market channel.
+
+    Book snapshots and price_change deltas are folded into a local book per
+    token, and `on_quote` runs whenever a token's best bid or ask moves.
+    Dropped connections are retried with backoff (a fresh subscription
+    re-sends every snapshot); `connected` tells callers whether they need a
+    REST fallback meanwhile.
+    """
+
+    def __init__(
+        self,
+        asset_ids: Iterable[str],
+        on_quote: QuoteHandler,
+        url: str = POLY_MARKET_WS_URL,
+        ping_interval: float = 10.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+    ):
+        self.asset_ids: List[str] = [str(asset_id) for asset_id in asset_ids]
+        self.on_quote = on_quote
+        self.url = url
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.books: Dict[str, LocalBook] = {asset_id: LocalBook() for asset_id in self.asset_ids}
+        self.quotes: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        self.connected = False
+        self.connections = 0
+        self.events = 0
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._closed = False
+
+    async def run(self) -> None:
+        delay = self.reconnect_delay
+        while not self._closed:
+            events = self.events
+            try:
+                await self._connect_once()
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, ValueError) as exc:
+                logger.warning("Polymarket market feed connection failed: %s", exc)
+            except Exception:
+                logger.exception("Polymarket market feed error")
+            finally:
+                self.connected = False
+
+            if self._closed:
+                break
+            if self.events > events:
+                delay = self.reconnect_delay
+            logger.info("Reconnecting to Polymarket market feed in %.1fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def close(self) -> None:
+        self._closed = True
+        self.connected = False
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _connect_once(self) -> None:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+
+        async with self._session.ws_connect(self.url, heartbeat=None) as ws:
+            self._ws = ws
+            await ws.send_json({"assets_ids": self.asset_ids, "type": "market"})
+            self.connected = True
+            self.connections += 1
+            pinger = asyncio.create_task(self._ping(ws))
+            try:
+                async for frame in ws:
+                    if frame.type == aiohttp.WSMsgType.TEXT:
+                        if frame.data == "PONG":
+                            continue
+                        self.handle(json.loads(frame.data))
+                    elif frame.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        break
+            finally:
+                pinger.cancel()
+                self._ws = None
+
+        logger.warning("Polymarket market feed closed (code=%s)", ws.close_code)
+
+    async def _ping(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        while not ws.closed:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send_str("PING")
+
+    def handle(self, payload) -> None:
+        """Apply one frame (a single event or a list of events)."""
+        for event in payload if isinstance(payload, list) else [payload]:
+            if not isinstance(event, dict):
+                continue
+            event_type = event.get("event_type")
+            if event_type == "book":
+                self._on_book(event)
+            elif event_type == "price_change":
+                self._on_price_change(event)
+
+    def _on_book(self, event: Dict) -> None:
+        book = self.books.get(str(event.get("asset_id")))
+        if book is None:
+            return
+        book.replace(event.get("bids") or event.get("buys"), event.get("asks") or event.get("sells"))
+        self._emit(str(event["asset_id"]))
+
+    def _on_price_change(self, event: Dict) -> None:
+        # Current payloads carry one entry per token in price_changes; older
+        # ones had a single asset_id with its changes.
+        changes = event.get("price_changes")
+        if changes is None:
+            changes = [dict(change, asset_id=event.get("asset_id")) for change in event.get("changes") or []]
+
+        touched = []
+        for change in changes:
+            asset_id = str(change.get("asset_id"))
+            book = self.books.get(asset_id)
+            if book is None:
+                continue
+            book.apply(change.get("side"), _level_price(change), _level_size(change))
+            if asset_id not in touched:
+                touched.append(asset_id)
+
+        for asset_id in touched:
+            self._emit(asset_id)
+
+    def _emit(self, asset_id: str) -> None:
+        self.events += 1
+        quote = self.books[asset_id].best()
+        if self.quotes.get(asset_id) == quote:
+            return
+        self.quotes[asset_id] = quote
+        self.on_quote(asset_id, *quote)
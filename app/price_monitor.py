@@ -1,7 +1,6 @@
 
 import asyncio
 from typing import Dict, Optional
-from py_clob_client.client import ClobClient
 from market_config import get_market
 from database import Database
 
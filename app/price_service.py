@@ -0,0 +1,242 @@
+"""
+Price Service
+Batched Polymarket CLOB token prices with a shared TTL cache
+"""
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+CLOB_URL = os.getenv("POLY_CLOB_URL", "https://clob.polymarket.com")
+PRICE_TTL_SEC = float(os.getenv("PRICE_CACHE_TTL_SEC", "15"))
+# Unpriced tokens (failed request, empty book) are retried much sooner.
+PRICE_MISS_TTL_SEC = float(os.getenv("PRICE_MISS_TTL_SEC", "3"))
+BOOK_TTL_SEC = float(os.getenv("BOOK_CACHE_TTL_SEC", "10"))
+REQUEST_TIMEOUT_SEC = 8
+
+# Shared across every PriceService instance in the process:
+# token_id -> (value, expires_at monotonic)
+_PRICE_CACHE: Dict[str, Tuple[Optional[float], float]] = {}
+_BOOK_CACHE: Dict[str, Tuple[Dict, float]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _coerce_price(value) -> Optional[float]:
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    if price < 0:
+        return None
+    return price
+
+
+def best_bid_ask(book: Optional[Dict]) -> Tuple[Optional[float], Optional[float]]:
+    """Best bid/ask from a CLOB book payload (levels are not guaranteed to be sorted)."""
+    if not book:
+        return None, None
+
+    bid_prices = [
+        p for p in (_coerce_price(level.get("price")) for level in book.get("bids") or [])
+        if p is not None
+    ]
+    ask_prices = [
+        p for p in (_coerce_price(level.get("price")) for level in book.get("asks") or [])
+        if p is not None
+    ]
+
+    best_bid = max(bid_prices) if bid_prices else None
+    best_ask = min(ask_prices) if ask_prices else None
+    return best_bid, best_ask
+
+
+def _midpoint(bid: Optional[float], ask: Optional[float]) -> Optional[float]:
+    if bid is None or ask is None or bid <= 0 or ask <= 0:
+        return None
+    return (bid + ask) / 2
+
+
+class PriceService:
+    """
+    Resolves many token prices with one POST /prices call.
+    Tokens the batch cannot price fall back to the midpoint of their order book,
+    taken from the shared book cache (missing books are fetched with one POST /books).
+    """
+
+    def __init__(
+        self,
+        clob_url: str = CLOB_URL,
+        price_ttl_sec: float = PRICE_TTL_SEC,
+        book_ttl_sec: float = BOOK_TTL_SEC,
+        price_miss_ttl_sec: float = PRICE_MISS_TTL_SEC,
+    ):
+        self.clob_url = clob_url.rstrip("/")
+        self.price_ttl_sec = price_ttl_sec
+        self.price_miss_ttl_sec = price_miss_ttl_sec
+        self.book_ttl_sec = book_ttl_sec
+
+    # ===== PRICES =====
+
+    def get_prices(self, token_ids: Iterable) -> Dict[str, Optional[float]]:
+        """Return {token_id: price or None} for all requested tokens."""
+        wanted = self._unique_tokens(token_ids)
+        if not wanted:
+            return {}
+
+        now = time.monotonic()
+        result: Dict[str, Optional[float]] = {}
+        missing: List[str] = []
+
+        with _CACHE_LOCK:
+            for token_id in wanted:
+                cached = _PRICE_CACHE.get(token_id)
+                if cached and cached[1] > now:
+                    result[token_id] = cached[0]
+                else:
+                    missing.append(token_id)
+
+        if not missing:
+            return result
+
+        fetched = self._fetch_batch_prices(missing)
+
+        unpriced = [token_id for token_id in missing if fetched.get(token_id) is None]
+        if unpriced:
+            books = self.get_order_books(unpriced)
+            for token_id in unpriced:
+                fetched[token_id] = _midpoint(*best_bid_ask(books.get(token_id)))
+
+        now = time.monotonic()
+        with _CACHE_LOCK:
+            for token_id in missing:
+                price = fetched.get(token_id)
+                ttl = self.price_ttl_sec if price is not None else self.price_miss_ttl_sec
+                _PRICE_CACHE[token_id] = (price, now + ttl)
+                result[token_id] = price
+
+        return result
+
+    def get_price(self, token_id) -> Optional[float]:
+        token_key = str(token_id or "").strip()
+        if not token_key:
+            return None
+        return self.get_prices([token_key]).get(token_key)
+
+    def _fetch_batch_prices(self, token_ids: List[str]) -> Dict[str, Optional[float]]:
+        """One POST /prices for both sides of every token; price = mid of BUY/SELL."""
+        payload = []
+        for token_id in token_ids:
+            payload.append({"token_id": token_id, "side": "BUY"})
+            payload.append({"token_id": token_id, "side": "SELL"})
+
+        try:
+            response = requests.post(
+                f"{self.clob_url}/prices",
+                json=payload,
+                timeout=REQUEST_TIMEOUT_SEC,
+            )
+            response.raise_for_status()
+            data = response.json() if response.content else {}
+        except Exception as e:
+            print(f"Batch price request failed for {len(token_ids)} tokens: {e}")
+            return {}
+
+        if not isinstance(data, dict):
+            return {}
+
+        prices: Dict[str, Optional[float]] = {}
+        for token_id in token_ids:
+            sides = data.get(token_id)
+            if not isinstance(sides, dict):
+                continue
+            buy = _coerce_price(sides.get("BUY") or sides.get("buy"))
+            sell = _coerce_price(sides.get("SELL") or sides.get("sell"))
+            prices[token_id] = _midpoint(buy, sell)
+        return prices
+
+    # ===== ORDER BOOKS =====
+
+    def get_order_books(self, token_ids: Iterable) -> Dict[str, Dict]:
+        """Return cached books, fetching the missing ones with a single POST /books."""
+        wanted = self._unique_tokens(token_ids)
+        if not wanted:
+            return {}
+
+        now = time.monotonic()
+        books: Dict[str, Dict] = {}
+        missing: List[str] = []
+
+        with _CACHE_LOCK:
+            for token_id in wanted:
+                cached = _BOOK_CACHE.get(token_id)
+                if cached and cached[1] > now:
+                    books[token_id] = cached[0]
+                else:
+                    missing.append(token_id)
+
+        if missing:
+            fetched = self._fetch_books(missing)
+            expires_at = time.monotonic() + self.book_ttl_sec
+            with _CACHE_LOCK:
+                for token_id, book in fetched.items():
+                    _BOOK_CACHE[token_id] = (book, expires_at)
+            books.update(fetched)
+
+        return books
+
+    def get_order_book(self, token_id) -> Optional[Dict]:
+        token_key = str(token_id or "").strip()
+        if not token_key:
+            return None
+        return self.get_order_books([token_key]).get(token_key)
+
+    def _fetch_books(self, token_ids: List[str]) -> Dict[str, Dict]:
+        try:
+            response = requests.post(
+                f"{self.clob_url}/books",
+                json=[{"token_id": token_id} for token_id in token_ids],
+                timeout=REQUEST_TIMEOUT_SEC,
+            )
+            response.raise_for_status()
+            data = response.json() if response.content else []
+        except Exception as e:
+            print(f"Batch book request failed for {len(token_ids)} tokens: {e}")
+            return {}
+
+        if isinstance(data, dict):
+            data = [data]
+        if not isinstance(data, list):
+            return {}
+
+        books: Dict[str, Dict] = {}
+        for book in data:
+            if not isinstance(book, dict):
+                continue
+            token_id = str(book.get("asset_id") or book.get("token_id") or "").strip()
+            if token_id:
+                books[token_id] = book
+        return books
+
+    @staticmethod
+    def _unique_tokens(token_ids: Iterable) -> List[str]:
+        seen = set()
+        tokens: List[str] = []
+        for token_id in token_ids or []:
+            token_key = str(token_id or "").strip()
+            if not token_key or token_key == "TBD" or token_key in seen:
+                continue
+            seen.add(token_key)
+            tokens.append(token_key)
+        return tokens
+
+
+_service: Optional[PriceService] = None
+
+
+def get_price_service() -> PriceService:
+    global _service
+    if _service is None:
+        _service = PriceService()
+    return _service
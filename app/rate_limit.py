@@ -0,0 +1,76 @@
+"""
+Rate Limiter
+Token-bucket request budget shared between threads and event loops
+"""
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate_per_sec` acquisitions per second with bursts of `burst`.
+
+    Each acquire reserves a slot under a thread lock and then waits outside it,
+    so the same budget can be shared by worker threads and by several event loops.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec must be positive")
+        self.rate_per_sec = float(rate_per_sec)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate_per_sec)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """Reserve one slot and return how many seconds the caller must wait for it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_sec
+
+    def delay(self) -> float:
+        """Seconds until a slot would be free, without reserving it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1.0:
+                return 0.0
+            return (1.0 - self._tokens) / self.rate_per_sec
+
+    def set_rate(self, rate_per_sec: float, burst: int = None) -> None:
+        """Change the budget in place; slots already reserved keep their wait."""
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec must be positive")
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate_per_sec = float(rate_per_sec)
+            if burst is not None:
+                self.burst = max(1, int(burst))
+            self._tokens = min(self._tokens, float(self.burst))
+
+    def block_for(self, seconds: float) -> None:
+        """Drain the bucket so no slot is available for `seconds` (e.g. after HTTP 429)."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 1.0 - seconds * self.rate_per_sec)
+
+    async def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_blocking(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
@@ -26,8 +26,14 @@ USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 CTF_ADDRESS = "0x4d97dcd97ec945f40cf65f87097ace5ea0476045"
 CTF_EXCHANGE = "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E"
 
+# Relayer transaction polling: every second for up to a minute (the SDK's
+# response.wait() polls every 2s, adding up to 2s to each confirmation)
+RELAYER_POLL_MS = 1000
+RELAYER_MAX_POLLS = 60
+
 # Import RelayClient
 from py_builder_relayer_client.client import RelayClient
+from py_builder_relayer_client.models import RelayerTransactionState
 
 
 class UserRelayerClient:
@@ -98,7 +104,7 @@ class UserRelayerClient:
             
             
             response = self.client.deploy()
-            result = response.wait()
+            result = self._wait(response)
             
             if result:
                 
@@ -143,44 +149,67 @@ class UserRelayerClient:
                 'error': error_msg
             }
     
-    def approve_usdc(self) -> Dict:
+    def _wait(self, response):
+        """Poll a submitted relayer transaction until it is mined or confirmed"""
+        if response.transaction_id is None:
+            return None
+        return self.client.poll_until_state(
+            transaction_id=response.transaction_id,
+            states=[
+                RelayerTransactionState.STATE_MINED.value,
+                RelayerTransactionState.STATE_CONFIRMED.value,
+            ],
+            fail_state=RelayerTransactionState.STATE_FAILED.value,
+            max_polls=RELAYER_MAX_POLLS,
+            poll_frequency=RELAYER_POLL_MS,
+        )
+    
+    @staticmethod
+    def _safe_call(to: str, signature: str, types: list, values: list):
+        
+        from eth_utils import keccak, to_checksum_address
+        from eth_abi import encode
+        from py_builder_relayer_client.models import OperationType, SafeTransaction
+        
+        selector = keccak(text=signature)[:4]
+        data = "0x" + (selector + encode(types, values)).hex()
+        
+        return SafeTransaction(
+            to=to_checksum_address(to),
+            operation=OperationType.Call,
+            data=data,
+            value="0"
+        )
+    
+    def usdc_approval_tx(self):
+        """USDC approve(CTF Exchange, max)"""
+        from eth_utils import to_checksum_address
+        return self._safe_call(
+            USDC_ADDRESS,
+            "approve(address,uint256)",
+            ["address", "uint256"],
+            [to_checksum_address(CTF_EXCHANGE), 2**256 - 1]
+        )
+    
+    def ctf_approval_tx(self):
+        """CTF setApprovalForAll(CTF Exchange, true)"""
+        from eth_utils import to_checksum_address
+        return self._safe_call(
+            CTF_ADDRESS,
+            "setApprovalForAll(address,bool)",
+            ["address", "bool"],
+            [to_checksum_address(CTF_EXCHANGE), True]
+        )
+    
+    def _execute(self, transactions: list, metadata: str, label: str) -> Dict:
         
         try:
-            print(f"💰 Approving USDC for user {self.telegram_id}...")
-            
-            from eth_utils import keccak, to_checksum_address
-            from eth_abi import encode
-            from py_builder_relayer_client.models import OperationType, SafeTransaction
-            
-            
-            def _function_selector(signature: str) -> bytes:
-                return keccak(text=signature)[:4]
-            
-            selector = _function_selector("approve(address,uint256)")
-            encoded_args = encode(
-                ["address", "uint256"],
-                [to_checksum_address(CTF_EXCHANGE), 2**256 - 1]
-            )
-            approve_data = "0x" + (selector + encoded_args).hex()
-            
-            
-            safe_tx = SafeTransaction(
-                to=to_checksum_address(USDC_ADDRESS),
-                operation=OperationType.Call,
-                data=approve_data,
-                value="0"
-            )
-            
-            response = self.client.execute(
-                [safe_tx],
-                metadata=f"USDC approve for TG user {self.telegram_id}"
-            )
-            
-            result = response.wait()
+            response = self.client.execute(transactions, metadata=metadata)
+            result = self._wait(response)
             
             if result:
                 tx_hash = result.get('transactionHash') or result.get('transaction_hash')
-                print(f"✅ USDC approved: {tx_hash}")
+                print(f"✅ {label}: {tx_hash}")
                 return {
                     'tx_hash': tx_hash,
                     'status': 'success'
@@ -189,100 +218,89 @@ class UserRelayerClient:
                 return {'status': 'failed'}
                 
         except Exception as e:
-            print(f"❌ Error approving USDC: {e}")
+            print(f"❌ Error in {label}: {e}")
             return {
                 'status': 'error',
                 'error': str(e)
             }
     
+    def approve_usdc(self) -> Dict:
+        
+        print(f"💰 Approving USDC for user {self.telegram_id}...")
+        return self._execute(
+            [self.usdc_approval_tx()],
+            f"USDC approve for TG user {self.telegram_id}",
+            "USDC approved"
+        )
+    
     def approve_ctf(self) -> Dict:
         
-        try:
-            print(f"🎯 Approving CTF for user {self.telegram_id}...")
-            
-            from eth_utils import keccak, to_checksum_address
-            from eth_abi import encode
-            from py_builder_relayer_client.models import OperationType, SafeTransaction
-            
-            
-            def _function_selector(signature: str) -> bytes:
-                return keccak(text=signature)[:4]
-            
-            selector = _function_selector("setApprovalForAll(address,bool)")
-            encoded_args = encode(
-                ["address", "bool"],
-                [to_checksum_address(CTF_EXCHANGE), True]
-            )
-            approve_data = "0x" + (selector + encoded_args).hex()
-            
-            
-            safe_tx = SafeTransaction(
-                to=to_checksum_address(CTF_ADDRESS),
-                operation=OperationType.Call,
-                data=approve_data,
-                value="0"
-            )
-            
-            response = self.client.execute(
-                [safe_tx],
-                metadata=f"CTF approve for TG user {self.telegram_id}"
-            )
-            
-            result = response.wait()
-            
-            if result:
-                tx_hash = result.get('transactionHash') or result.get('transaction_hash')
-                print(f"✅ CTF approved: {tx_hash}")
-                return {
-                    'tx_hash': tx_hash,
-                    'status': 'success'
-                }
-            else:
-                return {'status': 'failed'}
-                
-        except Exception as e:
-            print(f"❌ Error approving CTF: {e}")
-            return {
-                'status': 'error',
-                'error': str(e)
-            }
+        print(f"🎯 Approving CTF for user {self.telegram_id}...")
+        return self._execute(
+            [self.ctf_approval_tx()],
+            f"CTF approve for TG user {self.telegram_id}",
+            "CTF approved"
+        )
+    
+    def approve_all(self) -> Dict:
+        """
+        USDC approve + CTF setApprovalForAll in one Safe MultiSend transaction,
+        so both land with a single relayer confirmation
+        """
+        print(f"💰🎯 Approving USDC + CTF for user {self.telegram_id}...")
+        return self._execute(
+            [self.usdc_approval_tx(), self.ctf_approval_tx()],
+            f"USDC + CTF approve for TG user {self.telegram_id}",
+            "USDC + CTF approved"
+        )
     
     def setup_trading(self) -> Dict:
-       
+        """
+        Deploy the Safe, then approve USDC and CTF in one batched transaction.
+        
+        The relayer refuses Safe transactions until the Safe is deployed, so
+        the approvals are submitted as soon as the deployment is mined; an
+        already deployed Safe goes straight to the approvals.
+        
+        Returns per-step durations in seconds under 'timings'.
+        """
         print(f"\n🔧 Setting up trading for user {self.telegram_id}...")
+        timings = {}
+        started = time.monotonic()
         
         
         safe_result = self.deploy_safe()
+        timings['deploy_safe'] = round(time.monotonic() - started, 2)
         if safe_result['status'] != 'success':
+            timings['total'] = timings['deploy_safe']
             return {
                 'status': 'failed',
                 'step': 'deploy_safe',
-                'error': safe_result.get('error', 'Failed to deploy Safe')
+                'error': safe_result.get('error', 'Failed to deploy Safe'),
+                'timings': timings
             }
         
         safe_address = safe_result['safe_address']
         
         
-        usdc_result = self.approve_usdc()
-        if usdc_result['status'] != 'success':
-            return {
-                'safe_address': safe_address,
-                'safe_tx_hash': safe_result['tx_hash'],
-                'status': 'failed',
-                'step': 'approve_usdc',
-                'error': usdc_result.get('error', 'Failed to approve USDC')
-            }
-        
+        approvals_started = time.monotonic()
+        approvals_result = self.approve_all()
+        timings['approvals'] = round(time.monotonic() - approvals_started, 2)
+        timings['total'] = round(time.monotonic() - started, 2)
+        print(
+            f"⏱️ Trading setup for user {self.telegram_id}: "
+            f"deploy {timings['deploy_safe']}s, approvals {timings['approvals']}s, "
+            f"total {timings['total']}s"
+        )
         
-        ctf_result = self.approve_ctf()
-        if ctf_result['status'] != 'success':
+        if approvals_result['status'] != 'success':
             return {
                 'safe_address': safe_address,
                 'safe_tx_hash': safe_result['tx_hash'],
-                'usdc_tx_hash': usdc_result['tx_hash'],
                 'status': 'failed',
-                'step': 'approve_ctf',
-                'error': ctf_result.get('error', 'Failed to approve CTF')
+                'step': 'approvals',
+                'error': approvals_result.get('error', 'Failed to approve USDC and CTF'),
+                'timings': timings
             }
         
         print(f"✅ Trading setup complete for user {self.telegram_id}!")
@@ -290,9 +308,9 @@ class UserRelayerClient:
         return {
             'safe_address': safe_address,
             'safe_tx_hash': safe_result['tx_hash'],
-            'usdc_tx_hash': usdc_result['tx_hash'],
-            'ctf_tx_hash': ctf_result['tx_hash'],
-            'status': 'success'
+            'approvals_tx_hash': approvals_result['tx_hash'],
+            'status': 'success',
+            'timings': timings
         }
 
 
@@ -300,4 +318,4 @@ class UserRelayerClient:
 def setup_user_for_trading(user_private_key: str, telegram_id: int) -> Dict:
    
     relayer = UserRelayerClient(user_private_key, telegram_id)
-    return relayer.setup_trading()
\ No newline at end of file
+    return relayer.setup_trading()
@@ -0,0 +1,163 @@
+"""
+Spread Matrix
+Cross-venue Opinion / Polymarket prices for every tracked market in one concurrent fan-out
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+SPREAD_MATRIX_TTL_SEC = float(os.getenv("SPREAD_MATRIX_TTL_SEC", "30"))
+SPREAD_FETCH_TIMEOUT_SEC = float(os.getenv("SPREAD_FETCH_TIMEOUT_SEC", "8"))
+# Every (market, venue) price fetch of one refresh runs side by side on this pool.
+_SPREAD_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="spread-matrix")
+
+EMPTY_PRICES = {"yes": None, "no": None}
+
+
+def format_age(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "no data yet"
+    if seconds < 1:
+        return "just now"
+    if seconds < 60:
+        return f"{seconds:.0f}s ago"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m ago"
+    return f"{seconds / 3600:.1f}h ago"
+
+
+def _format_price(price: Optional[float]) -> str:
+    return f"{price:.3f}" if price is not None else "N/A"
+
+
+def _format_delta(op_price: Optional[float], poly_price: Optional[float]) -> str:
+    if op_price is None or poly_price is None:
+        return "—"
+    return f"{op_price - poly_price:+.4f}"
+
+
+class SpreadMatrix:
+    """
+    Caches binary prices per (market alias, venue).
+
+    A refresh fetches every market on every venue at once and concurrent callers
+    share the refresh in flight. Rows older than ttl_sec are served as they are
+    while a background refresh replaces them; only markets that were never
+    fetched make the caller wait. A failed fetch keeps the last good prices.
+    """
+
+    def __init__(
+        self,
+        fetchers: Dict[str, Callable[[int], Dict]],
+        ttl_sec: float = SPREAD_MATRIX_TTL_SEC,
+        fetch_timeout_sec: float = SPREAD_FETCH_TIMEOUT_SEC,
+    ):
+        # venue -> fetch(market id); each market dict carries "<venue>_id"
+        self.fetchers = dict(fetchers)
+        self.ttl_sec = ttl_sec
+        self.fetch_timeout_sec = fetch_timeout_sec
+        # (alias, venue) -> {"prices", "fetched_at", "checked_at", "error"}
+        self._quotes: Dict[Tuple[str, str], Dict] = {}
+        self._refreshing: Optional[asyncio.Task] = None
+
+    async def get_rows(self, markets: Iterable[Dict]) -> List[Dict]:
+        """Matrix rows for markets, refreshing stale ones without waiting on them."""
+        markets = list(markets)
+        now = time.monotonic()
+        if any(self._is_stale(market, now) for market in markets):
+            refresh = self.refresh(markets)
+            if any(self._is_cold(market) for market in markets):
+                await asyncio.shield(refresh)
+        return self.rows(markets)
+
+    def refresh(self, markets: Iterable[Dict]) -> asyncio.Task:
+        """Start a refresh of every market, or return the one already running."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.get_running_loop().create_task(self._refresh(list(markets)))
+        return self._refreshing
+
+    async def _refresh(self, markets: List[Dict]) -> None:
+        jobs = [
+            (market["alias"], venue, market[f"{venue}_id"])
+            for market in markets
+            for venue in self.fetchers
+        ]
+        results = await asyncio.gather(
+            *(self._fetch(venue, market_id) for _, venue, market_id in jobs),
+            return_exceptions=True,
+        )
+
+        now = time.monotonic()
+        for (alias, venue, _), result in zip(jobs, results):
+            previous = self._quotes.get((alias, venue)) or {}
+            if isinstance(result, BaseException):
+                error = str(result) or type(result).__name__
+                print(f"⚠️ Spread matrix: {venue} price for '{alias}' failed: {error}")
+                self._quotes[(alias, venue)] = {
+                    "prices": previous.get("prices", EMPTY_PRICES),
+                    "fetched_at": previous.get("fetched_at"),
+                    "checked_at": now,
+                    "error": error,
+                }
+            else:
+                self._quotes[(alias, venue)] = {
+                    "prices": result or EMPTY_PRICES,
+                    "fetched_at": now,
+                    "checked_at": now,
+                    "error": None,
+                }
+
+    async def _fetch(self, venue: str, market_id: int) -> Dict:
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(_SPREAD_EXECUTOR, self.fetchers[venue], market_id),
+            timeout=self.fetch_timeout_sec,
+        )
+
+    def rows(self, markets: Iterable[Dict]) -> List[Dict]:
+        """Cached matrix rows; age is that of the row's oldest venue quote."""
+        now = time.monotonic()
+        rows = []
+        for market in markets:
+            quotes = {venue: self._quotes.get((market["alias"], venue)) or {} for venue in self.fetchers}
+            fetched = [quote.get("fetched_at") for quote in quotes.values()]
+            rows.append({
+                "alias": market["alias"],
+                "title": market["title"],
+                "prices": {venue: quote.get("prices", EMPTY_PRICES) for venue, quote in quotes.items()},
+                "errors": {venue: quote["error"] for venue, quote in quotes.items() if quote.get("error")},
+                "age_sec": None if None in fetched else now - min(fetched),
+            })
+        return rows
+
+    def _is_cold(self, market: Dict) -> bool:
+        return any((market["alias"], venue) not in self._quotes for venue in self.fetchers)
+
+    def _is_stale(self, market: Dict, now: float) -> bool:
+        for venue in self.fetchers:
+            quote = self._quotes.get((market["alias"], venue))
+            if not quote or now - quote["checked_at"] >= self.ttl_sec:
+                return True
+        return False
+
+
+def format_spread_matrix(rows: List[Dict]) -> str:
+    lines = ["🧠 Spread matrix — Opinion vs Polymarket", "Δ = Opinion − Polymarket", ""]
+    for row in rows:
+        op = row["prices"].get("opinion", EMPTY_PRICES)
+        poly = row["prices"].get("polymarket", EMPTY_PRICES)
+        lines.append(f"• {row['alias']} — {row['title']}")
+        for side in ("yes", "no"):
+            lines.append(
+                f"  {side.upper():<3} Op {_format_price(op[side])} | "
+                f"Poly {_format_price(poly[side])} | Δ {_format_delta(op[side], poly[side])}"
+            )
+        status = f"  🕒 {format_age(row['age_sec'])}"
+        if row["errors"]:
+            status += " · ⚠ " + ", ".join(f"{venue} failed" for venue in row["errors"])
+        lines.append(status)
+        lines.append("")
+    lines.append("Details: /spread <alias>")
+    return "\n".join(lines)
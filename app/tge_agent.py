@@ -5,9 +5,9 @@ Integrates: PredictOS + Dome API + x402
 import asyncio
 from typing import Dict, Optional
 from integrations.predictos_client import PredictOSClient
-from integrations.dome_client import DomeClientAsync as DomeClient
+from integrations.dome_client import get_dome_client_async
 from integrations.x402_client import X402Client
-from tge_alert_config import find_keywords, DEFAULT_TGE_KEYWORDS
+from tge_signal_classifier import TgeSignalClassifier
 
 # Known Polymarket CLOB token IDs from our trading system.
 # Used as fallback when Dome API doesn't return clob_token_yes.
@@ -49,36 +49,38 @@ KNOWN_MARKET_TOKENS = {
     },
 }
 
+SIGNAL_CLASSIFIER = TgeSignalClassifier(KNOWN_MARKET_TOKENS)
+
+
+def register_known_market(market_key: str, token_info: Dict) -> None:
+    """Add or replace a known market and recompile the signal classifier."""
+    global SIGNAL_CLASSIFIER
+    KNOWN_MARKET_TOKENS[market_key] = token_info
+    SIGNAL_CLASSIFIER = TgeSignalClassifier(KNOWN_MARKET_TOKENS)
+
 
 class TGEAgent:
     def __init__(self):
         self.predictos = PredictOSClient()
-        self.dome = DomeClient()
         self.x402 = X402Client()
 
+    @property
+    def dome(self):
+        # Built on the first market lookup, not when the worker module is imported.
+        return get_dome_client_async()
+
     def _resolve_known_token(self, project_name: str, message_content: str = "") -> Optional[Dict]:
         """Match project_name or message_content against KNOWN_MARKET_TOKENS by keyword substring."""
-        texts_to_check = [project_name.lower(), message_content.lower()]
-        for token_info in KNOWN_MARKET_TOKENS.values():
-            for kw in token_info["keywords"]:
-                for text in texts_to_check:
-                    if kw in text:
-                        return token_info
-        return None
+        return SIGNAL_CLASSIFIER.classify(message_content or "", project_name or "").market
 
     @staticmethod
     def _extract_search_term(message_content: str, fallback: str) -> str:
         """Extract best Dome search term from message by matching known project keywords.
 
-        Returns the first matching keyword (e.g. "base") so Dome searches for
+        Returns the first matching market key (e.g. "base") so Dome searches for
         the actual project instead of the agent name like "testagent".
         """
-        msg_lower = message_content.lower()
-        for market_key, token_info in KNOWN_MARKET_TOKENS.items():
-            for kw in token_info["keywords"]:
-                if kw in msg_lower:
-                    return market_key
-        return fallback
+        return SIGNAL_CLASSIFIER.classify(message_content or "").search_key or fallback
 
     async def analyze_signal(
         self,
@@ -93,8 +95,11 @@ class TGEAgent:
         # Normalize project name for consistent matching
         project_name = project_name.strip().lower()
 
+        # One compiled pass: TGE keyword hits, search term and known market
+        signal = SIGNAL_CLASSIFIER.classify(message_content or "", project_name)
+
         # STEP 1: Basic keyword check
-        keywords_found = find_keywords(message_content, DEFAULT_TGE_KEYWORDS)
+        keywords_found = list(signal.keywords_found)
         if not keywords_found:
             return {
                 "action": "ignore",
@@ -124,14 +129,14 @@ class TGEAgent:
 
         # STEP 3: x402 Tool Discovery
         # Use actual project keyword from message for better search results
-        search_term = self._extract_search_term(message_content, project_name)
+        search_term = signal.search_key or project_name
 
         discovered_tools = await self.x402.discover_tools(
             query=f"polymarket prediction market {search_term} TGE"
         )
 
         # Resolve known token early (check both agent name and message text)
-        known = self._resolve_known_token(project_name, message_content)
+        known = signal.market
 
         # Debug logging
         print(f"🔍 Known token resolution:")
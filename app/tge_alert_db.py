@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from database import Database
 from tge_alert_config import DEFAULT_TGE_KEYWORDS, normalize_keywords
@@ -460,3 +460,81 @@ class TgeAlertDatabase:
 
         conn.commit()
         conn.close()
+
+    def get_last_discord_message_ids(
+        self, keys: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[str]]:
+        """Cursor lookup for many (project_name, discord_channel_id) pairs in one query."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        channel_ids = sorted({channel_id for _, channel_id in keys})
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute(
+                """
+                SELECT project_name, discord_channel_id, last_message_id
+                FROM tge_discord_state
+                WHERE discord_channel_id = ANY(%s)
+                """,
+                (channel_ids,),
+            )
+        else:
+            placeholders = ", ".join("?" for _ in channel_ids)
+            cursor.execute(
+                f"""
+                SELECT project_name, discord_channel_id, last_message_id
+                FROM tge_discord_state
+                WHERE discord_channel_id IN ({placeholders})
+                """,
+                channel_ids,
+            )
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        found = {(row[0], row[1]): row[2] for row in rows}
+        return {key: found.get(key) for key in keys}
+
+    def set_last_discord_message_ids(self, cursors: Dict[Tuple[str, str], str]) -> None:
+        """Upsert many cursors in one transaction."""
+        if not cursors:
+            return
+
+        params = [
+            (project_name, channel_id, message_id)
+            for (project_name, channel_id), message_id in cursors.items()
+        ]
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.executemany(
+                """
+                INSERT INTO tge_discord_state
+                (project_name, discord_channel_id, last_message_id)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (project_name, discord_channel_id) DO UPDATE
+                SET last_message_id = EXCLUDED.last_message_id,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                params,
+            )
+        else:
+            cursor.executemany(
+                """
+                INSERT INTO tge_discord_state
+                (project_name, discord_channel_id, last_message_id)
+                VALUES (?, ?, ?)
+                ON CONFLICT(project_name, discord_channel_id) DO UPDATE SET
+                    last_message_id = excluded.last_message_id,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                params,
+            )
+
+        conn.commit()
+        conn.close()
@@ -1,20 +1,27 @@
 import asyncio
 import logging
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from telegram import Bot
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 
-from tge_alert_config import find_keywords, format_keywords, truncate_text
+from tge_alert_config import format_keywords, truncate_text
 from tge_alert_db import TgeAlertDatabase
+from tge_channel_bus import DiscordChannelBus
+from tge_discord_gateway import DiscordGateway
 from tge_discord_monitor import DiscordMonitor
+from tge_keyword_matcher import TgeKeywordMatcher
 from tge_projects import get_project_config
 from agent_db import AgentDatabase
 from tge_agent import TGEAgent
+from integrations.dome_client import close_dome_client_async
 from clob_trading import trade_market
+from balance_cache import invalidate_wallet_snapshot
 from wallet_manager import WalletManager
 
 
@@ -24,19 +31,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# "poll" (REST every check interval) or "gateway" (stream MESSAGE_CREATE, poll as fallback)
+DISCORD_INGEST_MODE = os.getenv("DISCORD_INGEST_MODE", "poll").lower()
+
+# Agents analysed in parallel per tick; messages for one agent stay in order.
+AGENT_MAX_CONCURRENCY = int(os.getenv("TGE_AGENT_MAX_CONCURRENCY", "4"))
+
+KEYWORD_WORD_BOUNDARY = os.getenv("TGE_KEYWORD_WORD_BOUNDARY", "").lower() in {"1", "true", "yes"}
+
 
 class TgeAlertWorker:
     def __init__(self, telegram_token: str, discord_token: Optional[str]):
         self.db = TgeAlertDatabase()
-        self.bot = Bot(token=telegram_token)
+        # Agents share this bot; a bare Bot() has one connection, so one slow
+        # send would hold up every other agent's notification.
+        request = HTTPXRequest(
+            connection_pool_size=max(8, AGENT_MAX_CONCURRENCY),
+            pool_timeout=30.0,
+            connect_timeout=30.0,
+            read_timeout=30.0,
+        )
+        self.bot = Bot(token=telegram_token, request=request)
 
         self.discord_monitor = None
+        self.bus: Optional[DiscordChannelBus] = None
         if discord_token:
             self.discord_monitor = DiscordMonitor(discord_token, min_interval_sec=60)
+            self.bus = DiscordChannelBus(self.discord_monitor, self.db)
         else:
             logger.warning("Discord monitoring disabled")
 
         self.check_interval = 30
+        self.last_tick_stats: Dict[str, object] = {}
+        self._keyword_matchers: Dict[str, TgeKeywordMatcher] = {}
         self._running = True
 
         logger.info("TGE Alert worker initialized (interval=%ss)", self.check_interval)
@@ -48,55 +75,73 @@ class TgeAlertWorker:
         except TelegramError:
             logger.exception("Failed to send TGE alert to %s", telegram_id)
 
+    def alert_subscriptions(self) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """Active alerts grouped by project, plus {project_name: channel_id} to poll."""
+        alerts = self.db.get_active_alerts()
+        if not alerts:
+            return {}, {}
+
+        projects = self._group_alerts_by_project(alerts)
+        logger.info("TGE Discord check: %s alerts across %s projects", len(alerts), len(projects))
+
+        targets: Dict[str, str] = {}
+        for project_name, data in projects.items():
+            channel_id = data.get("discord_channel_id")
+            if not channel_id:
+                logger.info("Discord channel not configured for %s", project_name)
+                continue
+            targets[project_name] = channel_id
+        return projects, targets
+
     async def check_discord_alerts(self) -> None:
-        if not self.discord_monitor:
+        if not self.bus:
             logger.debug("Discord monitoring disabled (missing token)")
             return
 
-        alerts = self.db.get_active_alerts()
-        if not alerts:
+        projects, targets = self.alert_subscriptions()
+        if not targets:
             logger.info("TGE Discord check: no active alerts")
             return
 
-        projects = self._group_alerts_by_project(alerts)
-        logger.info("TGE Discord check: %s alerts across %s projects", len(alerts), len(projects))
+        started = time.monotonic()
+        await self.bus.poll(targets.values())
+        fetch_seconds = time.monotonic() - started
 
-        for project_name, data in projects.items():
+        await self.deliver_alerts(projects, targets, fetch_seconds=fetch_seconds)
+        self.bus.commit()
+
+    async def deliver_alerts(
+        self,
+        projects: Dict[str, Dict],
+        targets: Dict[str, str],
+        fetch_seconds: float = 0.0,
+    ) -> None:
+        """Send keyword alerts for messages the bus has not yet delivered to each project."""
+        deliveries = self.bus.consume(targets)
+        lags: List[float] = []
+
+        for project_name, new_messages in deliveries.items():
+            channel_id = targets[project_name]
             try:
-                channel_id = data.get("discord_channel_id")
-                if not channel_id:
-                    logger.info("Discord channel not configured for %s", project_name)
-                    continue
-
-                logger.info("Discord scan %s (channel %s)", project_name, channel_id)
-                messages = await self.discord_monitor.fetch_messages(channel_id, limit=10)
-                if not messages:
-                    continue
-
-                last_seen = self.db.get_last_discord_message_id(project_name, channel_id)
-                if not last_seen:
-                    newest = self._max_message_id(messages)
-                    if newest:
-                        self.db.set_last_discord_message_id(project_name, channel_id, newest)
-                    logger.info("Initialized Discord cursor for %s", project_name)
-                    continue
-
-                new_messages = self._filter_new_messages(messages, last_seen)
-                if not new_messages:
-                    continue
                 logger.info("New Discord messages for %s: %s", project_name, len(new_messages))
 
                 config = get_project_config(project_name)
                 channel_label = self._format_channel_label(channel_id, config)
                 server_id = config.discord_server_id if config else None
+                project_alerts = projects[project_name].get("alerts", [])
+                matcher = self._keyword_matcher(project_name, project_alerts)
 
                 for msg in new_messages:
                     content = msg.get("content", "")
                     if not content:
                         continue
 
-                    for alert in data.get("alerts", []):
-                        matches = find_keywords(content, alert.get("keywords"))
+                    matches_by_alert = matcher.match(content)
+                    if not matches_by_alert:
+                        continue
+
+                    for alert in project_alerts:
+                        matches = matches_by_alert.get(alert["id"])
                         if not matches:
                             continue
 
@@ -111,12 +156,36 @@ class TgeAlertWorker:
                         )
                         await self.send_notification(alert["telegram_id"], message)
 
-                newest = self._max_message_id(messages)
-                if newest:
-                    self.db.set_last_discord_message_id(project_name, channel_id, newest)
+                        lag = self._message_age_seconds(msg.get("timestamp"))
+                        if lag is not None:
+                            lags.append(lag)
+                            logger.info(
+                                "TGE alert for %s sent %.1fs after message %s",
+                                project_name,
+                                lag,
+                                msg.get("id"),
+                            )
             except Exception:
                 logger.exception("Discord check failed for %s", project_name)
 
+        channels = len(set(targets.values()))
+        self.last_tick_stats = {
+            "projects": len(targets),
+            "channels": channels,
+            "fetch_seconds": round(fetch_seconds, 3),
+            "alerts_sent": len(lags),
+            "freshest_lag_seconds": round(min(lags), 1) if lags else None,
+            "stalest_lag_seconds": round(max(lags), 1) if lags else None,
+        }
+        logger.info(
+            "TGE Discord tick: %s projects, %s channels, fetch=%.2fs, alerts=%s, freshest_lag=%s",
+            len(targets),
+            channels,
+            fetch_seconds,
+            len(lags),
+            self.last_tick_stats["freshest_lag_seconds"],
+        )
+
     async def run(self) -> None:
         logger.info("TGE Alert worker started")
 
@@ -135,6 +204,15 @@ class TgeAlertWorker:
         self._running = False
         if self.discord_monitor:
             await self.discord_monitor.close()
+        await close_dome_client_async()
+
+    def _keyword_matcher(self, project_name: str, alerts: List[Dict]) -> TgeKeywordMatcher:
+        matcher = self._keyword_matchers.get(project_name)
+        if matcher is None:
+            matcher = TgeKeywordMatcher(word_boundary=KEYWORD_WORD_BOUNDARY)
+            self._keyword_matchers[project_name] = matcher
+        matcher.update({alert["id"]: alert.get("keywords") or [] for alert in alerts})
+        return matcher
 
     def _group_alerts_by_project(self, alerts: List[Dict]) -> Dict[str, Dict]:
         projects: Dict[str, Dict] = {}
@@ -150,35 +228,6 @@ class TgeAlertWorker:
             entry["alerts"].append(alert)
         return projects
 
-    def _filter_new_messages(self, messages: List[Dict], last_seen: str) -> List[Dict]:
-        try:
-            last_seen_id = int(last_seen)
-        except (TypeError, ValueError):
-            last_seen_id = 0
-
-        new_items = []
-        for msg in messages:
-            try:
-                msg_id = int(msg.get("id"))
-            except (TypeError, ValueError):
-                continue
-            if msg_id > last_seen_id:
-                new_items.append(msg)
-
-        new_items.sort(key=lambda item: int(item["id"]))
-        return new_items
-
-    def _max_message_id(self, messages: List[Dict]) -> Optional[str]:
-        ids = []
-        for msg in messages:
-            try:
-                ids.append(int(msg.get("id")))
-            except (TypeError, ValueError):
-                continue
-        if not ids:
-            return None
-        return str(max(ids))
-
     def _format_channel_label(self, channel_id: str, config) -> str:
         if config and config.discord_channel_name:
             return f"#{config.discord_channel_name}"
@@ -191,6 +240,17 @@ class TgeAlertWorker:
             return "N/A"
         return f"https://discord.com/channels/{server_id}/{channel_id}/{message_id}"
 
+    def _message_age_seconds(self, timestamp: Optional[str]) -> Optional[float]:
+        if not timestamp:
+            return None
+        try:
+            parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return max(0.0, (datetime.now(timezone.utc) - parsed).total_seconds())
+
     def _format_time(self, timestamp: str) -> str:
         if not timestamp:
             return "unknown"
@@ -231,57 +291,26 @@ passes messages through the `TGEAgent` pipeline and optionally executes trades.
 
 agent_db = AgentDatabase()
 alert_db = TgeAlertDatabase()
-discord_monitor = None
 agent_core = TGEAgent()
 wallets = WalletManager()
 
 
-async def process_agent(agent: dict):
-    agent_id = agent["id"]
-    channel_id = agent["discord_channel_id"]
-    telegram_id = agent["telegram_id"]
-    max_trade_amount = agent.get("max_trade_amount_usdc", 10.0)
-    auto_trade_enabled = bool(agent.get("auto_trade_enabled"))
-
-    print(f"\n🤖 Agent #{agent_id}: Checking channel {channel_id}...")
+def agent_consumer_key(agent: dict) -> str:
+    """Cursor key for an agent in tge_discord_state (shared with the channel bus)."""
+    return f"agent_{agent['id']}"
 
-    global discord_monitor
-    if not discord_monitor:
-        discord_token = os.getenv("DISCORD_TOKEN")
-        if discord_token:
-            discord_monitor = DiscordMonitor(discord_token, min_interval_sec=30)
-        else:
-            print("Discord token not configured; skipping agent checks.")
-            return
 
-    messages = await discord_monitor.fetch_messages(channel_id, limit=10)
-    if not messages:
-        return
-
-    last_seen = alert_db.get_last_discord_message_id(f"agent_{agent_id}", channel_id)
-    if not last_seen:
-        newest = max(int(m.get("id")) for m in messages if m.get("id"))
-        alert_db.set_last_discord_message_id(f"agent_{agent_id}", channel_id, str(newest))
-        print(f"Initialized cursor for agent #{agent_id}")
-        return
-
-    new_msgs = [m for m in messages if int(m.get("id")) > int(last_seen)]
-    if not new_msgs:
-        return
+async def process_agent(agent: dict, new_msgs: List[dict], bot: Bot):
+    agent_id = agent["id"]
 
     print(f"📨 Agent #{agent_id} found {len(new_msgs)} new messages")
 
-    bot = Bot(token=os.getenv("TELEGRAM_TOKEN"))
-
     for msg in new_msgs:
         try:
             await process_message_with_agent(agent, msg, bot)
         except Exception as e:
             print(f"Error processing message {msg.get('id')}: {e}")
 
-    latest_id = max(int(m.get("id")) for m in messages if m.get("id"))
-    alert_db.set_last_discord_message_id(f"agent_{agent_id}", channel_id, str(latest_id))
-
 
 async def process_message_with_agent(agent: dict, message: dict, bot: Bot):
     agent_id = agent["id"]
@@ -375,7 +404,8 @@ async def execute_agent_trade(agent: dict, decision: dict, bot: Bot, telegram_id
     private_key = wallets.get_private_key(telegram_id)
 
     try:
-        result = trade_market(
+        result = await asyncio.to_thread(
+            trade_market,
             user_private_key=private_key,
             token_id=clob_token,
             side="BUY",
@@ -387,6 +417,9 @@ async def execute_agent_trade(agent: dict, decision: dict, bot: Bot, telegram_id
         await bot.send_message(chat_id=telegram_id, text=f"❌ Trade failed: {e}")
         return
 
+    if isinstance(result, dict) and result.get("status") == "success":
+        invalidate_wallet_snapshot(wallet.get("safe_address"))
+
     print(f"🔍 Trade result keys: {result.keys() if isinstance(result, dict) else type(result)}")
     print(f"🔍 Trade result: {result}")
 
@@ -418,27 +451,132 @@ async def execute_agent_trade(agent: dict, decision: dict, bot: Bot, telegram_id
     )
 
 
-async def check_agents_once():
-    active = agent_db.get_active_agents()
-    if not active:
+async def deliver_agents(
+    agents: List[dict],
+    bus: DiscordChannelBus,
+    bot: Bot,
+    max_concurrency: int = AGENT_MAX_CONCURRENCY,
+):
+    """Run every agent with new messages concurrently, at most max_concurrency at a time."""
+    subscriptions = {
+        agent_consumer_key(agent): agent["discord_channel_id"]
+        for agent in agents
+        if agent.get("discord_channel_id")
+    }
+    deliveries = bus.consume(subscriptions)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_agent(agent: dict, new_msgs: List[dict]):
+        async with semaphore:
+            try:
+                await process_agent(agent, new_msgs, bot)
+            except Exception as e:
+                print(f"Error processing agent {agent.get('id')}: {e}")
+
+    await asyncio.gather(*(
+        run_agent(agent, deliveries[agent_consumer_key(agent)])
+        for agent in agents
+        if deliveries.get(agent_consumer_key(agent))
+    ))
+
+
+async def run_tick(worker: TgeAlertWorker, poll: bool = True, force: bool = False) -> List[str]:
+    """
+    One shared Discord pass for keyword alerts and agents: every channel is
+    fetched once (unless messages are streamed in by the gateway), then each
+    consumer gets the messages after its own cursor. Returns the subscribed
+    channel ids.
+    """
+    if not worker.bus:
+        print("Discord token not configured; skipping TGE checks.")
+        return []
+
+    projects, alert_targets = worker.alert_subscriptions()
+    agents = agent_db.get_active_agents()
+    if agents:
+        print(f"Monitoring {len(agents)} agents...")
+    else:
         print("No active agents")
-        return
-    print(f"Monitoring {len(active)} agents...")
-    for a in active:
-        try:
-            await process_agent(a)
-        except Exception as e:
-            print(f"Error processing agent {a.get('id')}: {e}")
+
+    agent_channels = [agent["discord_channel_id"] for agent in agents if agent.get("discord_channel_id")]
+    channel_ids = list(dict.fromkeys([*alert_targets.values(), *agent_channels]))
+
+    started = time.monotonic()
+    if poll:
+        await worker.bus.poll(channel_ids, force=force)
+    fetch_seconds = time.monotonic() - started
+
+    try:
+        if alert_targets:
+            await worker.deliver_alerts(projects, alert_targets, fetch_seconds=fetch_seconds)
+        if agents:
+            await deliver_agents(agents, worker.bus, worker.bot)
+    finally:
+        worker.bus.commit()
+    return channel_ids
+
+
+async def run_gateway(worker: TgeAlertWorker, discord_token: str) -> None:
+    """
+    Stream messages from the Discord gateway into the bus and deliver them
+    as they arrive. Every (re)connect triggers a REST catch-up for whatever
+    was missed, and while the stream is down the regular polling tick runs.
+    """
+    wake = asyncio.Event()
+    catch_up = True
+
+    async def on_message(message: dict) -> None:
+        if worker.bus.push(message):
+            wake.set()
+
+    async def on_ready(resumed: bool) -> None:
+        nonlocal catch_up
+        catch_up = True
+        wake.set()
+
+    gateway = DiscordGateway(discord_token, on_message, on_ready=on_ready)
+    gateway_task = asyncio.create_task(gateway.run())
+    wake.set()
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=worker.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+
+            force, catch_up = catch_up, False
+            poll = force or not gateway.connected
+            try:
+                gateway.subscribe(await run_tick(worker, poll=poll, force=force))
+            except Exception as e:
+                print(f"Worker error: {e}")
+    finally:
+        await gateway.close()
+        gateway_task.cancel()
 
 
 async def run_worker():
-    print("🚀 TGE Agent Worker started")
-    while True:
-        try:
-            await check_agents_once()
-        except Exception as e:
-            print(f"Worker error: {e}")
-        await asyncio.sleep(30)
+    telegram_token = os.getenv("TELEGRAM_TOKEN")
+    if not telegram_token:
+        raise SystemExit("TELEGRAM_TOKEN not found in environment.")
+
+    discord_token = os.getenv("DISCORD_TOKEN")
+    worker = TgeAlertWorker(telegram_token, discord_token)
+    print(f"🚀 TGE Agent Worker started (discord ingest: {DISCORD_INGEST_MODE})")
+    try:
+        if discord_token and DISCORD_INGEST_MODE == "gateway":
+            await run_gateway(worker, discord_token)
+            return
+
+        while True:
+            try:
+                await run_tick(worker)
+            except Exception as e:
+                print(f"Worker error: {e}")
+            await asyncio.sleep(worker.check_interval)
+    finally:
+        await worker.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+import logging
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+def _message_id(message: Dict) -> int:
+    try:
+        return int(message.get("id"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class DiscordChannelBus:
+    """
+    Polls each Discord channel once per tick and fans new messages out to many
+    consumers (keyword alerts, agents).
+
+    Recent messages are kept in a short per-channel log. Every consumer has its
+    own cursor in tge_discord_state keyed by (consumer key, channel id), so
+    existing project and agent_<id> cursors keep working.
+    """
+
+    def __init__(self, monitor, cursor_db, log_size: int = 100, fetch_limit: int = 10):
+        self.monitor = monitor
+        self.cursor_db = cursor_db
+        self.log_size = log_size
+        self.fetch_limit = fetch_limit
+        self._logs: Dict[str, List[Dict]] = {}
+        self._pending_cursors: Dict[Tuple[str, str], str] = {}
+        self.fetches = 0
+
+    def channel_log(self, channel_id: str) -> List[Dict]:
+        return list(self._logs.get(channel_id, []))
+
+    async def poll(self, channel_ids: Iterable[str], force: bool = False) -> Dict[str, int]:
+        """Fetch every distinct channel once; returns how many new messages each logged."""
+        unique_ids = [channel_id for channel_id in dict.fromkeys(channel_ids) if channel_id]
+        if not unique_ids:
+            return {}
+
+        fetched = await self.monitor.fetch_many(unique_ids, limit=self.fetch_limit, force=force)
+        self.fetches += len(unique_ids)
+
+        return {
+            channel_id: self._merge(channel_id, messages or [])
+            for channel_id, messages in fetched.items()
+        }
+
+    def push(self, message: Dict) -> bool:
+        """Log a message received from the gateway; returns False if it was already known."""
+        channel_id = message.get("channel_id")
+        if not channel_id:
+            return False
+        return self._merge(channel_id, [message]) > 0
+
+    def _merge(self, channel_id: str, messages: List[Dict]) -> int:
+        log = self._logs.setdefault(channel_id, [])
+        known = {message.get("id") for message in log}
+        fresh = [
+            message
+            for message in messages
+            if message.get("id") and message.get("id") not in known
+        ]
+        if fresh:
+            log.extend(fresh)
+            log.sort(key=_message_id)
+            del log[: max(0, len(log) - self.log_size)]
+        return len(fresh)
+
+    def consume(self, subscriptions: Mapping[str, str]) -> Dict[str, List[Dict]]:
+        """
+        Return new messages for each {consumer_key: channel_id}, oldest first.
+
+        A consumer without a cursor starts at the newest logged message and gets
+        nothing on that tick. Cursor moves are staged until commit().
+        """
+        keys = [(consumer_key, channel_id) for consumer_key, channel_id in subscriptions.items() if channel_id]
+        cursors = self.cursor_db.get_last_discord_message_ids(keys)
+
+        deliveries: Dict[str, List[Dict]] = {}
+        for consumer_key, channel_id in keys:
+            log = self._logs.get(channel_id) or []
+            if not log:
+                continue
+
+            newest = log[-1].get("id")
+            last_seen = self._pending_cursors.get((consumer_key, channel_id)) or cursors.get(
+                (consumer_key, channel_id)
+            )
+            if not last_seen:
+                self._pending_cursors[(consumer_key, channel_id)] = newest
+                logger.info("Initialized Discord cursor for %s", consumer_key)
+                continue
+
+            try:
+                last_seen_id = int(last_seen)
+            except (TypeError, ValueError):
+                last_seen_id = 0
+
+            new_messages = [message for message in log if _message_id(message) > last_seen_id]
+            if not new_messages:
+                continue
+            deliveries[consumer_key] = new_messages
+            self._pending_cursors[(consumer_key, channel_id)] = newest
+        return deliveries
+
+    def commit(self) -> None:
+        """Persist staged cursor moves in one batch."""
+        if not self._pending_cursors:
+            return
+        self.cursor_db.set_last_discord_message_ids(dict(self._pending_cursors))
+        self._pending_cursors.clear()
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import os
+import random
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+
+import aiohttp
+
+from tge_discord_monitor import normalize_message
+
+
+logger = logging.getLogger(__name__)
+
+DISCORD_GATEWAY_URL = os.getenv(
+    "DISCORD_GATEWAY_URL", "wss://gateway.discord.gg/?v=10&encoding=json"
+)
+
+# GUILDS | GUILD_MESSAGES | MESSAGE_CONTENT
+DISCORD_GATEWAY_INTENTS = (1 << 0) | (1 << 9) | (1 << 15)
+
+OP_DISPATCH = 0
+OP_HEARTBEAT = 1
+OP_IDENTIFY = 2
+OP_RESUME = 6
+OP_RECONNECT = 7
+OP_INVALID_SESSION = 9
+OP_HELLO = 10
+OP_HEARTBEAT_ACK = 11
+
+MessageHandler = Callable[[Dict], Awaitable[None]]
+ReadyHandler = Callable[[bool], Awaitable[None]]
+
+
+class DiscordGateway:
+    """
+    Minimal Discord gateway client that streams MESSAGE_CREATE events.
+
+    Messages from `channel_ids` are normalized like REST messages and passed
+    to `on_message`. `on_ready(resumed)` runs after every (re)connect so the
+    caller can catch up through REST. Dropped connections are resumed when
+    possible and retried with backoff; `connected` tells callers whether
+    they need to fall back to polling.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        on_message: MessageHandler,
+        on_ready: Optional[ReadyHandler] = None,
+        url: str = DISCORD_GATEWAY_URL,
+        intents: int = DISCORD_GATEWAY_INTENTS,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+    ):
+        self.token = token
+        self.on_message = on_message
+        self.on_ready = on_ready
+        self.url = url
+        self.intents = intents
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.channel_ids: Set[str] = set()
+        self.connected = False
+        self.connections = 0
+        self.events = 0
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._session_id: Optional[str] = None
+        self._resume_url: Optional[str] = None
+        self._sequence: Optional[int] = None
+        self._acked = True
+        self._closed = False
+
+    def subscribe(self, channel_ids: Iterable[str]) -> None:
+        self.channel_ids = {str(channel_id) for channel_id in channel_ids if channel_id}
+
+    async def run(self) -> None:
+        delay = self.reconnect_delay
+        while not self._closed:
+            connections = self.connections
+            try:
+                await self._connect_once()
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, ValueError) as exc:
+                logger.warning("Discord gateway connection failed: %s", exc)
+            except Exception:
+                logger.exception("Discord gateway error")
+            finally:
+                self.connected = False
+
+            if self._closed:
+                break
+            if self.connections > connections:
+                delay = self.reconnect_delay
+            logger.info("Reconnecting to Discord gateway in %.1fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def close(self) -> None:
+        self._closed = True
+        self.connected = False
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _connect_once(self) -> None:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+
+        url = self._resume_url if self._session_id and self._resume_url else self.url
+        async with self._session.ws_connect(url, heartbeat=None, max_msg_size=0) as ws:
+            self._ws = ws
+            hello = await ws.receive_json(timeout=30)
+            if hello.get("op") != OP_HELLO:
+                raise ValueError(f"expected HELLO, got op {hello.get('op')}")
+            interval = hello["d"]["heartbeat_interval"] / 1000
+
+            self._acked = True
+            heartbeat = asyncio.create_task(self._heartbeat(ws, interval))
+            try:
+                await ws.send_json(self._handshake())
+                async for frame in ws:
+                    if frame.type == aiohttp.WSMsgType.TEXT:
+                        await self._handle(ws, json.loads(frame.data))
+                    elif frame.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        break
+            finally:
+                heartbeat.cancel()
+                self._ws = None
+
+        logger.warning("Discord gateway closed (code=%s)", ws.close_code)
+
+    def _handshake(self) -> Dict:
+        if self._session_id and self._sequence is not None:
+            return {
+                "op": OP_RESUME,
+                "d": {"token": self.token, "session_id": self._session_id, "seq": self._sequence},
+            }
+        return {
+            "op": OP_IDENTIFY,
+            "d": {
+                "token": self.token,
+                "intents": self.intents,
+                "properties": {"os": "linux", "browser": "opipolix", "device": "opipolix"},
+            },
+        }
+
+    def _with_query(self, url: Optional[str]) -> Optional[str]:
+        if not url or "?" in url or "?" not in self.url:
+            return url
+        return url.rstrip("/") + "/?" + self.url.split("?", 1)[1]
+
+    async def _heartbeat(self, ws: aiohttp.ClientWebSocketResponse, interval: float) -> None:
+        await asyncio.sleep(interval * random.random())
+        while not ws.closed:
+            if not self._acked:
+                logger.warning("Discord gateway heartbeat not acknowledged; reconnecting")
+                await ws.close()
+                return
+            self._acked = False
+            await ws.send_json({"op": OP_HEARTBEAT, "d": self._sequence})
+            await asyncio.sleep(interval)
+
+    async def _handle(self, ws: aiohttp.ClientWebSocketResponse, payload: Dict) -> None:
+        op = payload.get("op")
+        if payload.get("s") is not None:
+            self._sequence = payload["s"]
+
+        if op == OP_HEARTBEAT_ACK:
+            self._acked = True
+        elif op == OP_HEARTBEAT:
+            await ws.send_json({"op": OP_HEARTBEAT, "d": self._sequence})
+        elif op == OP_RECONNECT:
+            await ws.close()
+        elif op == OP_INVALID_SESSION:
+            if not payload.get("d"):
+                self._session_id = None
+                self._resume_url = None
+                self._sequence = None
+            await ws.close()
+        elif op == OP_DISPATCH:
+            await self._dispatch(payload.get("t"), payload.get("d") or {})
+
+    async def _dispatch(self, event: Optional[str], data: Dict) -> None:
+        if event in ("READY", "RESUMED"):
+            resumed = event == "RESUMED"
+            if not resumed:
+                self._session_id = data.get("session_id")
+                self._resume_url = self._with_query(data.get("resume_gateway_url"))
+            self.connected = True
+            self.connections += 1
+            logger.info("Discord gateway %s", "resumed" if resumed else "ready")
+            if self.on_ready:
+                await self.on_ready(resumed)
+        elif event == "MESSAGE_CREATE":
+            if str(data.get("channel_id")) not in self.channel_ids:
+                return
+            self.events += 1
+            try:
+                await self.on_message(normalize_message(data))
+            except Exception:
+                logger.exception("Discord gateway message handler failed")
@@ -1,31 +1,73 @@
 import asyncio
 import logging
+import os
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 import discum
 
+from rate_limit import RateLimiter
+
 
 logger = logging.getLogger(__name__)
 
+DISCORD_REQUESTS_PER_SEC = float(os.getenv("DISCORD_REQUESTS_PER_SEC", "2"))
+DISCORD_MAX_CONCURRENCY = int(os.getenv("DISCORD_MAX_CONCURRENCY", "5"))
+
+# One budget for every getMessages call made from this process.
+DISCORD_LIMITER = RateLimiter(DISCORD_REQUESTS_PER_SEC, burst=5)
+
+
+def normalize_message(message: Dict) -> Dict:
+    """Reduce a Discord message payload (REST or gateway) to the fields we use."""
+    author = message.get("author") or {}
+    author_name = (
+        author.get("global_name")
+        or author.get("username")
+        or author.get("id")
+        or "unknown"
+    )
+    return {
+        "id": message.get("id"),
+        "content": message.get("content") or "",
+        "author_name": author_name,
+        "timestamp": message.get("timestamp") or "",
+        "channel_id": message.get("channel_id"),
+    }
+
 
 class DiscordMonitor:
-    def __init__(self, token: str, min_interval_sec: int = 60):
+    def __init__(
+        self,
+        token: str,
+        min_interval_sec: int = 60,
+        limiter: Optional[RateLimiter] = None,
+        max_concurrency: int = DISCORD_MAX_CONCURRENCY,
+    ):
         self.client = discum.Client(token=token, log=False)
         self.min_interval_sec = max(min_interval_sec, 60)
+        self.limiter = limiter or DISCORD_LIMITER
+        self.max_concurrency = max(1, max_concurrency)
         self._last_call: Dict[str, float] = {}
 
-    async def fetch_messages(self, channel_id: str, limit: int = 5) -> List[Dict]:
+    async def fetch_messages(
+        self, channel_id: str, limit: int = 5, force: bool = False
+    ) -> List[Dict]:
+        """
+        Fetch recent messages. `force` skips the per-channel interval (used for
+        gateway catch-up); the shared rate limit still applies.
+        """
         if not channel_id:
             return []
 
         now = time.monotonic()
         last_call = self._last_call.get(channel_id)
-        if last_call is not None and (now - last_call) < self.min_interval_sec:
+        if not force and last_call is not None and (now - last_call) < self.min_interval_sec:
             logger.debug("Discord rate limit active for channel %s", channel_id)
             return []
 
         self._last_call[channel_id] = now
+        await self.limiter.acquire()
         try:
             response = await asyncio.to_thread(
                 self.client.getMessages, channel_id, num=limit
@@ -34,6 +76,12 @@ class DiscordMonitor:
             logger.exception("Discord getMessages failed for channel %s", channel_id)
             return []
 
+        if getattr(response, "status_code", None) == 429:
+            retry_after = self._retry_after(response)
+            self.limiter.block_for(retry_after)
+            logger.warning("Discord rate limited on channel %s, retry in %ss", channel_id, retry_after)
+            return []
+
         try:
             if isinstance(response, list):
                 payload = response
@@ -50,21 +98,28 @@ class DiscordMonitor:
 
         return [self._normalize_message(item) for item in payload if isinstance(item, dict)]
 
+    async def fetch_many(
+        self, channel_ids: Iterable[str], limit: int = 5, force: bool = False
+    ) -> Dict[str, List[Dict]]:
+        """Fetch several channels concurrently under the shared rate limit."""
+        unique_ids = [channel_id for channel_id in dict.fromkeys(channel_ids) if channel_id]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_one(channel_id: str) -> List[Dict]:
+            async with semaphore:
+                return await self.fetch_messages(channel_id, limit=limit, force=force)
+
+        results = await asyncio.gather(*(fetch_one(channel_id) for channel_id in unique_ids))
+        return dict(zip(unique_ids, results))
+
+    def _retry_after(self, response) -> float:
+        try:
+            return float(response.json().get("retry_after") or 1)
+        except Exception:
+            return 1.0
+
     def _normalize_message(self, message: Dict) -> Dict:
-        author = message.get("author") or {}
-        author_name = (
-            author.get("global_name")
-            or author.get("username")
-            or author.get("id")
-            or "unknown"
-        )
-        return {
-            "id": message.get("id"),
-            "content": message.get("content") or "",
-            "author_name": author_name,
-            "timestamp": message.get("timestamp") or "",
-            "channel_id": message.get("channel_id"),
-        }
+        return normalize_message(message)
 
     async def close(self) -> None:
         if hasattr(self.client, "close"):
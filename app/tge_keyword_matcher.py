@@ -0,0 +1,135 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Set, Tuple
+
+from tge_alert_config import normalize_keywords
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over lowercase keywords. One pass over a text
+    reports every keyword it contains, optionally only at word boundaries.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = normalize_keywords(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def find(self, text: str, word_boundary: bool = False) -> Set[str]:
+        if not text or not self.keywords:
+            return set()
+
+        text_lower = text.lower()
+        found: Set[int] = set()
+        state = 0
+        for position, char in enumerate(text_lower):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                if index in found:
+                    continue
+                if word_boundary and not self._at_word_boundary(text_lower, index, position):
+                    continue
+                found.add(index)
+        return {self.keywords[index] for index in found}
+
+    def _at_word_boundary(self, text: str, index: int, end: int) -> bool:
+        start = end - len(self.keywords[index]) + 1
+        before = text[start - 1] if start > 0 else ""
+        after = text[end + 1] if end + 1 < len(text) else ""
+        keyword = self.keywords[index]
+        if before and _is_word_char(before) and _is_word_char(keyword[0]):
+            return False
+        if after and _is_word_char(after) and _is_word_char(keyword[-1]):
+            return False
+        return True
+
+
+class TgeKeywordMatcher:
+    """
+    Compiled keyword matcher for many alert subscriptions.
+
+    Keywords from every subscription share one automaton; a message is scanned
+    once and each matched keyword is mapped back to its subscribers. The
+    automaton is rebuilt only when the set of subscriptions or keywords changes.
+    """
+
+    def __init__(self, word_boundary: bool = False):
+        self.word_boundary = word_boundary
+        self.automaton = KeywordAutomaton([])
+        self._subscribers: Dict[str, List[Hashable]] = {}
+        self._keyword_order: Dict[Hashable, Dict[str, int]] = {}
+        self._signature: Optional[Tuple] = None
+        self.builds = 0
+
+    def update(self, subscriptions: Mapping[Hashable, Iterable[str]]) -> bool:
+        """Rebuild from {subscriber_id: keywords} if it changed; returns True when rebuilt."""
+        normalized = {
+            subscriber_id: normalize_keywords(keywords)
+            for subscriber_id, keywords in subscriptions.items()
+        }
+        signature = tuple(
+            sorted((repr(subscriber_id), tuple(keywords)) for subscriber_id, keywords in normalized.items())
+        )
+        if signature == self._signature:
+            return False
+
+        subscribers: Dict[str, List[Hashable]] = {}
+        keyword_order: Dict[Hashable, Dict[str, int]] = {}
+        for subscriber_id, keywords in normalized.items():
+            keyword_order[subscriber_id] = {keyword: index for index, keyword in enumerate(keywords)}
+            for keyword in keywords:
+                subscribers.setdefault(keyword, []).append(subscriber_id)
+
+        self.automaton = KeywordAutomaton(subscribers.keys())
+        self._subscribers = subscribers
+        self._keyword_order = keyword_order
+        self._signature = signature
+        self.builds += 1
+        return True
+
+    def match(self, text: str) -> Dict[Hashable, List[str]]:
+        """Map each subscriber with at least one hit to its matched keywords, in its own order."""
+        matched: Dict[Hashable, List[str]] = {}
+        for keyword in self.automaton.find(text, word_boundary=self.word_boundary):
+            for subscriber_id in self._subscribers.get(keyword, []):
+                matched.setdefault(subscriber_id, []).append(keyword)
+
+        for subscriber_id, keywords in matched.items():
+            order = self._keyword_order[subscriber_id]
+            keywords.sort(key=order.__getitem__)
+        return matched
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from tge_alert_config import DEFAULT_TGE_KEYWORDS, normalize_keywords
+
+
+@dataclass(frozen=True)
+class SignalMatch:
+    keywords_found: Tuple[str, ...]
+    search_key: Optional[str]
+    market_key: Optional[str]
+    market: Optional[Dict]
+
+
+class TgeSignalClassifier:
+    """
+    Precompiled matcher for TGE keywords and known-market keywords.
+
+    TGE keywords and every known market's keywords are normalized once into a
+    single deduplicated table with precomputed market ranks, so a message is
+    lower-cased and scanned once for both TGE keyword hits and the market it
+    refers to (substring semantics, like find_keywords). Results are memoized
+    per (message, project).
+    """
+
+    def __init__(
+        self,
+        known_markets: Mapping[str, Dict],
+        tge_keywords: Iterable[str] = DEFAULT_TGE_KEYWORDS,
+        cache_size: int = 1024,
+    ):
+        self.known_markets = dict(known_markets)
+        self.tge_keywords = normalize_keywords(tge_keywords)
+        self.market_keys = list(self.known_markets)
+
+        self._rank: Dict[str, int] = {}
+        for rank, market_key in enumerate(self.market_keys):
+            for keyword in normalize_keywords(self.known_markets[market_key].get("keywords", [])):
+                self._rank.setdefault(keyword, rank)
+
+        # TGE keywords first, so hits come out in find_keywords order.
+        self._keywords: Tuple[str, ...] = tuple(dict.fromkeys([*self.tge_keywords, *self._rank]))
+        self._tge_set = frozenset(self.tge_keywords)
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+        # Agent names repeat on every message of a channel.
+        self._project_rank = lru_cache(maxsize=256)(lambda name: self._best_rank(self._scan(name)))
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Every known keyword contained in text."""
+        return frozenset(self._scan(text))
+
+    def _scan(self, text: str) -> List[str]:
+        if not text:
+            return []
+        text_lower = text.lower()
+        return [keyword for keyword in self._keywords if keyword in text_lower]
+
+    def _classify(self, message_content: str, project_name: str = "") -> SignalMatch:
+        hits = self._scan(message_content)
+        keywords_found = tuple(keyword for keyword in hits if keyword in self._tge_set)
+
+        message_rank = self._best_rank(hits)
+        resolved_rank = min(message_rank, self._project_rank(project_name))
+
+        market_key = self.market_keys[resolved_rank] if resolved_rank < len(self.market_keys) else None
+        search_key = self.market_keys[message_rank] if message_rank < len(self.market_keys) else None
+        return SignalMatch(
+            keywords_found=keywords_found,
+            search_key=search_key,
+            market_key=market_key,
+            market=self.known_markets[market_key] if market_key else None,
+        )
+
+    def _best_rank(self, hits: List[str]) -> int:
+        return min(
+            (self._rank[keyword] for keyword in hits if keyword in self._rank),
+            default=len(self.market_keys),
+        )
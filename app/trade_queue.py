@@ -0,0 +1,72 @@
+"""
+Trade Queue
+Per-user FIFO for manual trades: one user's orders run in order, users run in parallel
+"""
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING_TRADES = int(os.getenv("MAX_PENDING_TRADES", "3"))
+
+TradeJob = Callable[[], Awaitable[None]]
+
+
+class TradeQueueFull(Exception):
+    """The user already has MAX_PENDING_TRADES trades waiting or running."""
+
+
+class TradeQueue:
+    """
+    Jobs are queued per telegram_id and drained by one consumer task per user,
+    so two taps on the same Safe never sign and post at the same time while
+    other users' trades are unaffected. A consumer exits once its queue is
+    empty; the next submit starts a new one.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_TRADES):
+        self.max_pending = max_pending
+        self._queues: Dict[int, List[TradeJob]] = {}
+        self._consumers: Dict[int, asyncio.Task] = {}
+
+    def pending(self, telegram_id: int) -> int:
+        """Trades queued or running for the user."""
+        return len(self._queues.get(telegram_id, ()))
+
+    def submit(self, telegram_id: int, job: TradeJob) -> int:
+        """Queue job; returns how many of the user's trades run before it."""
+        queue = self._queues.setdefault(telegram_id, [])
+        if len(queue) >= self.max_pending:
+            raise TradeQueueFull(f"{len(queue)} trades already pending")
+        queue.append(job)
+        if telegram_id not in self._consumers:
+            self._consumers[telegram_id] = asyncio.create_task(
+                self._consume(telegram_id), name=f"trade-queue:{telegram_id}"
+            )
+        return len(queue) - 1
+
+    async def _consume(self, telegram_id: int) -> None:
+        queue = self._queues[telegram_id]
+        try:
+            while queue:
+                # The running job stays at the head so pending() counts it.
+                try:
+                    await queue[0]()
+                except Exception:
+                    logger.exception("Trade job for %s failed", telegram_id)
+                finally:
+                    queue.pop(0)
+        finally:
+            del self._queues[telegram_id]
+            del self._consumers[telegram_id]
+
+    async def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for every queued trade, e.g. before the bot stops."""
+        while self._consumers:
+            _, pending = await asyncio.wait(list(self._consumers.values()), timeout=timeout)
+            if pending:
+                logger.warning("%d user trade queue(s) still busy after %ss", len(pending), timeout)
+                return
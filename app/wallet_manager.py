@@ -1,18 +1,13 @@
 
 import os
-from eth_account import Account
 from dotenv import load_dotenv
 from database import Database
 from encryption import encrypt_private_key, decrypt_private_key
-from relayer_client import UserRelayerClient, setup_user_for_trading
 
 
 load_dotenv()
 
 
-Account.enable_unaudited_hdwallet_features()
-
-
 class WalletManager:
     
     
@@ -34,6 +29,10 @@ class WalletManager:
             }
         
         
+        # eth_account and the relayer SDK are imported on first use: most
+        # requests only read the stored wallet.
+        from eth_account import Account
+
         account = Account.create()
         eoa_address = account.address
         eoa_private_key = account.key.hex()  # 0x...
@@ -95,9 +94,9 @@ class WalletManager:
             dict: {
                 'safe_address': str,
                 'safe_tx_hash': str,
-                'usdc_tx_hash': str,
-                'ctf_tx_hash': str,
-                'status': 'success' | 'failed'
+                'approvals_tx_hash': str,
+                'status': 'success' | 'failed',
+                'timings': {'deploy_safe': s, 'approvals': s, 'total': s}
             }
         """
         
@@ -105,6 +104,8 @@ class WalletManager:
         
         
         print(f"\n🚀 Deploying Safe for user {telegram_id} via Relayer...")
+        from relayer_client import setup_user_for_trading
+
         result = setup_user_for_trading(private_key, telegram_id)
         
         
@@ -190,8 +191,8 @@ def test_safe_deployment():
             print("\n✅ Safe deployment successful!")
             print(f"   Safe Address: {result['safe_address']}")
             print(f"   Safe TX: {result['safe_tx_hash']}")
-            print(f"   USDC Approve TX: {result['usdc_tx_hash']}")
-            print(f"   CTF Approve TX: {result['ctf_tx_hash']}")
+            print(f"   USDC + CTF Approve TX: {result['approvals_tx_hash']}")
+            print(f"   Timings: {result['timings']}")
             print("\n💰 User is ready to trade!")
         else:
             print(f"\n❌ Deployment failed: {result.get('error')}")
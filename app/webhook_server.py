@@ -0,0 +1,214 @@
+"""
+Webhook Server
+Receives Telegram updates over HTTPS instead of long polling
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import signal
+from typing import Awaitable, Dict, Optional
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application, BaseUpdateProcessor
+
+
+logger = logging.getLogger(__name__)
+
+# Public HTTPS base URL Telegram should post to; webhook mode is on when set.
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "").rstrip("/")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT") or os.getenv("PORT") or "8080")
+WEBHOOK_MAX_CONCURRENT_UPDATES = int(os.getenv("WEBHOOK_MAX_CONCURRENT_UPDATES", "32"))
+# How long a restart waits for handlers that are already running.
+WEBHOOK_DRAIN_TIMEOUT_SEC = float(os.getenv("WEBHOOK_DRAIN_TIMEOUT_SEC", "25"))
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def webhook_secret(token: str) -> str:
+    """WEBHOOK_SECRET, or a stable secret derived from the bot token."""
+    secret = os.getenv("WEBHOOK_SECRET")
+    if secret:
+        return secret
+    return hashlib.sha256(f"webhook:{token}".encode()).hexdigest()
+
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """
+    Runs updates concurrently across chats but one at a time within a chat,
+    so button presses and replies of one user keep their order.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        # chat id -> [lock, holders]
+        self._chats: Dict[int, list] = {}
+
+    @staticmethod
+    def _chat_key(update: object) -> Optional[int]:
+        if not isinstance(update, Update):
+            return None
+        if update.effective_chat:
+            return update.effective_chat.id
+        if update.effective_user:
+            return update.effective_user.id
+        return None
+
+    async def process_update(self, update: object, coroutine: Awaitable) -> None:
+        key = self._chat_key(update)
+        if key is None:
+            await super().process_update(update, coroutine)
+            return
+
+        # The chat lock is taken before a concurrency slot, so a busy chat
+        # queues behind itself without holding slots other chats could use.
+        entry = self._chats.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await super().process_update(update, coroutine)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._chats[key]
+
+    async def do_process_update(self, update: object, coroutine: Awaitable) -> None:
+        await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+
+class WebhookServer:
+    """
+    aiohttp endpoint that checks Telegram's secret token and hands updates to
+    the application's update queue, answering at once so Telegram can post the
+    next one while handlers run. While draining it answers 503 and Telegram
+    keeps the update to retry against the next process.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        secret_token: str,
+        path: str = WEBHOOK_PATH,
+        listen: str = WEBHOOK_LISTEN,
+        port: int = WEBHOOK_PORT,
+    ):
+        self.application = application
+        self.secret_token = secret_token
+        self.path = path
+        self.listen = listen
+        self.port = port
+        self.draining = False
+        self.received = 0
+        self.rejected = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(self.path, self.handle_update)
+        app.router.add_get("/healthz", self.handle_health)
+        return app
+
+    async def handle_update(self, request: web.Request) -> web.Response:
+        secret = request.headers.get(SECRET_HEADER, "")
+        if not hmac.compare_digest(secret.encode(), self.secret_token.encode()):
+            self.rejected += 1
+            return web.Response(status=403)
+        if self.draining:
+            return web.Response(status=503)
+
+        try:
+            data = await request.json()
+            update = Update.de_json(data, self.application.bot)
+        except (json.JSONDecodeError, ValueError, TypeError, KeyError) as e:
+            logger.warning("Dropping malformed webhook update: %s", e)
+            return web.Response(status=400)
+
+        self.received += 1
+        await self.application.update_queue.put(update)
+        return web.Response()
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        status = 503 if self.draining else 200
+        return web.json_response(
+            {"draining": self.draining, "received": self.received, "queued": self.application.update_queue.qsize()},
+            status=status,
+        )
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.listen, self.port).start()
+        logger.info("Webhook server listening on %s:%s%s", self.listen, self.port, self.path)
+
+    async def stop(self) -> None:
+        """Refuse new updates and close the listener."""
+        self.draining = True
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def drain(application: Application, server: WebhookServer, timeout: float = WEBHOOK_DRAIN_TIMEOUT_SEC) -> None:
+    """Stop taking updates, then let queued and running handlers finish."""
+    await server.stop()
+    try:
+        # Application.stop() works through the queue and waits for running handlers.
+        await asyncio.wait_for(application.stop(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Handlers still running after %.0fs; shutting down anyway", timeout)
+
+
+async def run_webhook(
+    application: Application,
+    url: str = WEBHOOK_URL,
+    secret_token: Optional[str] = None,
+    drain_timeout: float = WEBHOOK_DRAIN_TIMEOUT_SEC,
+) -> None:
+    """Serve the application from a webhook until SIGTERM/SIGINT, then drain."""
+    secret_token = secret_token or webhook_secret(application.bot.token)
+    server = WebhookServer(application, secret_token)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    await application.initialize()
+    try:
+        if application.post_init:
+            await application.post_init(application)
+        await application.start()
+        await server.start()
+        # The webhook stays registered across restarts; Telegram holds updates
+        # while no process answers and delivers them once the next one is up.
+        await application.bot.set_webhook(
+            url=f"{url}{server.path}",
+            secret_token=secret_token,
+            allowed_updates=Update.ALL_TYPES,
+            max_connections=max(1, min(100, application.update_processor.max_concurrent_updates)),
+        )
+        print(f"Webhook mode: {url}{server.path}")
+
+        await stop.wait()
+        print(f"Draining {application.update_queue.qsize()} queued update(s)...")
+    finally:
+        if application.running:
+            await drain(application, server, drain_timeout)
+        else:
+            await server.stop()
+        if application.post_stop:
+            await application.post_stop(application)
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
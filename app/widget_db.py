@@ -5,6 +5,15 @@ from typing import Any, Dict, List, Optional
 from database import Database
 
 
+# Global, monotonically increasing config version. Every config change takes the
+# next value so workers can pick up changed widgets with a single cursor query.
+# SQLite serialises writers, so MAX()+1 is safe there; on Postgres two
+# READ COMMITTED writers would read the same MAX, so versions come from a sequence.
+NEXT_CONFIG_VERSION_SQL = "(SELECT COALESCE(MAX(config_version), 0) + 1 FROM telegram_widgets)"
+CONFIG_VERSION_SEQUENCE = "telegram_widgets_config_version_seq"
+PG_NEXT_CONFIG_VERSION_SQL = f"nextval('{CONFIG_VERSION_SEQUENCE}')"
+
+
 class WidgetDatabase:
     def __init__(self, db: Optional[Database] = None):
         self.db = db or Database()
@@ -40,6 +49,8 @@ class WidgetDatabase:
                     last_render_hash TEXT,
                     last_rendered_at TIMESTAMP,
                     last_heartbeat_at TIMESTAMP,
+                    next_due_at TIMESTAMP,
+                    config_version INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
@@ -71,13 +82,74 @@ class WidgetDatabase:
                     last_render_hash TEXT,
                     last_rendered_at TIMESTAMP,
                     last_heartbeat_at TIMESTAMP,
+                    next_due_at TIMESTAMP,
+                    config_version INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
                 """
             )
 
+        if self.db.use_postgres:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS widget_workers (
+                    worker_id TEXT PRIMARY KEY,
+                    heartbeat_at DOUBLE PRECISION NOT NULL
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS widget_shard_leases (
+                    shard_id INTEGER PRIMARY KEY,
+                    owner_id TEXT,
+                    lease_expires_at DOUBLE PRECISION DEFAULT 0
+                )
+                """
+            )
+        else:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS widget_workers (
+                    worker_id TEXT PRIMARY KEY,
+                    heartbeat_at REAL NOT NULL
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS widget_shard_leases (
+                    shard_id INTEGER PRIMARY KEY,
+                    owner_id TEXT,
+                    lease_expires_at REAL DEFAULT 0
+                )
+                """
+            )
+
         self._ensure_widget_columns(cursor)
+        if self.db.use_postgres:
+            cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {CONFIG_VERSION_SEQUENCE}")
+            # Start past versions written before the sequence existed.
+            cursor.execute(
+                f"""
+                SELECT setval(
+                    '{CONFIG_VERSION_SEQUENCE}',
+                    GREATEST(
+                        (SELECT COALESCE(MAX(config_version), 0) FROM telegram_widgets),
+                        (SELECT last_value FROM {CONFIG_VERSION_SEQUENCE})
+                    )
+                )
+                """
+            )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_telegram_widgets_due "
+            "ON telegram_widgets (enabled, next_due_at)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_telegram_widgets_config_version "
+            "ON telegram_widgets (config_version)"
+        )
         conn.commit()
         conn.close()
 
@@ -91,6 +163,14 @@ class WidgetDatabase:
                 "ALTER TABLE telegram_widgets "
                 "ADD COLUMN IF NOT EXISTS last_heartbeat_at TIMESTAMP"
             )
+            cursor.execute(
+                "ALTER TABLE telegram_widgets "
+                "ADD COLUMN IF NOT EXISTS next_due_at TIMESTAMP"
+            )
+            cursor.execute(
+                "ALTER TABLE telegram_widgets "
+                "ADD COLUMN IF NOT EXISTS config_version INTEGER DEFAULT 0"
+            )
             return
 
         cursor.execute("PRAGMA table_info(telegram_widgets)")
@@ -110,6 +190,14 @@ class WidgetDatabase:
             cursor.execute(
                 "ALTER TABLE telegram_widgets ADD COLUMN last_heartbeat_at TIMESTAMP"
             )
+        if "next_due_at" not in existing:
+            cursor.execute(
+                "ALTER TABLE telegram_widgets ADD COLUMN next_due_at TIMESTAMP"
+            )
+        if "config_version" not in existing:
+            cursor.execute(
+                "ALTER TABLE telegram_widgets ADD COLUMN config_version INTEGER DEFAULT 0"
+            )
 
     def _serialize_market_ids(self, market_ids: List[str]) -> str:
         return json.dumps(market_ids or [])
@@ -234,12 +322,12 @@ class WidgetDatabase:
 
         if self.db.use_postgres:
             cursor.execute(
-                """
+                f"""
                 INSERT INTO telegram_widgets
                 (owner_user_id, target_chat_id, board_message_id, selected_market_ids,
                  interval_seconds, enabled, compact_mode, last_render_hash,
-                 last_rendered_at, last_heartbeat_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                 last_rendered_at, last_heartbeat_at, config_version)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, {PG_NEXT_CONFIG_VERSION_SQL})
                 RETURNING widget_id
                 """,
                 (
@@ -258,12 +346,12 @@ class WidgetDatabase:
             widget_id = cursor.fetchone()[0]
         else:
             cursor.execute(
-                """
+                f"""
                 INSERT INTO telegram_widgets
                 (owner_user_id, target_chat_id, board_message_id, selected_market_ids,
                  interval_seconds, enabled, compact_mode, last_render_hash,
-                 last_rendered_at, last_heartbeat_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 last_rendered_at, last_heartbeat_at, config_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {NEXT_CONFIG_VERSION_SQL})
                 """,
                 (
                     owner_user_id,
@@ -299,6 +387,8 @@ class WidgetDatabase:
         widget["last_heartbeat_at"] = self._parse_timestamp(
             widget.get("last_heartbeat_at")
         )
+        widget["next_due_at"] = self._parse_timestamp(widget.get("next_due_at"))
+        widget["config_version"] = int(widget.get("config_version") or 0)
         return widget
 
     def get_widget_by_id(self, widget_id: int) -> Optional[Dict[str, Any]]:
@@ -411,6 +501,105 @@ class WidgetDatabase:
         conn.close()
         return [self._normalize_widget(row) for row in rows]
 
+    def get_enabled_widgets_by_due(self) -> List[Dict[str, Any]]:
+        """Enabled widgets ordered by next_due_at (served by idx_telegram_widgets_due)."""
+        conn = self.db.get_connection()
+
+        if self.db.use_postgres:
+            from psycopg2.extras import RealDictCursor
+
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                """
+                SELECT w.*, c.chat_title
+                FROM telegram_widgets w
+                LEFT JOIN bot_chats c ON c.chat_id = w.target_chat_id
+                WHERE w.enabled = TRUE
+                ORDER BY w.next_due_at
+                """
+            )
+        else:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT w.*, c.chat_title
+                FROM telegram_widgets w
+                LEFT JOIN bot_chats c ON c.chat_id = w.target_chat_id
+                WHERE w.enabled = 1
+                ORDER BY w.next_due_at
+                """
+            )
+
+        rows = cursor.fetchall()
+        conn.close()
+        return [self._normalize_widget(row) for row in rows]
+
+    def get_widgets_changed_since(self, config_version: int) -> List[Dict[str, Any]]:
+        """Widgets (enabled or not) whose config_version is >= the given cursor."""
+        conn = self.db.get_connection()
+
+        if self.db.use_postgres:
+            from psycopg2.extras import RealDictCursor
+
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                """
+                SELECT w.*, c.chat_title
+                FROM telegram_widgets w
+                LEFT JOIN bot_chats c ON c.chat_id = w.target_chat_id
+                WHERE w.config_version >= %s
+                ORDER BY w.config_version
+                """,
+                (config_version,),
+            )
+        else:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT w.*, c.chat_title
+                FROM telegram_widgets w
+                LEFT JOIN bot_chats c ON c.chat_id = w.target_chat_id
+                WHERE w.config_version >= ?
+                ORDER BY w.config_version
+                """,
+                (config_version,),
+            )
+
+        rows = cursor.fetchall()
+        conn.close()
+        return [self._normalize_widget(row) for row in rows]
+
+    def get_enabled_widget_ids(self) -> List[int]:
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute("SELECT widget_id FROM telegram_widgets WHERE enabled = TRUE")
+        else:
+            cursor.execute("SELECT widget_id FROM telegram_widgets WHERE enabled = 1")
+
+        rows = cursor.fetchall()
+        conn.close()
+        return [int(row[0]) for row in rows]
+
+    def get_enabled_widget_versions(self) -> Dict[int, int]:
+        """widget_id -> config_version for enabled widgets, for reconciling the cursor."""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute(
+                "SELECT widget_id, config_version FROM telegram_widgets WHERE enabled = TRUE"
+            )
+        else:
+            cursor.execute(
+                "SELECT widget_id, config_version FROM telegram_widgets WHERE enabled = 1"
+            )
+
+        rows = cursor.fetchall()
+        conn.close()
+        return {int(row[0]): int(row[1] or 0) for row in rows}
+
     def update_widget_markets(self, widget_id: int, selected_market_ids: List[str]) -> None:
         market_ids_json = self._serialize_market_ids(selected_market_ids)
         conn = self.db.get_connection()
@@ -418,20 +607,22 @@ class WidgetDatabase:
 
         if self.db.use_postgres:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET selected_market_ids = %s,
-                    updated_at = CURRENT_TIMESTAMP
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {PG_NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = %s
                 """,
                 (market_ids_json, widget_id),
             )
         else:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET selected_market_ids = ?,
-                    updated_at = CURRENT_TIMESTAMP
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = ?
                 """,
                 (market_ids_json, widget_id),
@@ -446,20 +637,22 @@ class WidgetDatabase:
 
         if self.db.use_postgres:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET interval_seconds = %s,
-                    updated_at = CURRENT_TIMESTAMP
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {PG_NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = %s
                 """,
                 (interval_seconds, widget_id),
             )
         else:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET interval_seconds = ?,
-                    updated_at = CURRENT_TIMESTAMP
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = ?
                 """,
                 (interval_seconds, widget_id),
@@ -474,20 +667,22 @@ class WidgetDatabase:
 
         if self.db.use_postgres:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET enabled = %s,
-                    updated_at = CURRENT_TIMESTAMP
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {PG_NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = %s
                 """,
                 (enabled, widget_id),
             )
         else:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET enabled = ?,
-                    updated_at = CURRENT_TIMESTAMP
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = ?
                 """,
                 (int(enabled), widget_id),
@@ -502,20 +697,22 @@ class WidgetDatabase:
 
         if self.db.use_postgres:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET compact_mode = %s,
-                    updated_at = CURRENT_TIMESTAMP
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {PG_NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = %s
                 """,
                 (compact_mode, widget_id),
             )
         else:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET compact_mode = ?,
-                    updated_at = CURRENT_TIMESTAMP
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = ?
                 """,
                 (int(compact_mode), widget_id),
@@ -530,24 +727,55 @@ class WidgetDatabase:
 
         if self.db.use_postgres:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET last_render_hash = NULL,
                     last_rendered_at = NULL,
                     last_heartbeat_at = NULL,
-                    updated_at = CURRENT_TIMESTAMP
+                    next_due_at = NULL,
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {PG_NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = %s
                 """,
                 (widget_id,),
             )
         else:
             cursor.execute(
-                """
+                f"""
                 UPDATE telegram_widgets
                 SET last_render_hash = NULL,
                     last_rendered_at = NULL,
                     last_heartbeat_at = NULL,
-                    updated_at = CURRENT_TIMESTAMP
+                    next_due_at = NULL,
+                    updated_at = CURRENT_TIMESTAMP,
+                    config_version = {NEXT_CONFIG_VERSION_SQL}
+                WHERE widget_id = ?
+                """,
+                (widget_id,),
+            )
+
+        conn.commit()
+        conn.close()
+
+    def touch_widget(self, widget_id: int) -> None:
+        """Bump config_version so schedulers reload the row (e.g. after a manual refresh)."""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute(
+                f"""
+                UPDATE telegram_widgets
+                SET config_version = {PG_NEXT_CONFIG_VERSION_SQL}
+                WHERE widget_id = %s
+                """,
+                (widget_id,),
+            )
+        else:
+            cursor.execute(
+                f"""
+                UPDATE telegram_widgets
+                SET config_version = {NEXT_CONFIG_VERSION_SQL}
                 WHERE widget_id = ?
                 """,
                 (widget_id,),
@@ -562,9 +790,11 @@ class WidgetDatabase:
         render_hash: str,
         rendered_at: datetime,
         heartbeat_at: Optional[datetime] = None,
-    ) -> None:
+        next_due_at: Optional[datetime] = None,
+    ) -> bool:
         rendered_at_value = rendered_at.isoformat() if rendered_at else None
         heartbeat_value = heartbeat_at.isoformat() if heartbeat_at else None
+        next_due_value = next_due_at.isoformat() if next_due_at else None
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
@@ -575,10 +805,11 @@ class WidgetDatabase:
                 SET last_render_hash = %s,
                     last_rendered_at = %s,
                     last_heartbeat_at = %s,
+                    next_due_at = %s,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE widget_id = %s
                 """,
-                (render_hash, rendered_at_value, heartbeat_value, widget_id),
+                (render_hash, rendered_at_value, heartbeat_value, next_due_value, widget_id),
             )
         else:
             cursor.execute(
@@ -587,10 +818,35 @@ class WidgetDatabase:
                 SET last_render_hash = ?,
                     last_rendered_at = ?,
                     last_heartbeat_at = ?,
+                    next_due_at = ?,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE widget_id = ?
                 """,
-                (render_hash, rendered_at_value, heartbeat_value, widget_id),
+                (render_hash, rendered_at_value, heartbeat_value, next_due_value, widget_id),
+            )
+
+        updated = cursor.rowcount > 0
+        conn.commit()
+        conn.close()
+        return updated
+
+    def set_next_due_at(self, due: Dict[int, datetime]) -> None:
+        """Persist in-memory deadlines for widgets that were not re-rendered."""
+        if not due:
+            return
+        params = [(due_at.isoformat(), widget_id) for widget_id, due_at in due.items()]
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.executemany(
+                "UPDATE telegram_widgets SET next_due_at = %s WHERE widget_id = %s",
+                params,
+            )
+        else:
+            cursor.executemany(
+                "UPDATE telegram_widgets SET next_due_at = ? WHERE widget_id = ?",
+                params,
             )
 
         conn.commit()
@@ -613,3 +869,211 @@ class WidgetDatabase:
 
         conn.commit()
         conn.close()
+
+    # Worker shard leases. Times are epoch seconds so lease checks do not depend
+    # on database timestamp types.
+
+    def heartbeat_worker(self, worker_id: str, now: float) -> None:
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute(
+                """
+                INSERT INTO widget_workers (worker_id, heartbeat_at)
+                VALUES (%s, %s)
+                ON CONFLICT (worker_id) DO UPDATE
+                SET heartbeat_at = EXCLUDED.heartbeat_at
+                """,
+                (worker_id, now),
+            )
+        else:
+            cursor.execute(
+                """
+                INSERT INTO widget_workers (worker_id, heartbeat_at)
+                VALUES (?, ?)
+                ON CONFLICT(worker_id) DO UPDATE SET
+                    heartbeat_at = excluded.heartbeat_at
+                """,
+                (worker_id, now),
+            )
+
+        conn.commit()
+        conn.close()
+
+    def get_live_workers(self, since: float) -> List[str]:
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute(
+                "SELECT worker_id FROM widget_workers WHERE heartbeat_at >= %s ORDER BY worker_id",
+                (since,),
+            )
+        else:
+            cursor.execute(
+                "SELECT worker_id FROM widget_workers WHERE heartbeat_at >= ? ORDER BY worker_id",
+                (since,),
+            )
+
+        rows = cursor.fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+
+    def remove_worker(self, worker_id: str) -> None:
+        """Drop a worker's heartbeat and release every shard it holds."""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute("DELETE FROM widget_workers WHERE worker_id = %s", (worker_id,))
+            cursor.execute(
+                """
+                UPDATE widget_shard_leases
+                SET owner_id = NULL, lease_expires_at = 0
+                WHERE owner_id = %s
+                """,
+                (worker_id,),
+            )
+        else:
+            cursor.execute("DELETE FROM widget_workers WHERE worker_id = ?", (worker_id,))
+            cursor.execute(
+                """
+                UPDATE widget_shard_leases
+                SET owner_id = NULL, lease_expires_at = 0
+                WHERE owner_id = ?
+                """,
+                (worker_id,),
+            )
+
+        conn.commit()
+        conn.close()
+
+    def ensure_shards(self, shard_count: int) -> None:
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        for shard_id in range(shard_count):
+            if self.db.use_postgres:
+                cursor.execute(
+                    """
+                    INSERT INTO widget_shard_leases (shard_id, owner_id, lease_expires_at)
+                    VALUES (%s, NULL, 0)
+                    ON CONFLICT (shard_id) DO NOTHING
+                    """,
+                    (shard_id,),
+                )
+            else:
+                cursor.execute(
+                    """
+                    INSERT OR IGNORE INTO widget_shard_leases (shard_id, owner_id, lease_expires_at)
+                    VALUES (?, NULL, 0)
+                    """,
+                    (shard_id,),
+                )
+
+        conn.commit()
+        conn.close()
+
+    def get_shard_leases(self) -> List[Dict[str, Any]]:
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT shard_id, owner_id, lease_expires_at FROM widget_shard_leases ORDER BY shard_id"
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [
+            {
+                "shard_id": int(row[0]),
+                "owner_id": row[1],
+                "lease_expires_at": float(row[2] or 0),
+            }
+            for row in rows
+        ]
+
+    def claim_shard(self, shard_id: int, worker_id: str, now: float, lease_seconds: float) -> bool:
+        """Take or renew a shard lease if it is free, expired or already ours."""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute(
+                """
+                UPDATE widget_shard_leases
+                SET owner_id = %s, lease_expires_at = %s
+                WHERE shard_id = %s
+                  AND (owner_id IS NULL OR owner_id = %s OR lease_expires_at < %s)
+                """,
+                (worker_id, now + lease_seconds, shard_id, worker_id, now),
+            )
+        else:
+            cursor.execute(
+                """
+                UPDATE widget_shard_leases
+                SET owner_id = ?, lease_expires_at = ?
+                WHERE shard_id = ?
+                  AND (owner_id IS NULL OR owner_id = ? OR lease_expires_at < ?)
+                """,
+                (worker_id, now + lease_seconds, shard_id, worker_id, now),
+            )
+
+        claimed = cursor.rowcount > 0
+        conn.commit()
+        conn.close()
+        return claimed
+
+    def renew_shard_leases(self, worker_id: str, now: float, lease_seconds: float) -> int:
+        """Extend every unexpired lease held by worker_id; returns how many were renewed."""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute(
+                """
+                UPDATE widget_shard_leases
+                SET lease_expires_at = %s
+                WHERE owner_id = %s AND lease_expires_at >= %s
+                """,
+                (now + lease_seconds, worker_id, now),
+            )
+        else:
+            cursor.execute(
+                """
+                UPDATE widget_shard_leases
+                SET lease_expires_at = ?
+                WHERE owner_id = ? AND lease_expires_at >= ?
+                """,
+                (now + lease_seconds, worker_id, now),
+            )
+
+        renewed = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return renewed
+
+    def release_shard(self, shard_id: int, worker_id: str) -> None:
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        if self.db.use_postgres:
+            cursor.execute(
+                """
+                UPDATE widget_shard_leases
+                SET owner_id = NULL, lease_expires_at = 0
+                WHERE shard_id = %s AND owner_id = %s
+                """,
+                (shard_id, worker_id),
+            )
+        else:
+            cursor.execute(
+                """
+                UPDATE widget_shard_leases
+                SET owner_id = NULL, lease_expires_at = 0
+                WHERE shard_id = ? AND owner_id = ?
+                """,
+                (shard_id, worker_id),
+            )
+
+        conn.commit()
+        conn.close()
@@ -857,6 +857,7 @@ async def handle_widget_callback(update: Update, context: ContextTypes.DEFAULT_T
             result = await update_widget_message(context.bot, widget, db, force=False)
             status = result.get("status")
             if status == "updated":
+                db.touch_widget(widget_id)
                 await query.answer("Widget refreshed.")
                 return
             if status == "skipped" and result.get("reason") == "throttled":
@@ -0,0 +1,138 @@
+import logging
+import math
+import os
+import socket
+import time
+import uuid
+from typing import Callable, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+WIDGET_SHARDS = int(os.getenv("WIDGET_SHARDS", "16"))
+WIDGET_LEASE_SECONDS = float(os.getenv("WIDGET_LEASE_SECONDS", "30"))
+
+
+def default_worker_id() -> str:
+    configured = os.getenv("WIDGET_WORKER_ID")
+    if configured:
+        return configured
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class WidgetShardLeaser:
+    """
+    Splits widgets into shards (widget_id % shard_count) and leases shards to
+    live workers through the database. Each worker aims for an even share:
+    it releases shards above ceil(shards / live workers) and claims free or
+    expired ones below it. A worker that stops heartbeating loses its shards
+    once their leases expire, and owns() turns False shortly before that so a
+    worker whose renewals fail stops editing before another one takes over.
+    """
+
+    def __init__(
+        self,
+        db,
+        worker_id: Optional[str] = None,
+        shard_count: int = WIDGET_SHARDS,
+        lease_seconds: float = WIDGET_LEASE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.db = db
+        self.worker_id = worker_id or default_worker_id()
+        self.shard_count = max(1, int(shard_count))
+        self.lease_seconds = float(lease_seconds)
+        self.clock = clock
+        self.owned: Set[int] = set()
+        # Live workers seen at the last rebalance, this one included.
+        self.live_workers = 1
+        # Leases in `owned` were last extended to this time (clock seconds).
+        self.lease_valid_until = 0.0
+        self.db.ensure_shards(self.shard_count)
+
+    @property
+    def renew_interval(self) -> float:
+        return self.lease_seconds / 3
+
+    def shard_of(self, widget_id: int) -> int:
+        return int(widget_id) % self.shard_count
+
+    def owns(self, widget_id: int) -> bool:
+        if self.clock() >= self.lease_valid_until - self.renew_interval / 2:
+            return False
+        return self.shard_of(widget_id) in self.owned
+
+    def renew(self) -> Set[int]:
+        """Heartbeat and extend held leases without rebalancing; returns shards lost."""
+        now = self.clock()
+        self.db.heartbeat_worker(self.worker_id, now)
+        renewed = self.db.renew_shard_leases(self.worker_id, now, self.lease_seconds)
+        lost: Set[int] = set()
+        if renewed < len(self.owned):
+            still_owned = {
+                lease["shard_id"]
+                for lease in self.db.get_shard_leases()
+                if lease["owner_id"] == self.worker_id and lease["lease_expires_at"] >= now
+            }
+            lost = self.owned - still_owned
+            self.owned = self.owned - lost
+            logger.warning("Worker %s lost %s shard lease(s) on renewal", self.worker_id, len(lost))
+        self.lease_valid_until = now + self.lease_seconds
+        return lost
+
+    def rebalance(self) -> Tuple[Set[int], Set[int]]:
+        """Heartbeat, renew, and even out shard ownership. Returns (gained, lost)."""
+        now = self.clock()
+        self.db.heartbeat_worker(self.worker_id, now)
+        self.db.renew_shard_leases(self.worker_id, now, self.lease_seconds)
+
+        live_workers = set(self.db.get_live_workers(now - self.lease_seconds))
+        live_workers.add(self.worker_id)
+        self.live_workers = len(live_workers)
+        target = math.ceil(self.shard_count / len(live_workers))
+
+        leases = [
+            lease for lease in self.db.get_shard_leases() if lease["shard_id"] < self.shard_count
+        ]
+        owned = {
+            lease["shard_id"]
+            for lease in leases
+            if lease["owner_id"] == self.worker_id and lease["lease_expires_at"] >= now
+        }
+
+        for shard_id in sorted(owned, reverse=True)[: max(0, len(owned) - target)]:
+            self.db.release_shard(shard_id, self.worker_id)
+            owned.discard(shard_id)
+
+        if len(owned) < target:
+            free = [
+                lease["shard_id"]
+                for lease in leases
+                if lease["shard_id"] not in owned
+                and (not lease["owner_id"] or lease["lease_expires_at"] < now)
+            ]
+            for shard_id in free:
+                if len(owned) >= target:
+                    break
+                if self.db.claim_shard(shard_id, self.worker_id, now, self.lease_seconds):
+                    owned.add(shard_id)
+
+        gained = owned - self.owned
+        lost = self.owned - owned
+        self.owned = owned
+        self.lease_valid_until = now + self.lease_seconds
+        if gained or lost:
+            logger.info(
+                "Worker %s shards: %s owned (+%s/-%s) of %s, %s live workers",
+                self.worker_id,
+                len(owned),
+                len(gained),
+                len(lost),
+                self.shard_count,
+                len(live_workers),
+            )
+        return gained, lost
+
+    def release_all(self) -> None:
+        self.db.remove_worker(self.worker_id)
+        self.owned = set()
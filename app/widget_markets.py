@@ -1,13 +1,20 @@
 import asyncio
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from market_config import get_market
 from opinion_tracked_markets import fetch_market as fetch_opinion_market
-from polymarket_client import get_polymarket_binary_prices
 from polymarket_tracked_markets import fetch_market
 
 
+# Upstream market fetches made by this process (read as a per-tick delta by the widget worker).
+_fetch_count = 0
+
+
+def get_fetch_count() -> int:
+    return _fetch_count
+
+
 async def get_market_snapshot(alias: str) -> Optional[Dict[str, object]]:
     market = get_market(alias)
     if not market:
@@ -19,29 +26,25 @@ async def get_market_snapshot(alias: str) -> Optional[Dict[str, object]]:
     yes_value = None
     no_value = None
 
+    global _fetch_count
+
+    # fetch_market already parses outcomePrices from the same Gamma /markets response,
+    # so a second get_polymarket_binary_prices request could not add anything.
     if market_id:
+        _fetch_count += 1
         data = await fetch_market(market_id)
         if data:
             title = data.get("title") or title
             yes_value = data.get("yes_price")
             no_value = data.get("no_price")
     elif opinion_id:
+        _fetch_count += 1
         data = await fetch_opinion_market(opinion_id)
         if data:
             title = data.get("title") or title
             yes_value = data.get("yes_price")
             no_value = data.get("no_price")
 
-    if market_id and (yes_value is None or no_value is None):
-        try:
-            prices = get_polymarket_binary_prices(market_id)
-        except Exception:
-            prices = {}
-        if yes_value is None:
-            yes_value = prices.get("yes")
-        if no_value is None:
-            no_value = prices.get("no")
-
     if yes_value is not None and no_value is None:
         try:
             no_value = 1 - float(yes_value)
@@ -87,3 +90,16 @@ async def get_market_snapshots(aliases: List[str]) -> List[Dict[str, object]]:
             snapshots.append(result)
 
     return snapshots
+
+
+async def get_market_snapshot_table(aliases: Iterable[str]) -> Dict[str, Dict[str, object]]:
+    """Fetch every distinct alias once and return {alias: snapshot}."""
+    unique_aliases = list(dict.fromkeys(alias for alias in aliases if alias))
+    snapshots = await get_market_snapshots(unique_aliases)
+    return {str(snapshot.get("alias")): snapshot for snapshot in snapshots}
+
+
+def snapshots_from_table(
+    table: Dict[str, Dict[str, object]], aliases: Iterable[str]
+) -> List[Dict[str, object]]:
+    return [table[alias] for alias in aliases if alias in table]
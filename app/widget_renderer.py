@@ -2,7 +2,7 @@
 import html
 import re
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 
 MAX_ALIAS_LEN = 5
@@ -180,19 +180,23 @@ def _verbose_lines(snapshots: List[Dict[str, object]]) -> List[str]:
     return lines
 
 
-def render_widget_text(
-    snapshots: List[Dict[str, object]], updated_at: datetime, compact_mode: bool = True
-) -> str:
-    lines: List[str] = []
-
+def render_market_lines(
+    snapshots: List[Dict[str, object]], compact_mode: bool = True
+) -> List[str]:
     if compact_mode:
-        lines.extend(_compact_lines(snapshots))
-    else:
-        lines.extend(_verbose_lines(snapshots))
+        return _compact_lines(snapshots)
+    return _verbose_lines(snapshots)
+
 
+def render_text_from_lines(lines: List[str], updated_at: datetime) -> str:
     time_str = updated_at.strftime("%H:%M")
-    lines.append(f"UTC {time_str}")
-    return "\n".join(lines)
+    return "\n".join([*lines, f"UTC {time_str}"])
+
+
+def render_widget_text(
+    snapshots: List[Dict[str, object]], updated_at: datetime, compact_mode: bool = True
+) -> str:
+    return render_text_from_lines(render_market_lines(snapshots, compact_mode), updated_at)
 
 
 def compute_render_hash(text: str) -> str:
@@ -202,9 +206,58 @@ def compute_render_hash(text: str) -> str:
 def compute_market_hash(
     snapshots: List[Dict[str, object]], compact_mode: bool = True
 ) -> str:
-    lines: List[str] = []
-    if compact_mode:
-        lines.extend(_compact_lines(snapshots))
-    else:
-        lines.extend(_verbose_lines(snapshots))
-    return compute_render_hash("\n".join(lines))
+    return compute_render_hash("\n".join(render_market_lines(snapshots, compact_mode)))
+
+
+class WidgetRenderCache:
+    """
+    Shares rendered lines, market hash and text between widgets showing the same
+    markets in the same mode. Entries live for one snapshot version (one tick).
+    """
+
+    def __init__(self):
+        self._version: Optional[object] = None
+        self._entries: Dict[Tuple[Tuple[str, ...], bool], Dict[str, object]] = {}
+        self.builds = 0
+        self.hits = 0
+
+    def get(
+        self,
+        snapshot_version: object,
+        aliases: Iterable[str],
+        compact_mode: bool,
+        load_snapshots: Callable[[], List[Dict[str, object]]],
+    ) -> Dict[str, object]:
+        if snapshot_version != self._version:
+            self._entries.clear()
+            self._version = snapshot_version
+
+        # Row order and alias de-duplication depend on selection order, so the
+        # key keeps it.
+        key = (tuple(aliases), bool(compact_mode))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        snapshots = load_snapshots()
+        lines = render_market_lines(snapshots, compact_mode) if snapshots else []
+        entry = {
+            "snapshots": snapshots,
+            "lines": lines,
+            "market_hash": compute_render_hash("\n".join(lines)) if snapshots else None,
+            "texts": {},
+        }
+        self._entries[key] = entry
+        self.builds += 1
+        return entry
+
+    @staticmethod
+    def render_text(entry: Dict[str, object], updated_at: datetime) -> str:
+        texts = entry["texts"]
+        minute = updated_at.strftime("%H:%M")
+        text = texts.get(minute)
+        if text is None:
+            text = render_text_from_lines(entry["lines"], updated_at)
+            texts[minute] = text
+        return text
@@ -0,0 +1,189 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from rate_limit import RateLimiter
+
+
+logger = logging.getLogger(__name__)
+
+# Bot API allows ~30 messages/sec overall and ~20 messages/min in one group.
+# The global budget is per bot token and is split between live widget workers.
+GLOBAL_EDITS_PER_SEC = float(os.getenv("WIDGET_GLOBAL_EDITS_PER_SEC", "25"))
+PER_CHAT_EDIT_INTERVAL_SEC = float(os.getenv("WIDGET_PER_CHAT_EDIT_INTERVAL_SEC", "3"))
+MAX_CONCURRENT_WIDGETS = int(os.getenv("WIDGET_MAX_CONCURRENCY", "32"))
+
+
+class WidgetEditScheduler:
+    """
+    Runs widget updates concurrently while keeping Bot API calls under a global
+    budget and a per-chat edit interval. RetryAfter backs off only the chat
+    that received it.
+    """
+
+    def __init__(
+        self,
+        global_edits_per_sec: float = GLOBAL_EDITS_PER_SEC,
+        per_chat_interval_sec: float = PER_CHAT_EDIT_INTERVAL_SEC,
+        max_concurrency: int = MAX_CONCURRENT_WIDGETS,
+    ):
+        self.global_edits_per_sec = global_edits_per_sec
+        self.global_limiter = RateLimiter(
+            global_edits_per_sec,
+            burst=max(1, int(global_edits_per_sec)),
+        )
+        self.per_chat_interval_sec = per_chat_interval_sec
+        self.max_concurrency = max(1, max_concurrency)
+        self._chat_limiters: Dict[int, RateLimiter] = {}
+        self._chat_blocked_until: Dict[int, float] = {}
+
+    def share_global_budget(self, workers: int) -> None:
+        """Take this process's share of the bot-wide budget when `workers` run on one token."""
+        rate = self.global_edits_per_sec / max(1, int(workers))
+        if rate != self.global_limiter.rate_per_sec:
+            self.global_limiter.set_rate(rate, burst=max(1, int(rate)))
+            logger.info("Global edit budget %.1f/s (%s workers)", rate, workers)
+
+    def _chat_limiter(self, chat_id: int) -> RateLimiter:
+        limiter = self._chat_limiters.get(chat_id)
+        if limiter is None:
+            limiter = RateLimiter(1.0 / max(self.per_chat_interval_sec, 0.001), burst=1)
+            self._chat_limiters[chat_id] = limiter
+        return limiter
+
+    def chat_backoff_remaining(self, chat_id: int) -> float:
+        blocked_until = self._chat_blocked_until.get(chat_id)
+        if not blocked_until:
+            return 0.0
+        remaining = blocked_until - time.monotonic()
+        if remaining <= 0:
+            self._chat_blocked_until.pop(chat_id, None)
+            return 0.0
+        return remaining
+
+    def is_chat_blocked(self, chat_id: int) -> bool:
+        return self.chat_backoff_remaining(chat_id) > 0
+
+    def back_off_chat(self, chat_id: int, seconds: float) -> None:
+        seconds = max(float(seconds or 0), 1.0)
+        blocked_until = time.monotonic() + seconds
+        self._chat_blocked_until[chat_id] = max(
+            self._chat_blocked_until.get(chat_id, 0.0),
+            blocked_until,
+        )
+        self._chat_limiter(chat_id).block_for(seconds)
+        logger.warning("Chat %s rate limited, backing off for %ss", chat_id, seconds)
+
+    async def acquire(self, chat_id: int) -> None:
+        """Wait for a per-chat slot, then for a global Bot API slot."""
+        await self._chat_limiter(chat_id).acquire()
+        await self.global_limiter.acquire()
+
+    async def _wait_for_chat_slot(self, chat_id: int) -> bool:
+        """Sleep until the chat's next edit slot is free; False if it went into backoff."""
+        while not self.is_chat_blocked(chat_id):
+            wait = self._chat_limiter(chat_id).delay()
+            if wait <= 0:
+                return True
+            await asyncio.sleep(wait)
+        return False
+
+    async def run_all(
+        self, jobs: Iterable[Tuple[int, Callable[[], Awaitable[None]]]]
+    ) -> Tuple[int, int]:
+        """
+        Run (chat_id, job) pairs with bounded concurrency.
+        Jobs for chats in backoff are not started. Returns (started, deferred).
+
+        A chat's jobs run one after another and wait out the chat's edit
+        interval before taking a concurrency slot, so a chat with many due
+        widgets never holds slots while it sleeps.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        chats: Dict[int, List[Callable[[], Awaitable[None]]]] = {}
+        started = deferred = 0
+
+        async def run_chat(chat_id: int, chat_jobs: List[Callable[[], Awaitable[None]]]) -> None:
+            for job in chat_jobs:
+                if not await self._wait_for_chat_slot(chat_id):
+                    return
+                async with semaphore:
+                    if self.is_chat_blocked(chat_id):
+                        return
+                    try:
+                        await job()
+                    except Exception:
+                        logger.exception("Widget job failed for chat %s", chat_id)
+
+        for chat_id, job in jobs:
+            if self.is_chat_blocked(chat_id):
+                deferred += 1
+                continue
+            chats.setdefault(chat_id, []).append(job)
+            started += 1
+
+        if chats:
+            await asyncio.gather(*(run_chat(chat_id, chat_jobs) for chat_id, chat_jobs in chats.items()))
+        return started, deferred
+
+
+class WidgetDeadlineHeap:
+    """
+    Min-heap of widget deadlines (naive UTC datetimes).
+    Rescheduling pushes a new entry; stale entries are skipped when popped.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, int]] = []
+        self._deadlines: Dict[int, datetime] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, widget_id: int) -> bool:
+        return widget_id in self._deadlines
+
+    def widget_ids(self) -> List[int]:
+        return list(self._deadlines)
+
+    def schedule(self, widget_id: int, due_at: datetime) -> None:
+        self._deadlines[widget_id] = due_at
+        heapq.heappush(self._heap, (due_at, next(self._counter), widget_id))
+        if len(self._heap) > 4 * len(self._deadlines) + 64:
+            self._compact()
+
+    def remove(self, widget_id: int) -> None:
+        self._deadlines.pop(widget_id, None)
+
+    def _is_current(self, entry: Tuple[datetime, int, int]) -> bool:
+        due_at, _, widget_id = entry
+        return self._deadlines.get(widget_id) == due_at
+
+    def _drop_stale(self) -> None:
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        self._heap = [entry for entry in self._heap if self._is_current(entry)]
+        heapq.heapify(self._heap)
+
+    def next_deadline(self) -> Optional[datetime]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[int]:
+        """Remove and return widget ids whose deadline is <= now, earliest first."""
+        due: List[int] = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, widget_id = heapq.heappop(self._heap)
+            self._deadlines.pop(widget_id, None)
+            due.append(widget_id)
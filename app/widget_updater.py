@@ -1,10 +1,10 @@
-﻿from datetime import datetime
-from typing import Dict
+﻿from datetime import datetime, timedelta
+from typing import Dict, Optional
 
 from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
 
-from widget_markets import get_market_snapshots
-from widget_renderer import compute_market_hash, render_widget_text
+from widget_markets import get_market_snapshots, snapshots_from_table
+from widget_renderer import WidgetRenderCache, compute_market_hash, render_widget_text
 
 
 HEARTBEAT_SECONDS = 600
@@ -27,7 +27,16 @@ def decide_widget_update(
     return "skip"
 
 
-async def update_widget_message(bot, widget: Dict[str, object], db, force: bool = False) -> Dict[str, object]:
+async def update_widget_message(
+    bot,
+    widget: Dict[str, object],
+    db,
+    force: bool = False,
+    snapshot_table: Optional[Dict[str, Dict[str, object]]] = None,
+    rate_limiter=None,
+    render_cache: Optional[WidgetRenderCache] = None,
+    snapshot_version: object = None,
+) -> Dict[str, object]:
     now = datetime.utcnow()
     interval_seconds = int(widget.get("interval_seconds") or 60)
     last_rendered_at = widget.get("last_rendered_at")
@@ -42,12 +51,27 @@ async def update_widget_message(bot, widget: Dict[str, object], db, force: bool
             }
 
     selected = widget.get("selected_market_ids") or []
-    snapshots = await get_market_snapshots(selected)
+    compact_mode = bool(widget.get("compact_mode", True))
+    render_entry = None
+    if snapshot_table is not None and render_cache is not None:
+        render_entry = render_cache.get(
+            snapshot_version,
+            selected,
+            compact_mode,
+            lambda: snapshots_from_table(snapshot_table, selected),
+        )
+        snapshots = render_entry["snapshots"]
+    elif snapshot_table is not None:
+        snapshots = snapshots_from_table(snapshot_table, selected)
+    else:
+        snapshots = await get_market_snapshots(selected)
     if not snapshots:
         return {"status": "skipped", "reason": "no_data"}
 
-    compact_mode = bool(widget.get("compact_mode", True))
-    market_hash = compute_market_hash(snapshots, compact_mode=compact_mode)
+    if render_entry is not None:
+        market_hash = render_entry["market_hash"]
+    else:
+        market_hash = compute_market_hash(snapshots, compact_mode=compact_mode)
 
     decision = decide_widget_update(
         now=now,
@@ -62,7 +86,13 @@ async def update_widget_message(bot, widget: Dict[str, object], db, force: bool
     if decision == "skip":
         return {"status": "skipped", "reason": "unchanged"}
 
-    render_text = render_widget_text(snapshots, now, compact_mode=compact_mode)
+    if render_entry is not None:
+        render_text = render_cache.render_text(render_entry, now)
+    else:
+        render_text = render_widget_text(snapshots, now, compact_mode=compact_mode)
+
+    if rate_limiter is not None:
+        await rate_limiter.acquire(int(widget.get("target_chat_id")))
 
     try:
         await bot.edit_message_text(
@@ -79,10 +109,18 @@ async def update_widget_message(bot, widget: Dict[str, object], db, force: bool
     except TelegramError as exc:
         return {"status": "error", "error": str(exc)}
 
-    db.update_render_state(
+    stored = db.update_render_state(
         int(widget.get("widget_id")),
         market_hash,
         now,
         heartbeat_at=now,
+        next_due_at=now + timedelta(seconds=interval_seconds),
     )
-    return {"status": "updated", "render_text": render_text, "reason": decision}
+    return {
+        "status": "updated",
+        "render_text": render_text,
+        "reason": decision,
+        "render_hash": market_hash,
+        "rendered_at": now,
+        "stored": stored is not False,
+    }
@@ -1,13 +1,19 @@
 import asyncio
 import logging
 import os
-from datetime import datetime
-from typing import Dict, Optional
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 from telegram import Bot
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 
 from widget_db import WidgetDatabase
+from widget_leases import WidgetShardLeaser
+from widget_markets import get_fetch_count, get_market_snapshot_table
+from widget_renderer import WidgetRenderCache
+from widget_scheduler import MAX_CONCURRENT_WIDGETS, WidgetDeadlineHeap, WidgetEditScheduler
 from widget_updater import update_widget_message
 
 
@@ -27,21 +33,173 @@ PERMISSION_HELP_TEXT = (
 )
 
 
+def build_bot(telegram_token: str, base_url: str = "https://api.telegram.org/bot") -> Bot:
+    """Bot with a connection per concurrent edit (a bare Bot() has a pool of one)."""
+    request = HTTPXRequest(
+        connection_pool_size=MAX_CONCURRENT_WIDGETS,
+        pool_timeout=30.0,
+        connect_timeout=30.0,
+        read_timeout=30.0,
+    )
+    return Bot(token=telegram_token, base_url=base_url, request=request)
+
+
 class WidgetWorker:
     def __init__(self, telegram_token: str):
         self.db = WidgetDatabase()
-        self.bot = Bot(token=telegram_token)
+        self.bot = build_bot(telegram_token)
+        # Upper bound on sleep between config-change polls.
         self.poll_interval = 10
+        self.reconcile_interval = 60
+        self.edit_scheduler = WidgetEditScheduler()
+        self.deadlines = WidgetDeadlineHeap()
+        self.render_cache = WidgetRenderCache()
+        self.snapshot_version = 0
+        self.widgets: Dict[int, Dict[str, object]] = {}
+        self.config_cursor = 0
+        # Deadlines moved in memory only (skips, backoffs); flushed after each tick.
+        self.unsaved_due: Dict[int, datetime] = {}
+        self.leaser = WidgetShardLeaser(self.db)
+        self.last_tick_stats: Dict[str, int] = {}
+        self._last_reconcile = 0.0
+        self._last_rebalance = 0.0
         self._running = True
-        logger.info("Widget worker initialized (interval=%ss)", self.poll_interval)
+        logger.info(
+            "Widget worker %s initialized (interval=%ss, shards=%s)",
+            self.leaser.worker_id,
+            self.poll_interval,
+            self.leaser.shard_count,
+        )
+
+    def _track_widget(self, widget: Dict[str, object]) -> None:
+        widget_id = int(widget.get("widget_id"))
+        self.config_cursor = max(self.config_cursor, int(widget.get("config_version") or 0))
+        if not widget.get("enabled") or not self.leaser.owns(widget_id):
+            self._forget_widget(widget_id)
+            return
+        self.widgets[widget_id] = widget
+        self.deadlines.schedule(widget_id, widget.get("next_due_at") or datetime.utcnow())
+
+    def _forget_widget(self, widget_id: int) -> None:
+        self.widgets.pop(widget_id, None)
+        self.deadlines.remove(widget_id)
+        self.unsaved_due.pop(widget_id, None)
+
+    def load_widgets(self) -> None:
+        """Rebuild the deadline heap from telegram_widgets.next_due_at."""
+        self.widgets.clear()
+        self.deadlines = WidgetDeadlineHeap()
+        for widget in self.db.get_enabled_widgets_by_due():
+            self._track_widget(widget)
+        self._last_reconcile = time.monotonic()
+        logger.info(
+            "Loaded %s widgets (config_version=%s)", len(self.widgets), self.config_cursor
+        )
+
+    def rebalance_shards(self) -> bool:
+        """Renew shard leases; returns True when newly gained shards need a reload."""
+        if time.monotonic() - self._last_rebalance < self.leaser.renew_interval:
+            return False
+        self._last_rebalance = time.monotonic()
+        gained, lost = self.leaser.rebalance()
+        self.edit_scheduler.share_global_budget(self.leaser.live_workers)
+        if lost:
+            for widget_id in list(self.widgets):
+                if not self.leaser.owns(widget_id):
+                    self._forget_widget(widget_id)
+        return bool(gained)
+
+    async def _renew_leases_while_busy(self) -> None:
+        """Keep shard leases alive through a tick that outlasts the renew interval."""
+        while True:
+            await asyncio.sleep(self.leaser.renew_interval)
+            try:
+                lost = await asyncio.to_thread(self.leaser.renew)
+            except Exception:
+                logger.exception("Failed to renew widget shard leases")
+                continue
+            for widget_id in list(self.widgets):
+                if self.leaser.shard_of(widget_id) in lost:
+                    self._forget_widget(widget_id)
+
+    def reload_changed_widgets(self) -> int:
+        """Apply rows whose config_version moved past the cursor; returns rows applied."""
+        applied = 0
+        # ">=" so rows committed later with the same version are not missed.
+        for widget in self.db.get_widgets_changed_since(self.config_cursor):
+            widget_id = int(widget.get("widget_id"))
+            known = self.widgets.get(widget_id)
+            if known and int(known.get("config_version") or 0) >= int(widget.get("config_version") or 0):
+                continue
+            if not known and not widget.get("enabled"):
+                self.config_cursor = max(self.config_cursor, int(widget.get("config_version") or 0))
+                continue
+            self._track_widget(widget)
+            applied += 1
+
+        if time.monotonic() - self._last_reconcile >= self.reconcile_interval:
+            self._last_reconcile = time.monotonic()
+            applied += self._reconcile_widgets()
+        return applied
+
+    def _reconcile_widgets(self) -> int:
+        """Compare versions with the table to catch rows the cursor skipped past.
 
-    def _is_due(self, widget: Dict[str, object]) -> bool:
-        last_rendered_at = widget.get("last_rendered_at")
+        Deleted rows leave no version behind, and a write that commits after a
+        later version has already moved the cursor is invisible to it.
+        """
+        versions = self.db.get_enabled_widget_versions()
+        for widget_id in list(self.widgets):
+            if widget_id not in versions:
+                self._forget_widget(widget_id)
+
+        applied = 0
+        for widget_id, version in versions.items():
+            known = self.widgets.get(widget_id)
+            if known is not None:
+                if int(known.get("config_version") or 0) >= version:
+                    continue
+            elif not self.leaser.owns(widget_id):
+                continue
+            widget = self.db.get_widget_by_id(widget_id)
+            if widget:
+                self._track_widget(widget)
+                applied += 1
+        return applied
+
+    def _reschedule(self, widget: Dict[str, object], result: Dict[str, object]) -> None:
+        widget_id = int(widget.get("widget_id"))
+        if widget_id not in self.widgets:
+            return
+        now = datetime.utcnow()
         interval_seconds = int(widget.get("interval_seconds") or 60)
-        if not last_rendered_at:
-            return True
-        delta = (datetime.utcnow() - last_rendered_at).total_seconds()
-        return delta >= interval_seconds
+        status = result.get("status")
+
+        if status == "updated":
+            if not result.get("stored", True):
+                self._forget_widget(widget_id)
+                return
+            widget["last_render_hash"] = result.get("render_hash")
+            widget["last_rendered_at"] = result.get("rendered_at")
+            widget["last_heartbeat_at"] = result.get("rendered_at")
+            delay = interval_seconds
+        elif status == "permission_error":
+            self._forget_widget(widget_id)
+            return
+        elif status == "retry_after":
+            delay = float(result.get("retry_after") or 1)
+        elif result.get("reason") == "throttled":
+            delay = float(result.get("retry_in") or 1)
+        else:
+            delay = interval_seconds
+
+        due_at = now + timedelta(seconds=max(delay, 1))
+        self.deadlines.schedule(widget_id, due_at)
+        if status == "updated":
+            # update_render_state already stored this deadline.
+            self.unsaved_due.pop(widget_id, None)
+        else:
+            self.unsaved_due[widget_id] = due_at
 
     async def _notify_permission_error(self, widget: Dict[str, object], error: str) -> None:
         owner_id = widget.get("owner_user_id")
@@ -55,55 +213,169 @@ class WidgetWorker:
         if not owner_id:
             return
         try:
+            await self.edit_scheduler.global_limiter.acquire()
             await self.bot.send_message(chat_id=owner_id, text=message)
         except TelegramError:
             logger.exception("Failed to DM widget owner %s", owner_id)
 
-    async def _process_widget(self, widget: Dict[str, object]) -> None:
-        result = await update_widget_message(self.bot, widget, self.db, force=False)
+    async def _process_widget(
+        self,
+        widget: Dict[str, object],
+        snapshot_table: Optional[Dict[str, Dict[str, object]]] = None,
+    ) -> Dict[str, object]:
+        if not self.leaser.owns(int(widget.get("widget_id"))):
+            # The shard moved to another worker (or its lease lapsed) mid-tick.
+            return {"status": "skipped", "reason": "not_owner"}
+        result = await update_widget_message(
+            self.bot,
+            widget,
+            self.db,
+            force=False,
+            snapshot_table=snapshot_table,
+            rate_limiter=self.edit_scheduler,
+            render_cache=self.render_cache,
+            snapshot_version=self.snapshot_version,
+        )
+        self._reschedule(widget, result)
         status = result.get("status")
 
         if status == "updated":
             logger.info("Widget %s updated", widget.get("widget_id"))
-            return
+            return result
 
         if status == "retry_after":
             retry_after = float(result.get("retry_after") or 1)
-            logger.warning("Rate limited, backing off for %ss", retry_after)
-            await asyncio.sleep(retry_after)
-            return
+            self.edit_scheduler.back_off_chat(int(widget.get("target_chat_id")), retry_after)
+            return result
 
         if status == "permission_error":
             error = str(result.get("error") or "permission_error")
             logger.warning("Widget %s permission error: %s", widget.get("widget_id"), error)
             self.db.set_widget_enabled(int(widget.get("widget_id")), False)
             await self._notify_permission_error(widget, error)
-            return
+            return result
 
         if status == "error":
             logger.warning("Widget %s update failed: %s", widget.get("widget_id"), result.get("error"))
+        return result
+
+    async def _run_tick(self, due: List[Dict[str, object]], total: int) -> None:
+        # Chats still backing off after RetryAfter wait for a later tick.
+        ready = [
+            widget
+            for widget in due
+            if not self.edit_scheduler.is_chat_blocked(int(widget.get("target_chat_id")))
+        ]
+        aliases = [
+            alias
+            for widget in ready
+            for alias in (widget.get("selected_market_ids") or [])
+        ]
+        fetches_before = get_fetch_count()
+        snapshot_table = await get_market_snapshot_table(aliases)
+        fetches = get_fetch_count() - fetches_before
+        self.snapshot_version += 1
+        builds_before = self.render_cache.builds
+
+        renewing = asyncio.create_task(self._renew_leases_while_busy())
+        try:
+            started, deferred = await self.edit_scheduler.run_all(
+                (
+                    int(widget.get("target_chat_id")),
+                    lambda widget=widget: self._process_widget(widget, snapshot_table),
+                )
+                for widget in ready
+            )
+        finally:
+            renewing.cancel()
+            await asyncio.gather(renewing, return_exceptions=True)
+        deferred += len(due) - len(ready)
+
+        # Widgets that never ran (chat backoff, job failure) go back on the heap.
+        now = datetime.utcnow()
+        for widget in due:
+            widget_id = int(widget.get("widget_id"))
+            if widget_id in self.widgets and widget_id not in self.deadlines:
+                backoff = self.edit_scheduler.chat_backoff_remaining(int(widget.get("target_chat_id")))
+                due_at = now + timedelta(seconds=max(backoff, 1))
+                self.deadlines.schedule(widget_id, due_at)
+                self.unsaved_due[widget_id] = due_at
+        self._save_deadlines()
+
+        self.last_tick_stats = {
+            "widgets": total,
+            "due_widgets": len(due),
+            "aliases": len(snapshot_table),
+            "fetches": fetches,
+            "processed": started,
+            "deferred": deferred,
+            "renders": self.render_cache.builds - builds_before,
+            "shards": len(self.leaser.owned),
+        }
+        logger.info(
+            "Widget worker tick: %s widgets, %s due, %s markets, fetches=%s, renders=%s, deferred=%s",
+            total,
+            len(due),
+            len(snapshot_table),
+            fetches,
+            self.last_tick_stats["renders"],
+            deferred,
+        )
+
+    def _save_deadlines(self) -> None:
+        """Store deadlines of widgets that were not re-rendered, so a restart or
+        shard handoff resumes their schedule instead of editing them all at once."""
+        if not self.unsaved_due:
+            return
+        due, self.unsaved_due = self.unsaved_due, {}
+        try:
+            self.db.set_next_due_at(due)
+        except Exception:
+            logger.exception("Failed to persist %s widget deadlines", len(due))
+            for widget_id, due_at in due.items():
+                self.unsaved_due.setdefault(widget_id, due_at)
+
+    def _sleep_seconds(self) -> float:
+        next_deadline = self.deadlines.next_deadline()
+        if next_deadline is None:
+            return self.poll_interval
+        wait = (next_deadline - datetime.utcnow()).total_seconds()
+        return min(max(wait, 0.0), self.poll_interval)
 
     async def run(self) -> None:
         logger.info("Widget worker started")
+        loaded = False
 
         while self._running:
+            due_ids: List[int] = []
             try:
-                widgets = self.db.get_enabled_widgets()
-                if widgets:
-                    logger.info("Widget worker tick: %s widgets", len(widgets))
-                for widget in widgets:
-                    if not self._is_due(widget):
-                        continue
-                    await self._process_widget(widget)
+                if self.rebalance_shards() or not loaded:
+                    self.load_widgets()
+                    loaded = True
+                else:
+                    self.reload_changed_widgets()
+
+                due_ids = self.deadlines.pop_due(datetime.utcnow())
+                due = [self.widgets[widget_id] for widget_id in due_ids if widget_id in self.widgets]
+                if due:
+                    await self._run_tick(due, total=len(self.widgets))
             except Exception:
                 logger.exception("Unexpected error during widget updates")
+                retry_at = datetime.utcnow() + timedelta(seconds=self.poll_interval)
+                for widget_id in due_ids:
+                    if widget_id in self.widgets and widget_id not in self.deadlines:
+                        self.deadlines.schedule(widget_id, retry_at)
 
-            await asyncio.sleep(self.poll_interval)
+            await asyncio.sleep(self._sleep_seconds())
 
         logger.info("Widget worker stopped")
 
     async def shutdown(self) -> None:
         self._running = False
+        try:
+            self.leaser.release_all()
+        except Exception:
+            logger.exception("Failed to release widget shard leases")
 
 
 async def main() -> None:
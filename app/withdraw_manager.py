@@ -1,9 +1,5 @@
 
 from typing import Dict
-from eth_utils import keccak, to_checksum_address
-from eth_abi import encode
-from py_builder_relayer_client.models import OperationType, SafeTransaction
-from relayer_client import UserRelayerClient
 
 
 USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
@@ -15,7 +11,12 @@ def withdraw_usdc_from_safe(
     amount_usdc: float,
     telegram_id: int = None
 ) -> Dict:
-   
+    # The relayer SDK and eth libraries are imported when a withdrawal actually runs.
+    from eth_utils import keccak, to_checksum_address
+    from eth_abi import encode
+    from py_builder_relayer_client.models import OperationType, SafeTransaction
+    from relayer_client import UserRelayerClient
+
     try:
         print(f"💸 Withdrawing {amount_usdc} USDC for user {telegram_id}...")
         
@@ -58,17 +58,34 @@ run_tge_alert_worker() {
     done
 }
 
+# Function to run arbitrage worker with restart
+run_arbitrage_worker() {
+    while true; do
+        echo "Starting arbitrage worker..."
+        python app/arbitrage_worker.py
+        EXIT_CODE=$?
+
+        echo "Arbitrage worker crashed with exit code $EXIT_CODE"
+        echo "Waiting 5 seconds before restart..."
+        sleep 5
+        echo "Restarting arbitrage worker..."
+    done
+}
+
 # Function to run widget worker with restart
+# Widget workers share widgets through shard leases; a stable id lets a
+# restarted worker take its own shards back without waiting for expiry.
 run_widget_worker() {
+    WORKER_INDEX=$1
     while true; do
-        echo "Starting widget worker..."
-        python app/widget_worker.py
+        echo "Starting widget worker $WORKER_INDEX..."
+        WIDGET_WORKER_ID="$(hostname)-widget-$WORKER_INDEX" python app/widget_worker.py
         EXIT_CODE=$?
 
-        echo "Widget worker crashed with exit code $EXIT_CODE"
+        echo "Widget worker $WORKER_INDEX crashed with exit code $EXIT_CODE"
         echo "Waiting 5 seconds before restart..."
         sleep 5
-        echo "Restarting widget worker..."
+        echo "Restarting widget worker $WORKER_INDEX..."
     done
 }
 
@@ -77,7 +94,10 @@ run_bot &
 run_auto_trade_worker &
 run_opinion_alert_worker &
 run_tge_alert_worker &
-run_widget_worker &
+run_arbitrage_worker &
+for WORKER_INDEX in $(seq 1 "${WIDGET_WORKERS:-1}"); do
+    run_widget_worker "$WORKER_INDEX" &
+done
 
 # Wait forever (all processes restart automatically)
 wait
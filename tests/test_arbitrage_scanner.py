@@ -0,0 +1,208 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from telegram.error import BadRequest, Forbidden, RetryAfter, TimedOut
+
+from app import database
+from app.arbitrage_worker import ArbitrageWorker
+from app.arbitrage_scanner import ArbitrageBoard, mapped_markets
+from app.polymarket_market_feed import PolymarketMarketFeed
+
+
+def quote(board, alias, op_yes, op_no, poly_yes, poly_no):
+    for venue, side, price in (
+        ("opinion", "yes", op_yes),
+        ("opinion", "no", op_no),
+        ("polymarket", "yes", poly_yes),
+        ("polymarket", "no", poly_no),
+    ):
+        board.update(alias, venue, side, price)
+
+
+class ArbitrageBoardTest(unittest.TestCase):
+    def setUp(self):
+        self.board = ArbitrageBoard(["metamask", "base"])
+        self.board.set_subscriptions([
+            {"telegram_id": 1, "threshold": 0.03},
+            {"telegram_id": 2, "threshold": 0.10},
+        ])
+
+    def test_alerts_fire_once_per_crossing_and_rearm(self):
+        quote(self.board, "metamask", 0.42, 0.60, 0.40, 0.62)
+        self.assertEqual(self.board.detect(), [])
+
+        quote(self.board, "metamask", 0.46, 0.56, 0.40, 0.62)
+        alerts = self.board.detect()
+        self.assertEqual([(alert["telegram_id"], alert["alias"]) for alert in alerts], [(1, "metamask")])
+        self.assertAlmostEqual(alerts[0]["gap"], 0.06)
+        self.assertAlmostEqual(alerts[0]["edge"], 1 - (0.40 + 0.56))
+        self.assertEqual(alerts[0]["prices"]["polymarket"], {"yes": 0.40, "no": 0.62})
+
+        self.assertEqual(self.board.detect(), [])
+
+        quote(self.board, "metamask", 0.41, 0.60, 0.40, 0.62)
+        self.assertEqual(self.board.detect(), [])
+        quote(self.board, "metamask", 0.55, 0.45, 0.40, 0.62)
+        self.assertEqual(
+            sorted(alert["telegram_id"] for alert in self.board.detect()), [1, 2]
+        )
+
+    def test_missing_prices_keep_state(self):
+        quote(self.board, "base", 0.50, 0.50, 0.40, 0.60)
+        self.assertEqual(len(self.board.detect()), 1)
+
+        self.board.update("base", "opinion", "yes", None)
+        self.board.update("base", "opinion", "no", None)
+        self.assertEqual(self.board.detect(), [])
+        quote(self.board, "base", 0.50, 0.50, 0.40, 0.60)
+        self.assertEqual(self.board.detect(), [])
+
+    def test_subscription_changes_only_reset_changed_rows(self):
+        quote(self.board, "base", 0.55, 0.45, 0.40, 0.60)
+        self.assertEqual(len(self.board.detect()), 2)
+
+        self.board.set_subscriptions([
+            {"telegram_id": 1, "threshold": 0.03},
+            {"telegram_id": 2, "threshold": 0.12},
+            {"telegram_id": 3, "threshold": 0.05},
+        ])
+        self.assertEqual(sorted(alert["telegram_id"] for alert in self.board.detect()), [2, 3])
+
+    def test_detection_scales_with_subscribers(self):
+        board = ArbitrageBoard([f"market{i}" for i in range(50)])
+        board.set_subscriptions(
+            {"telegram_id": i, "threshold": 0.01 + (i % 20) / 100} for i in range(5000)
+        )
+        rng = np.random.default_rng(7)
+        board.prices[:] = rng.uniform(0.05, 0.95, board.prices.shape)
+        quote(board, "market3", 0.30, 0.70, 0.30, 0.70)
+        board.detect()
+
+        board.update("market3", "opinion", "yes", 0.60)
+        alerts = board.detect()
+
+        # Exactly the subscribers whose threshold the new gap crosses, computed one by one.
+        gap = board.spreads()[0][board.aliases.index("market3")]
+        expected = [board.subscribers[row] for row, threshold in enumerate(board.thresholds) if gap >= threshold]
+        self.assertTrue(expected)
+        self.assertEqual({alert["alias"] for alert in alerts}, {"market3"})
+        self.assertEqual(sorted(alert["telegram_id"] for alert in alerts), sorted(expected))
+
+    def test_only_markets_listed_on_both_venues_are_mapped(self):
+        mapped = mapped_markets()
+        self.assertIn("metamask", mapped)
+        self.assertNotIn("abstract", mapped)
+        self.assertNotIn("polymarket", mapped)
+
+
+class FakeBot:
+    """Raises the queued errors for a chat, then delivers."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        queued = self.errors.get(chat_id)
+        if queued:
+            raise queued.pop(0)
+        self.sent.append((chat_id, parse_mode))
+
+
+class ArbitrageWorkerSendTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        markets = {
+            "metamask": {
+                "title": "MetaMask token",
+                "opinion_id": 1,
+                "polymarket_id": 2,
+                "clob_token_ids": {"yes": "y", "no": "n"},
+            }
+        }
+        self.worker = ArbitrageWorker("123456:TEST", db=mock.Mock(), markets=markets)
+        self.worker.send_retry_delay = 0
+        self.worker.board.set_subscriptions(
+            {"telegram_id": telegram_id, "threshold": 0.03} for telegram_id in (1, 2, 3, 4)
+        )
+
+    async def test_failed_sends_are_retried_or_rearmed(self):
+        board = self.worker.board
+        self.worker.bot = FakeBot({
+            1: [RetryAfter(0)],
+            2: [BadRequest("Can't parse entities")],
+            3: [TimedOut()] * 3,
+            4: [Forbidden("bot was blocked by the user")],
+        })
+        quote(board, "metamask", 0.46, 0.56, 0.40, 0.62)
+
+        await self.worker.send_alerts(board.detect())
+
+        # Flood control is waited out and bad Markdown falls back to plain text.
+        self.assertEqual(sorted(self.worker.bot.sent), [(1, "Markdown"), (2, None)])
+        # Only the alert that never got through fires again.
+        self.assertTrue(self.worker.changed.is_set())
+        self.assertEqual([alert["telegram_id"] for alert in board.detect()], [3])
+
+
+class PolymarketMarketFeedTest(unittest.TestCase):
+    def setUp(self):
+        self.quotes = []
+        self.feed = PolymarketMarketFeed(
+            ["yes-token", "no-token"],
+            on_quote=lambda asset_id, bid, ask: self.quotes.append((asset_id, bid, ask)),
+        )
+
+    def test_book_snapshot_then_deltas(self):
+        self.feed.handle([{
+            "event_type": "book",
+            "asset_id": "yes-token",
+            "bids": [{"price": "0.38", "size": "100"}, {"price": "0.39", "size": "5"}],
+            "asks": [{"price": "0.43", "size": "50"}, {"price": "0.41", "size": "20"}],
+        }])
+        self.assertEqual(self.quotes, [("yes-token", 0.39, 0.41)])
+
+        self.feed.handle({
+            "event_type": "price_change",
+            "price_changes": [
+                {"asset_id": "yes-token", "price": "0.41", "size": "0", "side": "SELL"},
+                {"asset_id": "other-token", "price": "0.10", "size": "1", "side": "SELL"},
+            ],
+        })
+        self.feed.handle({
+            "event_type": "price_change",
+            "asset_id": "yes-token",
+            "changes": [{"price": "0.38", "size": "10", "side": "BUY"}],
+        })
+        self.assertEqual(self.quotes, [("yes-token", 0.39, 0.41), ("yes-token", 0.39, 0.43)])
+        self.assertEqual(self.feed.events, 3)
+
+
+class ArbSubscriptionDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.tmp_file.close()
+        patcher = mock.patch.object(database, "DB_FILE", self.tmp_file.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(os.unlink, self.tmp_file.name)
+        self.db = database.Database()
+
+    def test_subscribe_update_and_remove(self):
+        self.db.set_arb_subscription(1, 0.03)
+        self.db.set_arb_subscription(2, 0.05)
+        self.db.set_arb_subscription(1, 0.04)
+
+        self.assertEqual(
+            sorted((row["telegram_id"], row["threshold"]) for row in self.db.get_arb_subscriptions()),
+            [(1, 0.04), (2, 0.05)],
+        )
+        self.assertTrue(self.db.remove_arb_subscription(1))
+        self.assertFalse(self.db.remove_arb_subscription(1))
+        self.assertIsNone(self.db.get_arb_subscription(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import time
+import unittest
+
+from app.balance_cache import BalanceSnapshotCache
+
+
+class BalanceSnapshotCacheTest(unittest.TestCase):
+    def test_fresh_entry_is_served_from_cache(self):
+        cache = BalanceSnapshotCache(ttl_sec=60, max_stale_sec=120)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {"total_usdc": 10.0}
+
+        self.assertEqual(cache.get("usdc", "0xSAFE", loader), {"total_usdc": 10.0})
+        self.assertEqual(cache.get("usdc", "0xsafe", loader), {"total_usdc": 10.0})
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidate_forces_reload(self):
+        cache = BalanceSnapshotCache(ttl_sec=60, max_stale_sec=120)
+        values = iter([1, 2])
+
+        def loader():
+            return next(values)
+
+        self.assertEqual(cache.get("usdc", "0xsafe", loader), 1)
+        cache.invalidate("0xSAFE")
+        self.assertEqual(cache.get("usdc", "0xsafe", loader), 2)
+
+    def test_persisted_marker_invalidates_older_entries(self):
+        changes = {}
+        cache = BalanceSnapshotCache(
+            ttl_sec=60,
+            max_stale_sec=120,
+            changes_lookup=lambda since: {a: t for a, t in changes.items() if t > since},
+            changes_refresh_sec=0,
+        )
+        values = iter([1, 2])
+
+        def loader():
+            return next(values)
+
+        self.assertEqual(cache.get("positions", "0xsafe", loader), 1)
+        changes["0xSAFE"] = time.time() + 1
+        self.assertEqual(cache.get("positions", "0xsafe", loader), 2)
+
+    def test_persisted_markers_are_polled_once_per_interval(self):
+        polls = []
+        cache = BalanceSnapshotCache(
+            ttl_sec=60,
+            max_stale_sec=120,
+            changes_lookup=lambda since: polls.append(since) or {},
+            changes_refresh_sec=60,
+        )
+
+        for address in ("0xa", "0xb", "0xa", "0xb"):
+            cache.get("usdc", address, lambda: 1)
+            cache.get("usdc", address, lambda: 1)
+        self.assertEqual(len(polls), 1)
+
+    def test_invalidation_outdates_a_load_in_flight(self):
+        cache = BalanceSnapshotCache(ttl_sec=60, max_stale_sec=120)
+        values = iter([1, 2])
+
+        def loader():
+            value = next(values)
+            if value == 1:
+                # A trade lands while the old balance is still being fetched.
+                cache.invalidate("0xsafe")
+            return value
+
+        self.assertEqual(cache.get("usdc", "0xsafe", loader), 1)
+        self.assertEqual(cache.get("usdc", "0xsafe", loader), 2)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        cache = BalanceSnapshotCache(ttl_sec=0.01, max_stale_sec=60)
+        refreshed = threading.Event()
+        values = iter([1, 2])
+
+        def loader():
+            value = next(values)
+            if value == 2:
+                refreshed.set()
+            return value
+
+        self.assertEqual(cache.get("usdc", "0xsafe", loader), 1)
+        time.sleep(0.02)
+        self.assertEqual(cache.get("usdc", "0xsafe", loader), 1)
+        self.assertTrue(refreshed.wait(2))
+        deadline = time.time() + 2
+        while cache._refreshing and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache._entries[("usdc", "0xsafe", "")][0], 2)
+
+    def test_failed_load_is_not_cached(self):
+        cache = BalanceSnapshotCache(ttl_sec=60, max_stale_sec=120)
+        self.assertIsNone(cache.get("positions", "0xsafe", lambda: None))
+        self.assertEqual(cache.get("positions", "0xsafe", lambda: 5), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
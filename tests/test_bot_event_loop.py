@@ -0,0 +1,206 @@
+import asyncio
+import importlib
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from cryptography.fernet import Fernet
+from telegram import ReplyKeyboardMarkup
+from telegram.error import BadRequest
+
+
+TRADE_SECONDS = 0.3
+
+
+def slow_trade_market(**kwargs):
+    time.sleep(TRADE_SECONDS)
+    return {"status": "success", "amount": kwargs["amount_usdc"], "order_id": "0xorder0000000000000000"}
+
+
+class FakeMessage:
+    """Message that, like Telegram, refuses edits once it carries a reply keyboard."""
+
+    def __init__(self, chat, text="", reply_markup=None):
+        self.chat = chat
+        self.text = text
+        self.reply_markup = reply_markup
+        self.edits = []
+        self.deleted = False
+
+    async def reply_text(self, text, reply_markup=None, **kwargs):
+        message = FakeMessage(self.chat, text, reply_markup)
+        self.chat.sent.append(message)
+        return message
+
+    async def edit_text(self, text, **kwargs):
+        if isinstance(self.reply_markup, ReplyKeyboardMarkup):
+            raise BadRequest("Message can't be edited")
+        self.edits.append(text)
+        self.text = text
+
+    async def delete(self):
+        self.deleted = True
+
+
+def fake_update(telegram_id):
+    chat = SimpleNamespace(sent=[])
+    message = FakeMessage(chat)
+    message.from_user = SimpleNamespace(id=telegram_id)
+    return SimpleNamespace(message=message)
+
+
+def sent(update):
+    return update.message.chat.sent
+
+
+def result_message(update):
+    """The trade result: the last message, sent with the trade keyboard."""
+    message = sent(update)[-1]
+    assert isinstance(message.reply_markup, ReplyKeyboardMarkup), message.text
+    return message.text
+
+
+class BotEventLoopTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # bot.py opens its sqlite files relative to the working directory on import.
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(cls.tmp_dir.name)
+        try:
+            # encryption.py refuses to import without a MASTER_KEY; any valid key will do.
+            with mock.patch.dict(os.environ, {"MASTER_KEY": os.environ.get("MASTER_KEY") or Fernet.generate_key().decode()}):
+                cls.bot = importlib.import_module("app.bot")
+        finally:
+            os.chdir(cwd)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def setUp(self):
+        wallet = {"eoa_address": "0xeoa", "safe_address": "0xsafe"}
+        for name, value in (
+            ("trade_market", slow_trade_market),
+            ("invalidate_wallet_snapshot", lambda *args: None),
+        ):
+            patcher = mock.patch.object(self.bot, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for name, value in (("get_wallet", wallet), ("get_private_key", "0xkey")):
+            patcher = mock.patch.object(self.bot.wallet_manager, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_concurrent_trades_do_not_stall_the_event_loop(self):
+        trades = 4
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        release = threading.Event()
+
+        def blocking_trade(**kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            # Holds the order until the test releases it; on the event loop
+            # this would freeze every other trade and the test itself.
+            release.wait(5)
+            with lock:
+                active -= 1
+            return slow_trade_market(**kwargs)
+
+        updates = [fake_update(telegram_id) for telegram_id in range(trades)]
+        contexts = [
+            SimpleNamespace(user_data={"pending_trade": {"market": "metamask", "action": "buy", "outcome": "yes"}})
+            for _ in range(trades)
+        ]
+
+        async def all_orders_in_flight():
+            while active < trades:
+                await asyncio.sleep(0.01)
+
+        with mock.patch.object(self.bot, "trade_market", blocking_trade):
+            await asyncio.gather(*(
+                self.bot.execute_trade(update, context, 5.0) for update, context in zip(updates, contexts)
+            ))
+            try:
+                # The loop keeps running while every order is blocked in a thread.
+                await asyncio.wait_for(all_orders_in_flight(), 5)
+            finally:
+                release.set()
+            await self.bot.TRADE_QUEUE.join()
+
+        self.assertEqual(peak, trades)
+        for update in updates:
+            self.assertIn("Trade Successful", result_message(update))
+
+    async def test_trade_handler_acknowledges_before_the_order_is_placed(self):
+        update = fake_update(7)
+        context = SimpleNamespace(user_data={"pending_trade": {"market": "metamask", "action": "buy", "outcome": "yes"}})
+
+        await self.bot.execute_trade(update, context, 5.0)
+
+        # The handler returned with the order still queued and only the acknowledgement sent.
+        status = sent(update)[0]
+        self.assertEqual(len(sent(update)), 1)
+        self.assertIn("Please wait", status.text)
+        self.assertNotIn("pending_trade", context.user_data)
+        self.assertEqual(self.bot.TRADE_QUEUE.pending(7), 1)
+
+        await self.bot.TRADE_QUEUE.join()
+        # Progress is edited into the status message, which the result then replaces.
+        self.assertIn("Placing order", status.edits[0])
+        self.assertTrue(status.deleted)
+        self.assertEqual(len(sent(update)), 2)
+        self.assertIn("Trade Successful", result_message(update))
+
+    async def test_one_users_trades_run_in_order(self):
+        placed = []
+
+        def recording_trade(**kwargs):
+            placed.append(("start", kwargs["amount_usdc"]))
+            result = slow_trade_market(**kwargs)
+            placed.append(("end", kwargs["amount_usdc"]))
+            return result
+
+        updates = [fake_update(9) for _ in range(2)]
+        with mock.patch.object(self.bot, "trade_market", recording_trade):
+            for amount, update in zip((1.0, 2.0), updates):
+                context = SimpleNamespace(
+                    user_data={"pending_trade": {"market": "metamask", "action": "buy", "outcome": "yes"}}
+                )
+                await self.bot.execute_trade(update, context, amount)
+            self.assertIn("Queued after 1 trade", sent(updates[1])[0].text)
+            await self.bot.TRADE_QUEUE.join()
+
+        self.assertEqual(placed, [("start", 1.0), ("end", 1.0), ("start", 2.0), ("end", 2.0)])
+
+    async def test_sell_flow_reuses_one_balance_checker(self):
+        balance_checker = sys.modules[self.bot.get_balance_checker.__module__]
+        checker = mock.Mock()
+        checker.get_position_balance.return_value = 10_000_000
+        with mock.patch.object(balance_checker, "_CHECKERS", {}), mock.patch.object(
+            balance_checker, "BalanceChecker", return_value=checker
+        ) as checker_class:
+            for telegram_id in range(2):
+                update = fake_update(telegram_id)
+                context = SimpleNamespace(user_data={"pending_sell": {"market": "metamask", "outcome": "yes"}})
+                await self.bot.execute_sell(update, context, 50)
+                await self.bot.TRADE_QUEUE.join()
+                self.assertIn("Selling: 5.00 tokens", sent(update)[0].edits[0])
+                self.assertIn("Sell Successful", result_message(update))
+
+        # Two sells, one checker (and one Web3 provider) between them.
+        checker_class.assert_called_once()
+        self.assertEqual(checker.get_position_balance.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
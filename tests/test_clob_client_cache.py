@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+
+from app import clob_trading
+
+
+class FakeClobClient:
+    built = 0
+
+    def __init__(self, user_private_key, telegram_id=None, funder_address=None):
+        FakeClobClient.built += 1
+        self.telegram_id = telegram_id
+        self.result = {"status": "success", "order_id": "0xorder", "amount": 1}
+
+    def create_market_order(self, token_id, side, amount_usdc):
+        return self.result
+
+
+class ClobClientCacheTest(unittest.TestCase):
+    def setUp(self):
+        FakeClobClient.built = 0
+        for patcher in (
+            mock.patch.object(clob_trading, "UserClobClient", FakeClobClient),
+            mock.patch.object(clob_trading, "_CLIENTS", clob_trading.OrderedDict()),
+            mock.patch.object(clob_trading, "CLOB_CLIENT_CACHE_SIZE", 2),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_clients_are_reused_and_bounded_lru(self):
+        first = clob_trading.get_user_clob_client("0xkey1", 1, "0xsafe1")
+        self.assertIs(clob_trading.get_user_clob_client("0xkey1", 1, "0xsafe1"), first)
+        clob_trading.get_user_clob_client("0xkey2", 2, "0xsafe2")
+        clob_trading.get_user_clob_client("0xkey1", 1, "0xsafe1")
+        clob_trading.get_user_clob_client("0xkey3", 3, "0xsafe3")
+
+        self.assertEqual(list(clob_trading._CLIENTS), [(1, "0xsafe1"), (3, "0xsafe3")])
+        self.assertEqual(FakeClobClient.built, 3)
+
+    def test_expired_clients_are_rebuilt(self):
+        first = clob_trading.get_user_clob_client("0xkey1", 1, "0xsafe1")
+        with mock.patch.object(clob_trading, "CLOB_CLIENT_TTL_SEC", 0):
+            second = clob_trading.get_user_clob_client("0xkey1", 1, "0xsafe1")
+        self.assertIsNot(second, first)
+
+    def test_auth_error_drops_the_cached_client(self):
+        client = clob_trading.get_user_clob_client("0xkey1", 1, "0xsafe1")
+        client.result = {"status": "error", "error": "PolyApiException[status_code=401]", "auth_error": True}
+
+        result = clob_trading.trade_market("0xkey1", "token", "BUY", 5.0, telegram_id=1, funder_address="0xsafe1")
+
+        self.assertEqual(result["status"], "error")
+        self.assertNotIn((1, "0xsafe1"), clob_trading._CLIENTS)
+        self.assertIsNot(clob_trading.get_user_clob_client("0xkey1", 1, "0xsafe1"), client)
+
+    def test_auth_errors_are_recognised(self):
+        self.assertTrue(clob_trading._is_auth_error(mock.Mock(status_code=401)))
+        self.assertTrue(clob_trading._is_auth_error(Exception("Unauthorized/Invalid api key")))
+        self.assertFalse(clob_trading._is_auth_error(Exception("not enough balance / allowance")))
+
+
+if __name__ == "__main__":
+    unittest.main()
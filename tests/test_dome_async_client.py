@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.integrations import dome_client
+from app.integrations.dome_client import DomeClientAsync
+from app.rate_limit import RateLimiter
+
+
+class DomeClientAsyncTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        dome_client._POSITIONS_CACHE.clear()
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self.failures = 0
+
+        async def market_price(request):
+            self.requests.append(request.path)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.02)
+            self.active -= 1
+            if self.failures:
+                self.failures -= 1
+                return web.json_response({"error": "busy"}, status=503)
+            return web.json_response({"data": {"price": "63"}})
+
+        async def wallet_pnl(request):
+            self.requests.append(request.path)
+            return web.json_response({"wallet": {"realizedPnl": "$1,234.50"}})
+
+        async def positions(request):
+            self.requests.append(request.path)
+            return web.json_response({
+                "positions": [{"token_id": "1", "shares": 2}],
+                "pagination": {"has_more": False},
+            })
+
+        app = web.Application()
+        app.router.add_get("/polymarket/market-price/{market_id}", market_price)
+        app.router.add_get("/polymarket/wallet/pnl/{wallet}", wallet_pnl)
+        app.router.add_get("/polymarket/positions/wallet/{wallet}", positions)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+
+        self.dome = DomeClientAsync(api_key="test", max_connections=5)
+        self.dome.client.base_url = str(self.server.make_url("")).rstrip("/")
+        self.dome.client.positions.base_url = self.dome.client.base_url
+        self.dome.client.positions.limiter = RateLimiter(rate_per_sec=1000, burst=10)
+        self.addAsyncCleanup(self.dome.close)
+
+    async def test_results_match_sync_client_shapes(self):
+        self.assertEqual(await self.dome.get_market_price("42"), 0.63)
+        self.assertEqual(await self.dome.get_wallet_realized_pnl("0xABC"), 1234.5)
+        self.assertIsNone(await self.dome.get_market_price(""))
+        self.assertEqual(
+            await self.dome.get_positions_by_wallet("0xABC"), [{"token_id": "1", "shares": 2}]
+        )
+        self.assertIn("/polymarket/wallet/pnl/0xabc", self.requests)
+
+    async def test_many_concurrent_calls_share_the_pool_without_threads(self):
+        # 200 calls through 5 connections queue for longer than this; only
+        # time on the socket counts against it.
+        self.dome.timeout_sec = 0.5
+        threads_before = threading.active_count()
+        prices = await asyncio.gather(*(self.dome.get_market_price(str(i)) for i in range(200)))
+
+        self.assertEqual(prices, [0.63] * 200)
+        self.assertLessEqual(self.peak, 5)
+        self.assertLessEqual(threading.active_count(), threads_before)
+        self.assertIs(await self.dome.session(), await self.dome.session())
+
+    async def test_retryable_errors_back_off_without_blocking(self):
+        self.failures = 1
+        self.dome.retry_delay_sec = 60
+        pending = asyncio.create_task(self.dome.get_market_price("42"))
+        while not self.requests:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+        # The test keeps running while the call waits out its backoff.
+        self.assertFalse(pending.done())
+        self.assertEqual(len(self.requests), 1)
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+
+    async def test_retryable_errors_are_retried(self):
+        self.failures = 1
+        self.dome.retry_delay_sec = 0
+
+        self.assertEqual(await self.dome.get_market_price("42"), 0.63)
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_each_event_loop_gets_its_own_session(self):
+        session = await self.dome.session()
+
+        async def use_on_other_loop():
+            other = await self.dome.session()
+            price = await self.dome.get_market_price("42")
+            await self.dome.close()
+            return other, price
+
+        # e.g. a worker thread running its own loop next to this one
+        other, price = await asyncio.to_thread(asyncio.run, use_on_other_loop())
+
+        self.assertIsNot(other, session)
+        self.assertTrue(other.closed)
+        self.assertEqual(price, 0.63)
+        self.assertIs(await self.dome.session(), session)
+        self.assertFalse(session.closed)
+
+        await self.dome.close()
+        self.assertTrue(session.closed)
+        self.assertIsNot(await self.dome.session(), session)
+
+
+if __name__ == "__main__":
+    unittest.main()
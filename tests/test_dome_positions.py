@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.integrations import dome_client
+from app.integrations.dome_client import DomePositionsPaginator
+from app.rate_limit import RateLimiter
+
+
+class DomePositionsPaginatorTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        dome_client._POSITIONS_CACHE.clear()
+        self.requests = []
+        self.pages = {
+            None: ([{"token_id": "1", "shares": 1}], "k2"),
+            "k2": ([{"token_id": "2", "shares": 2}], "k3"),
+            "k3": ([{"token_id": "3", "shares": 3}], None),
+        }
+
+        async def positions(request):
+            key = request.query.get("pagination_key")
+            self.requests.append(key)
+            items, next_key = self.pages[key]
+            return web.json_response({
+                "positions": items,
+                "pagination": {"has_more": next_key is not None, "pagination_key": next_key},
+            })
+
+        app = web.Application()
+        app.router.add_get("/polymarket/positions/wallet/{wallet}", positions)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.paginator = DomePositionsPaginator(
+            str(self.server.make_url("")),
+            headers={},
+            limiter=RateLimiter(rate_per_sec=1000, burst=10),
+            ttl_sec=60,
+        )
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_walks_all_pages_and_caches_result(self):
+        positions = await self.paginator.get_positions("0xABC")
+        self.assertEqual([p["token_id"] for p in positions], ["1", "2", "3"])
+        self.assertEqual(self.requests, [None, "k2", "k3"])
+
+        cached = await self.paginator.get_positions("0xabc")
+        self.assertEqual(len(cached), 3)
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_refresh_reuses_cursor_chain_and_extends_when_it_changes(self):
+        await self.paginator.get_positions("0xabc")
+
+        self.pages["k3"] = ([{"token_id": "3", "shares": 3}], "k4")
+        self.pages["k4"] = ([{"token_id": "4", "shares": 4}, {"token_id": "1", "shares": 5}], None)
+        self.requests.clear()
+
+        positions = await self.paginator.get_positions("0xabc", force_refresh=True)
+        self.assertEqual(sorted(self.requests[:3], key=str), sorted([None, "k2", "k3"], key=str))
+        self.assertEqual(self.requests[3:], ["k4"])
+        by_token = {p["token_id"]: p["shares"] for p in positions}
+        self.assertEqual(by_token, {"1": 5, "2": 2, "3": 3, "4": 4})
+
+    async def test_sync_client_refuses_to_block_the_running_loop(self):
+        client = dome_client.DomeClient(api_key="test")
+        client.positions = self.paginator
+
+        with self.assertRaises(RuntimeError):
+            client.get_positions_by_wallet("0xabc")
+        positions = await asyncio.to_thread(client.get_positions_by_wallet, "0xabc")
+        self.assertEqual(len(positions), 3)
+
+    async def test_serves_cached_set_when_refresh_fails(self):
+        await self.paginator.get_positions("0xabc")
+        await self.server.close()
+
+        positions = await self.paginator.get_positions("0xabc", force_refresh=True)
+        self.assertEqual(len(positions), 3)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_reservations_are_spaced_by_rate(self):
+        limiter = RateLimiter(rate_per_sec=10, burst=1)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertAlmostEqual(limiter.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(limiter.reserve(), 0.2, places=2)
+
+    def test_block_for_delays_next_slot(self):
+        limiter = RateLimiter(rate_per_sec=10, burst=5)
+        limiter.block_for(2.0)
+        self.assertAlmostEqual(limiter.delay(), 2.0, places=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.integrations import dome_client
+from app.integrations.dome_client import DomeClientAsync, DomeSearchCache
+
+
+MARKET = {
+    "market_slug": "will-base-launch-a-token",
+    "title": "Will Base launch a token by June 30?",
+    "tags": ["Crypto", "Pre-Market"],
+    "volume_total": 50000,
+    "volume_1_week": 7000,
+    "end_time": time.time() + 86400,
+}
+
+
+class DomeSearchCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+        self.delay = 0.1
+        self.fail = False
+
+        async def markets(request):
+            term = request.query["search"]
+            self.requests.append(term)
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                return web.json_response({"error": "down"}, status=500)
+            found = [MARKET] if term.endswith("token") else []
+            return web.json_response({"markets": found})
+
+        app = web.Application()
+        app.router.add_get("/polymarket/markets", markets)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+
+        self.cache = DomeSearchCache(ttl_sec=60)
+        patcher = mock.patch.object(dome_client, "DOME_SEARCH_CACHE", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.dome = DomeClientAsync(api_key="test")
+        self.dome.client.base_url = str(self.server.make_url("")).rstrip("/")
+        self.dome.attempts = 1
+        self.addAsyncCleanup(self.dome.close)
+
+    async def test_variants_run_in_parallel_and_priority_wins(self):
+        started = time.monotonic()
+        result = await self.dome.search_markets("base")
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(sorted(self.requests), ["base", "base launch", "base token"])
+        self.assertLess(elapsed, 2 * self.delay)
+        self.assertEqual(result["best_market"]["market_id"], "will-base-launch-a-token")
+
+    async def test_burst_is_coalesced_and_cached(self):
+        results = await asyncio.gather(*(
+            self.dome.search_markets(name) for name in ["base", "Base", " base "] * 5
+        ))
+        self.assertEqual(len(self.requests), 3)
+        self.assertTrue(all(result is results[0] for result in results))
+
+        await self.dome.search_markets("BASE")
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(self.cache.misses, 1)
+
+    async def test_sync_client_coalesces_and_shares_cache(self):
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self.dome.client.search_markets, "base") for _ in range(5)
+        ))
+        self.assertEqual(len(self.requests), 3)
+        self.assertTrue(all(result is results[0] for result in results))
+
+        self.assertIs(await self.dome.search_markets("Base"), results[0])
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_entries_expire_after_ttl(self):
+        self.cache.ttl_sec = 0.05
+        await self.dome.search_markets("base")
+        await asyncio.sleep(0.1)
+        await self.dome.search_markets("base")
+        self.assertEqual(len(self.requests), 6)
+
+    async def test_failures_are_not_cached(self):
+        self.fail = True
+        failed = await self.dome.search_markets("base")
+        self.assertEqual(failed["markets_found"], [])
+
+        self.fail = False
+        result = await self.dome.search_markets("base")
+        self.assertEqual(result["total_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from cryptography.fernet import Fernet
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+# Each of these costs 0.7-1.7s to import and is only needed once a user trades,
+# checks balances or hits Opinion.
+HEAVY_MODULES = {
+    "opinion_clob_sdk",
+    "web3",
+    "eth_account",
+    "py_clob_client",
+    "py_builder_relayer_client",
+}
+
+# Processes start.sh restarts on every crash.
+ENTRY_POINTS = [
+    "bot",
+    "auto_trade_worker",
+    "opinion_alert_worker",
+    "tge_alert_worker",
+    "widget_worker",
+    "arbitrage_worker",
+]
+
+
+def import_profile(module: str):
+    """Run `python -X importtime -c "import module"`; returns (cumulative seconds, top-level packages)."""
+    # encryption.py refuses to import without a MASTER_KEY; any valid key will do.
+    env = dict(os.environ, PYTHONPATH=APP_DIR, MASTER_KEY=Fernet.generate_key().decode())
+    with tempfile.TemporaryDirectory() as cwd:
+        # Modules open their sqlite files relative to the working directory.
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+    if result.returncode != 0:
+        raise AssertionError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative = None
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        name = name.strip()
+        packages.add(name.split(".")[0])
+        if name == module:
+            cumulative = int(cumulative_us) / 1e6
+    return cumulative, packages
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_entry_points_do_not_import_heavy_sdks(self):
+        for module in ENTRY_POINTS:
+            with self.subTest(module=module):
+                _, packages = import_profile(module)
+                self.assertEqual(packages & HEAVY_MODULES, set())
+
+    @unittest.skipUnless(os.getenv("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to time entry point imports")
+    def test_benchmark_entry_point_import_time(self):
+        for module in ENTRY_POINTS:
+            seconds, _ = import_profile(module)
+            print(f"\nimport {module}: {seconds * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
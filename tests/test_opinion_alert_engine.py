@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app import database
+from app.opinion_alert_engine import MarketTriggers, OpinionAlertEngine
+
+
+class OpinionAlertEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.tmp_file.close()
+        patcher = mock.patch.object(database, "DB_FILE", self.tmp_file.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(os.unlink, self.tmp_file.name)
+        self.db = database.Database()
+
+    def create(self, market_id, alert_type, trigger_percent):
+        return self.db.create_opinion_alert(
+            telegram_id=1,
+            market_id=market_id,
+            alert_type=alert_type,
+            trigger_percent=trigger_percent,
+        )
+
+    def test_range_lookup_triggers_crossed_thresholds_only(self):
+        pump_small = self.create(7, "price_pump", 10)
+        pump_large = self.create(7, "price_pump", 30)
+        dump = self.create(7, "price_dump", 20)
+        engine = OpinionAlertEngine(self.db)
+        engine.refresh()
+
+        self.assertEqual(engine.evaluate(7, 0.40), [])
+        triggered = engine.evaluate(7, 0.45)
+        self.assertEqual([a["id"] for a in triggered], [pump_small])
+        # Still loaded until the caller has persisted the trigger.
+        self.assertEqual([a["id"] for a in engine.evaluate(7, 0.45)], [pump_small])
+        engine.remove(triggered[0])
+
+        self.assertEqual([a["id"] for a in engine.evaluate(7, 0.32)], [dump])
+        engine.remove(engine.alerts[dump])
+        self.assertEqual(len(engine), 1)
+        self.assertIn(pump_large, engine.alerts)
+
+    def test_baselines_persist_across_restart(self):
+        alert_id = self.create(7, "price_pump", 10)
+        engine = OpinionAlertEngine(self.db)
+        engine.refresh()
+        engine.evaluate(7, 0.50)
+
+        restarted = OpinionAlertEngine(self.db)
+        restarted.refresh()
+        self.assertEqual(restarted.alerts[alert_id]["baseline_price"], 0.50)
+        self.assertEqual(restarted.evaluate(7, 0.52), [])
+        self.assertEqual([a["id"] for a in restarted.evaluate(7, 0.55)], [alert_id])
+
+    def test_new_and_cancelled_alerts_are_applied_incrementally(self):
+        first = self.create(7, "price_pump", 10)
+        engine = OpinionAlertEngine(self.db)
+        engine.refresh()
+        engine.evaluate(7, 0.40)
+
+        with mock.patch.object(self.db, "get_active_opinion_alerts", side_effect=AssertionError):
+            second = self.create(8, "price_dump", 10)
+            engine.refresh()
+            self.assertEqual(set(engine.alerts), {first, second})
+            self.assertEqual(engine.market_ids(), [7, 8])
+
+            self.db.update_opinion_alert_status(first, "cancelled")
+            engine.refresh()
+            engine.refresh()
+
+        self.assertEqual(set(engine.alerts), {second})
+        self.assertEqual(engine.market_ids(), [8])
+
+    def test_market_triggers_candidates(self):
+        triggers = MarketTriggers()
+        for alert_id, (alert_type, percent) in enumerate(
+            [("price_pump", 10), ("price_pump", 50), ("price_dump", 10), ("price_dump", 50)]
+        ):
+            triggers.add({
+                "id": alert_id,
+                "alert_type": alert_type,
+                "trigger_percent": percent,
+                "baseline_price": 0.5,
+            })
+
+        self.assertEqual(triggers.candidates(0.5), [])
+        self.assertEqual(triggers.candidates(0.55), [0])
+        self.assertEqual(sorted(triggers.candidates(0.2)), [2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
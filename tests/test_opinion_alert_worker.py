@@ -0,0 +1,105 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from app import opinion_alert_worker
+
+# The worker imports its siblings as top-level modules; patch the ones it uses.
+opinion_price_monitor = sys.modules[opinion_alert_worker.OpinionPriceMonitor.__module__]
+database = sys.modules[opinion_alert_worker.Database.__module__]
+
+
+class OpinionAlertGroupingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.tmp_file.close()
+        patcher = mock.patch.object(database, "DB_FILE", self.tmp_file.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(os.unlink, self.tmp_file.name)
+
+        with mock.patch.object(opinion_alert_worker, "get_monitor", return_value=mock.MagicMock()):
+            self.worker = opinion_alert_worker.OpinionAlertWorker("123:abc")
+        self.worker.send_notification = mock.AsyncMock()
+        self.db = self.worker.db
+
+        self.alert_ids = [
+            self.db.create_opinion_alert(
+                telegram_id=100 + index,
+                market_id=1 if index < 10 else 2,
+                alert_type="price_pump",
+                trigger_percent=5 if index % 2 == 0 else 50,
+            )
+            for index in range(12)
+        ]
+
+        self.prices = {1: 0.40, 2: 0.20}
+        self.fetches = []
+        self.active = 0
+        self.peak = 0
+
+    async def fake_fetch(self, market_id):
+        self.fetches.append(market_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return {"yes_price": self.prices[market_id]}
+
+    async def test_each_market_is_fetched_once_per_cycle(self):
+        with mock.patch.object(opinion_price_monitor, "fetch_market", side_effect=self.fake_fetch):
+            await self.worker.check_and_trigger_alerts()
+            self.assertEqual(sorted(self.fetches), [1, 2])
+            self.assertEqual(self.peak, 2)
+
+            self.prices[1] = 0.44
+            await self.worker.check_and_trigger_alerts()
+
+        self.assertEqual(len(self.fetches), 4)
+        alerts = {alert["id"]: alert for alert in self.db.get_user_opinion_alerts(100)}
+        triggered = sorted(
+            alert["id"]
+            for telegram_id in range(100, 112)
+            for alert in self.db.get_user_opinion_alerts(telegram_id)
+            if alert["status"] == "triggered"
+        )
+        self.assertEqual(triggered, [self.alert_ids[index] for index in (0, 2, 4, 6, 8)])
+        self.assertEqual(self.worker.send_notification.await_count, 5)
+        self.assertEqual(alerts[self.alert_ids[0]]["baseline_price"], 0.40)
+        self.assertEqual(len(self.worker.alert_engine), 7)
+
+    async def test_alert_is_retried_when_its_status_write_fails(self):
+        self.prices = {1: 0.40, 2: 0.20}
+        with mock.patch.object(opinion_price_monitor, "fetch_market", side_effect=self.fake_fetch):
+            await self.worker.check_and_trigger_alerts()
+
+            self.prices[1] = 0.44
+            with mock.patch.object(self.db, "update_opinion_alert_status", side_effect=RuntimeError("db down")):
+                await self.worker.check_and_trigger_alerts()
+            self.assertEqual(self.worker.send_notification.await_count, 0)
+            self.assertEqual(len(self.worker.alert_engine), 12)
+
+            await self.worker.check_and_trigger_alerts()
+
+        self.assertEqual(self.worker.send_notification.await_count, 5)
+        self.assertEqual(len(self.worker.alert_engine), 7)
+
+    async def test_fetch_concurrency_is_bounded(self):
+        monitor = opinion_price_monitor.OpinionPriceMonitor()
+        self.prices = {market_id: 0.5 for market_id in range(10)}
+        with mock.patch.object(opinion_price_monitor, "fetch_market", side_effect=self.fake_fetch):
+            prices = await monitor.get_current_prices(
+                [market_id for market_id in range(10) for _ in range(3)],
+                max_concurrency=3,
+            )
+
+        self.assertEqual(len(self.fetches), 10)
+        self.assertEqual(self.peak, 3)
+        self.assertEqual(set(prices), set(range(10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
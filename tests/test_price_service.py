@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+
+from app import price_service
+from app.price_service import PriceService, best_bid_ask
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.content = b"1"
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self._payload
+
+
+class PriceServiceTest(unittest.TestCase):
+    def setUp(self):
+        price_service._PRICE_CACHE.clear()
+        price_service._BOOK_CACHE.clear()
+        self.calls = []
+
+    def fake_post(self, url, json=None, timeout=None):
+        self.calls.append((url, json))
+        if url.endswith("/prices"):
+            return FakeResponse({
+                "1": {"BUY": "0.40", "SELL": "0.44"},
+                "2": {"BUY": "0.10"},
+            })
+        if url.endswith("/books"):
+            return FakeResponse([
+                {
+                    "asset_id": "2",
+                    "bids": [{"price": "0.05"}, {"price": "0.09"}],
+                    "asks": [{"price": "0.15"}, {"price": "0.11"}],
+                },
+            ])
+        raise AssertionError(url)
+
+    def test_prices_resolve_in_one_batch_with_book_fallback(self):
+        service = PriceService(clob_url="https://clob.test")
+        with mock.patch.object(price_service.requests, "post", side_effect=self.fake_post):
+            prices = service.get_prices(["1", "2", "3", "1", "TBD"])
+
+        self.assertAlmostEqual(prices["1"], 0.42)
+        self.assertAlmostEqual(prices["2"], 0.10)
+        self.assertIsNone(prices["3"])
+        self.assertEqual([url for url, _ in self.calls], [
+            "https://clob.test/prices",
+            "https://clob.test/books",
+        ])
+        self.assertEqual(len(self.calls[0][1]), 6)
+        self.assertEqual(self.calls[1][1], [{"token_id": "2"}, {"token_id": "3"}])
+
+    def test_cache_is_shared_across_instances(self):
+        with mock.patch.object(price_service.requests, "post", side_effect=self.fake_post):
+            PriceService(clob_url="https://clob.test").get_prices(["1"])
+            price = PriceService(clob_url="https://clob.test").get_price("1")
+
+        self.assertAlmostEqual(price, 0.42)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_unpriced_tokens_expire_sooner(self):
+        service = PriceService(clob_url="https://clob.test", price_miss_ttl_sec=0)
+        with mock.patch.object(price_service.requests, "post", side_effect=self.fake_post):
+            service.get_prices(["1", "3"])
+            self.calls.clear()
+            prices = service.get_prices(["1", "3"])
+
+        # "1" is still cached; the unpriced "3" is asked for again.
+        self.assertAlmostEqual(prices["1"], 0.42)
+        self.assertEqual(self.calls[0][1], [{"token_id": "3", "side": "BUY"}, {"token_id": "3", "side": "SELL"}])
+
+    def test_best_bid_ask_handles_unsorted_levels(self):
+        book = {
+            "bids": [{"price": "0.2"}, {"price": "0.3"}],
+            "asks": [{"price": "0.6"}, {"price": "0.5"}],
+        }
+        self.assertEqual(best_bid_ask(book), (0.3, 0.5))
+        self.assertEqual(best_bid_ask(None), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app import relayer_client
+
+
+APPROVE_SELECTOR = "0x095ea7b3"
+SET_APPROVAL_FOR_ALL_SELECTOR = "0xa22cb465"
+
+
+class FakeRelayClient:
+    """Relayer that counts how many transactions it had to confirm."""
+
+    def __init__(self, *args, deployed=False, fail_execute=False):
+        self.deployed = deployed
+        self.fail_execute = fail_execute
+        self.executed = []
+        self.confirmations = 0
+
+    def get_expected_safe(self):
+        return "0x" + "5" * 40
+
+    def get_deployed(self, address):
+        return self.deployed
+
+    def deploy(self):
+        return SimpleNamespace(transaction_id="deploy")
+
+    def execute(self, transactions, metadata=None):
+        # Like the real relayer, Safe transactions need a deployed Safe.
+        if not self.deployed:
+            raise AssertionError("execute before the Safe is deployed")
+        self.executed.append(list(transactions))
+        return SimpleNamespace(transaction_id=f"execute-{len(self.executed)}")
+
+    def poll_until_state(self, transaction_id, states, fail_state, max_polls, poll_frequency):
+        self.confirmations += 1
+        if transaction_id == "deploy":
+            self.deployed = True
+            return {"transactionHash": "0xdeploy", "proxyAddress": self.get_expected_safe()}
+        if self.fail_execute:
+            return None
+        return {"transactionHash": f"0x{transaction_id}"}
+
+
+class SetupTradingTest(unittest.TestCase):
+    def setUp(self):
+        for name, value in (
+            ("BUILDER_API_KEY", "key"),
+            ("BUILDER_SECRET", "c2VjcmV0"),
+            ("BUILDER_PASS_PHRASE", "pass"),
+        ):
+            patcher = mock.patch.object(relayer_client, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_client(self, **fake_kwargs):
+        fake = FakeRelayClient(**fake_kwargs)
+        with mock.patch.object(relayer_client, "RelayClient", lambda *args: fake):
+            client = relayer_client.UserRelayerClient("0x" + "1" * 64, telegram_id=42)
+        return client, fake
+
+    def test_new_safe_is_deployed_then_approved_in_one_batch(self):
+        client, fake = self.make_client()
+
+        result = client.setup_trading()
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["safe_tx_hash"], "0xdeploy")
+        self.assertEqual(result["approvals_tx_hash"], "0xexecute-1")
+        self.assertEqual(fake.confirmations, 2)
+        self.assertEqual(len(fake.executed), 1)
+
+        usdc, ctf = fake.executed[0]
+        self.assertEqual(usdc.to.lower(), relayer_client.USDC_ADDRESS.lower())
+        self.assertTrue(usdc.data.startswith(APPROVE_SELECTOR))
+        self.assertEqual(ctf.to.lower(), relayer_client.CTF_ADDRESS.lower())
+        self.assertTrue(ctf.data.startswith(SET_APPROVAL_FOR_ALL_SELECTOR))
+        self.assertEqual(set(result["timings"]), {"deploy_safe", "approvals", "total"})
+
+    def test_deployed_safe_needs_a_single_confirmation(self):
+        client, fake = self.make_client(deployed=True)
+
+        result = client.setup_trading()
+
+        self.assertEqual(result["status"], "success")
+        self.assertIsNone(result["safe_tx_hash"])
+        self.assertEqual(fake.confirmations, 1)
+
+    def test_failed_approvals_report_the_step(self):
+        client, fake = self.make_client(deployed=True, fail_execute=True)
+
+        result = client.setup_trading()
+
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(result["step"], "approvals")
+        self.assertEqual(result["safe_address"], fake.get_expected_safe())
+
+
+if __name__ == "__main__":
+    unittest.main()
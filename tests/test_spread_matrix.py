@@ -0,0 +1,82 @@
+import asyncio
+import time
+import unittest
+
+from app.spread_matrix import SpreadMatrix, format_spread_matrix
+
+
+FETCH_SECONDS = 0.2
+MARKETS = [
+    {"alias": f"market{i}", "title": f"Market {i} token", "opinion_id": i, "polymarket_id": 100 + i}
+    for i in range(7)
+]
+
+
+class SpreadMatrixTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = []
+        self.failing = set()
+
+        def fetcher(venue, yes):
+            def fetch(market_id):
+                self.calls.append((venue, market_id))
+                time.sleep(FETCH_SECONDS)
+                if venue in self.failing:
+                    raise RuntimeError(f"{venue} down")
+                return {"yes": yes, "no": round(1 - yes, 2)}
+            return fetch
+
+        self.matrix = SpreadMatrix(
+            {"opinion": fetcher("opinion", 0.42), "polymarket": fetcher("polymarket", 0.40)},
+            ttl_sec=60,
+        )
+
+    async def test_cold_matrix_fans_out_concurrently(self):
+        started = time.monotonic()
+        rows = await self.matrix.get_rows(MARKETS)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(len(self.calls), 2 * len(MARKETS))
+        self.assertLess(elapsed, 3 * FETCH_SECONDS)
+        self.assertEqual([row["alias"] for row in rows], [market["alias"] for market in MARKETS])
+        self.assertEqual(rows[0]["prices"]["opinion"], {"yes": 0.42, "no": 0.58})
+        self.assertLess(rows[0]["age_sec"], 1)
+
+        text = format_spread_matrix(rows)
+        self.assertIn("Δ +0.0200", text)
+        self.assertIn("just now", text)
+
+    async def test_burst_shares_one_refresh_and_warm_reads_do_not_fetch(self):
+        await asyncio.gather(*(self.matrix.get_rows(MARKETS) for _ in range(5)))
+        self.assertEqual(len(self.calls), 2 * len(MARKETS))
+
+        started = time.monotonic()
+        await self.matrix.get_rows(MARKETS)
+        self.assertLess(time.monotonic() - started, 0.05)
+        self.assertEqual(len(self.calls), 2 * len(MARKETS))
+
+    async def test_stale_rows_are_served_while_refreshing(self):
+        await self.matrix.get_rows(MARKETS)
+        self.matrix.ttl_sec = 0
+
+        started = time.monotonic()
+        rows = await self.matrix.get_rows(MARKETS)
+        self.assertLess(time.monotonic() - started, 0.05)
+        self.assertGreater(rows[0]["age_sec"], 0)
+
+        await self.matrix.refresh(MARKETS)
+        self.assertEqual(len(self.calls), 4 * len(MARKETS))
+
+    async def test_failed_venue_keeps_last_prices_and_reports_error(self):
+        await self.matrix.get_rows(MARKETS[:1])
+        self.failing.add("polymarket")
+        await self.matrix.refresh(MARKETS[:1])
+
+        row = self.matrix.rows(MARKETS[:1])[0]
+        self.assertEqual(row["prices"]["polymarket"], {"yes": 0.40, "no": 0.6})
+        self.assertEqual(row["errors"], {"polymarket": "polymarket down"})
+        self.assertIn("polymarket failed", format_spread_matrix([row]))
+
+
+if __name__ == "__main__":
+    unittest.main()
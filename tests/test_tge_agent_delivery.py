@@ -0,0 +1,113 @@
+import importlib
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from cryptography.fernet import Fernet
+
+
+TRADE_SECONDS = 0.1
+
+
+class FakeBus:
+    def __init__(self, messages):
+        self.messages = messages
+
+    def consume(self, subscriptions):
+        return {key: self.messages[channel_id] for key, channel_id in subscriptions.items() if channel_id in self.messages}
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+class DeliverAgentsTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The worker opens its sqlite files relative to the working directory on import.
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cwd = os.getcwd()
+        os.chdir(cls.tmp_dir.name)
+        try:
+            # encryption.py refuses to import without a MASTER_KEY; any valid key will do.
+            with mock.patch.dict(os.environ, {"MASTER_KEY": os.environ.get("MASTER_KEY") or Fernet.generate_key().decode()}):
+                cls.worker = importlib.import_module("app.tge_alert_worker")
+        finally:
+            os.chdir(cwd)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def setUp(self):
+        self.active = 0
+        self.peak = 0
+        self.traded = []
+        self.lock = threading.Lock()
+
+        decision = {
+            "action": "trade",
+            "confidence": 0.9,
+            "reasoning": "tge announced",
+            "trade_params": {"clob_token_yes": "123", "amount_usdc": 5.0, "side": "BUY"},
+        }
+        for target, name, value in (
+            (self.worker, "trade_market", self.slow_trade_market),
+            (self.worker, "invalidate_wallet_snapshot", lambda *args: None),
+            (self.worker.agent_core, "analyze_signal", mock.AsyncMock(return_value=decision)),
+            (self.worker.agent_db, "log_decision", mock.Mock()),
+            (self.worker.wallets, "get_wallet", mock.Mock(return_value={"safe_address": "0xsafe"})),
+            (self.worker.wallets, "get_private_key", mock.Mock(return_value="0xkey")),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def slow_trade_market(self, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(TRADE_SECONDS)
+        with self.lock:
+            self.active -= 1
+            self.traded.append(kwargs["telegram_id"])
+        return {"status": "success", "order_id": f"0xorder{kwargs['telegram_id']}"}
+
+    async def test_agents_run_concurrently_up_to_the_limit(self):
+        agents = [
+            {"id": n, "telegram_id": 100 + n, "discord_channel_id": str(n), "auto_trade_enabled": True}
+            for n in range(10)
+        ]
+        message = {"id": "1", "content": "TGE is live", "author_name": "mod"}
+        bus = FakeBus({str(n): [dict(message, channel_id=str(n))] for n in range(10)})
+        bot = FakeBot()
+
+        await self.worker.deliver_agents(agents, bus, bot, max_concurrency=3)
+
+        self.assertEqual(self.peak, 3)
+        self.assertEqual(sorted(self.traded), [100 + n for n in range(10)])
+        executed = [chat_id for chat_id, text in bot.sent if "TRADE EXECUTED" in text]
+        self.assertEqual(sorted(executed), [100 + n for n in range(10)])
+
+    async def test_agents_without_new_messages_are_skipped(self):
+        agents = [
+            {"id": 1, "telegram_id": 101, "discord_channel_id": "1", "auto_trade_enabled": True},
+            {"id": 2, "telegram_id": 102, "discord_channel_id": "2", "auto_trade_enabled": True},
+            {"id": 3, "telegram_id": 103, "discord_channel_id": None, "auto_trade_enabled": True},
+        ]
+        bus = FakeBus({"1": [{"id": "1", "content": "TGE is live", "author_name": "mod", "channel_id": "1"}]})
+
+        await self.worker.deliver_agents(agents, bus, FakeBot(), max_concurrency=3)
+
+        self.assertEqual(self.traded, [101])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from app.tge_alert_db import TgeAlertDatabase
+from app.tge_channel_bus import DiscordChannelBus
+
+
+class TempDatabase:
+    def __init__(self, path: str):
+        self.use_postgres = False
+        self.path = path
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+class FakeMonitor:
+    def __init__(self):
+        self.messages = {}
+        self.calls = []
+
+    def post(self, channel_id, message_id, content="gm"):
+        self.messages.setdefault(channel_id, []).insert(0, {"id": str(message_id), "content": content})
+
+    async def fetch_many(self, channel_ids, limit=10, force=False):
+        self.calls.append(list(channel_ids))
+        return {channel_id: list(self.messages.get(channel_id, []))[:limit] for channel_id in channel_ids}
+
+
+class DiscordChannelBusTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_file = tempfile.NamedTemporaryFile(delete=False)
+        self.tmp_file.close()
+        self.addCleanup(os.unlink, self.tmp_file.name)
+        self.db = TgeAlertDatabase(TempDatabase(self.tmp_file.name))
+        self.monitor = FakeMonitor()
+        self.bus = DiscordChannelBus(self.monitor, self.db)
+
+    async def test_each_channel_is_fetched_once_for_all_consumers(self):
+        subscriptions = {"Base": "100", "agent_1": "100", "agent_2": "100", "MetaMask": "200"}
+        await self.bus.poll(subscriptions.values())
+
+        self.assertEqual(self.monitor.calls, [["100", "200"]])
+        self.assertEqual(self.bus.fetches, 2)
+
+    async def test_consumers_start_at_newest_and_advance_independently(self):
+        self.monitor.post("100", 1)
+        await self.bus.poll(["100"])
+        self.assertEqual(self.bus.consume({"Base": "100", "agent_1": "100"}), {})
+        self.bus.commit()
+        self.assertEqual(self.db.get_last_discord_message_id("agent_1", "100"), "1")
+
+        self.monitor.post("100", 2, "tge soon")
+        await self.bus.poll(["100"])
+        delivered = self.bus.consume({"Base": "100"})
+        self.assertEqual([m["id"] for m in delivered["Base"]], ["2"])
+        self.bus.commit()
+
+        self.monitor.post("100", 3)
+        await self.bus.poll(["100"])
+        delivered = self.bus.consume({"Base": "100", "agent_1": "100"})
+        self.assertEqual([m["id"] for m in delivered["Base"]], ["3"])
+        self.assertEqual([m["id"] for m in delivered["agent_1"]], ["2", "3"])
+
+    async def test_cursors_are_written_only_on_commit(self):
+        self.db.set_last_discord_message_id("agent_1", "100", "1")
+        self.monitor.post("100", 1)
+        self.monitor.post("100", 2)
+        await self.bus.poll(["100"])
+
+        self.assertEqual(len(self.bus.consume({"agent_1": "100"})["agent_1"]), 1)
+        self.assertEqual(self.db.get_last_discord_message_id("agent_1", "100"), "1")
+        self.assertEqual(self.bus.consume({"agent_1": "100"}), {})
+
+        self.bus.commit()
+        self.assertEqual(self.db.get_last_discord_message_id("agent_1", "100"), "2")
+
+        restarted = DiscordChannelBus(self.monitor, self.db)
+        await restarted.poll(["100"])
+        self.assertEqual(restarted.consume({"agent_1": "100"}), {})
+
+    async def test_pushed_messages_merge_with_polled_ones(self):
+        self.db.set_last_discord_message_id("Base", "100", "1")
+        self.assertTrue(self.bus.push({"id": "2", "channel_id": "100", "content": "tge"}))
+        self.assertFalse(self.bus.push({"id": "2", "channel_id": "100", "content": "tge"}))
+
+        self.monitor.post("100", 2, "tge")
+        self.monitor.post("100", 3)
+        await self.bus.poll(["100"], force=True)
+
+        delivered = self.bus.consume({"Base": "100"})
+        self.assertEqual([m["id"] for m in delivered["Base"]], ["2", "3"])
+
+    async def test_channel_log_is_ordered_and_capped(self):
+        bus = DiscordChannelBus(self.monitor, self.db, log_size=3)
+        for message_id in (9, 10, 11, 12, 8):
+            self.monitor.post("100", message_id)
+        await bus.poll(["100"])
+
+        self.assertEqual([m["id"] for m in bus.channel_log("100")], ["10", "11", "12"])
+
+
+if __name__ == "__main__":
+    unittest.main()
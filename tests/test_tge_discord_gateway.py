@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
+
+from app.tge_discord_gateway import (
+    OP_DISPATCH,
+    OP_HEARTBEAT,
+    OP_HEARTBEAT_ACK,
+    OP_HELLO,
+    OP_IDENTIFY,
+    OP_RESUME,
+    DiscordGateway,
+)
+
+
+class FakeGateway:
+    """Local stand-in for the Discord gateway; drops the first connection after two events."""
+
+    def __init__(self):
+        self.handshakes = []
+        self.heartbeats = 0
+        self.connections = 0
+        self.server = None
+
+    async def handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        connection = self.connections
+
+        await ws.send_json({"op": OP_HELLO, "d": {"heartbeat_interval": 50}})
+        handshake = await ws.receive_json()
+        self.handshakes.append(handshake)
+
+        if handshake["op"] == OP_IDENTIFY:
+            resume_url = str(self.server.make_url("/resume"))
+            await ws.send_json({
+                "op": OP_DISPATCH, "s": 1, "t": "READY",
+                "d": {"session_id": "abc", "resume_gateway_url": resume_url},
+            })
+        else:
+            await ws.send_json({"op": OP_DISPATCH, "s": 4, "t": "RESUMED", "d": {}})
+
+        if connection == 1:
+            await ws.send_json(self._message(2, "100", "1001", "TGE is live"))
+            await ws.send_json(self._message(3, "999", "1002", "other server"))
+            await asyncio.sleep(0.1)
+            await ws.close()
+            return ws
+
+        await ws.send_json(self._message(5, "100", "1003", "claim open"))
+        async for frame in ws:
+            if frame.type == WSMsgType.TEXT and frame.json()["op"] == OP_HEARTBEAT:
+                self.heartbeats += 1
+                await ws.send_json({"op": OP_HEARTBEAT_ACK})
+        return ws
+
+    def _message(self, seq, channel_id, message_id, content):
+        return {
+            "op": OP_DISPATCH, "s": seq, "t": "MESSAGE_CREATE",
+            "d": {
+                "id": message_id,
+                "channel_id": channel_id,
+                "content": content,
+                "author": {"username": "mod"},
+                "timestamp": "2026-01-01T00:00:00+00:00",
+            },
+        }
+
+
+class DiscordGatewayTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = FakeGateway()
+        app = web.Application()
+        app.router.add_get("/gateway", self.fake.handle)
+        app.router.add_get("/resume/", self.fake.handle)
+        self.fake.server = TestServer(app)
+        await self.fake.server.start_server()
+        self.addAsyncCleanup(self.fake.server.close)
+
+    async def test_streams_messages_and_resumes_after_drop(self):
+        received = []
+        ready = []
+
+        async def on_message(message):
+            received.append(message)
+
+        async def on_ready(resumed):
+            ready.append(resumed)
+
+        gateway = DiscordGateway(
+            "token",
+            on_message,
+            on_ready=on_ready,
+            url=str(self.fake.server.make_url("/gateway?v=10&encoding=json")),
+            reconnect_delay=0.05,
+        )
+        gateway.subscribe(["100"])
+        task = asyncio.create_task(gateway.run())
+        try:
+            for _ in range(100):
+                if len(received) == 2 and self.fake.heartbeats:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await gateway.close()
+            await asyncio.wait_for(task, timeout=2)
+
+        self.assertEqual([m["id"] for m in received], ["1001", "1003"])
+        self.assertEqual(received[0]["author_name"], "mod")
+        self.assertEqual(received[0]["channel_id"], "100")
+        self.assertEqual(ready, [False, True])
+
+        identify, resume = self.fake.handshakes
+        self.assertEqual(identify["op"], OP_IDENTIFY)
+        self.assertEqual(identify["d"]["token"], "token")
+        self.assertEqual(resume["op"], OP_RESUME)
+        self.assertEqual(resume["d"], {"token": "token", "session_id": "abc", "seq": 3})
+        self.assertGreater(self.fake.heartbeats, 0)
+        self.assertFalse(gateway.connected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app import tge_discord_monitor
+from app.rate_limit import RateLimiter
+from app.tge_alert_db import TgeAlertDatabase
+
+
+class TempDatabase:
+    def __init__(self, path: str):
+        self.use_postgres = False
+        self.path = path
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+
+class FakeDiscumClient:
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def getMessages(self, channel_id, num=5):
+        with self._lock:
+            self.calls.append(channel_id)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.2)
+        with self._lock:
+            self.active -= 1
+        if channel_id == "limited":
+            return FakeResponse({"retry_after": 2}, status_code=429)
+        return FakeResponse([
+            {"id": "11", "content": f"tge {channel_id}", "author": {"username": "mod"}},
+        ])
+
+
+class DiscordFetchManyTest(unittest.IsolatedAsyncioTestCase):
+    async def test_channels_are_fetched_once_and_concurrently(self):
+        with mock.patch.object(tge_discord_monitor.discum, "Client", FakeDiscumClient):
+            monitor = tge_discord_monitor.DiscordMonitor(
+                "token",
+                limiter=RateLimiter(rate_per_sec=1000, burst=10),
+                max_concurrency=4,
+            )
+
+        channels = ["a", "b", "c", "d", "a", "b"]
+        result = await monitor.fetch_many(channels, limit=10)
+
+        # Each channel is fetched once, and all four were in flight together.
+        self.assertEqual(sorted(monitor.client.calls), ["a", "b", "c", "d"])
+        self.assertEqual(monitor.client.peak, 4)
+        self.assertEqual(result["c"][0]["content"], "tge c")
+
+    async def test_rate_limited_response_blocks_the_budget(self):
+        limiter = RateLimiter(rate_per_sec=10, burst=5)
+        with mock.patch.object(tge_discord_monitor.discum, "Client", FakeDiscumClient):
+            monitor = tge_discord_monitor.DiscordMonitor("token", limiter=limiter)
+
+        result = await monitor.fetch_many(["limited"])
+        self.assertEqual(result, {"limited": []})
+        self.assertGreater(limiter.delay(), 1.5)
+
+
+class DiscordCursorBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_file = tempfile.NamedTemporaryFile(delete=False)
+        self.tmp_file.close()
+        self.db = TgeAlertDatabase(TempDatabase(self.tmp_file.name))
+
+    def tearDown(self):
+        if os.path.exists(self.tmp_file.name):
+            os.unlink(self.tmp_file.name)
+
+    def test_cursors_round_trip_in_batches(self):
+        self.db.set_last_discord_message_id("Base", "100", "5")
+        keys = [("Base", "100"), ("MetaMask", "200"), ("agent_1", "100")]
+
+        self.assertEqual(
+            self.db.get_last_discord_message_ids(keys),
+            {("Base", "100"): "5", ("MetaMask", "200"): None, ("agent_1", "100"): None},
+        )
+
+        self.db.set_last_discord_message_ids({("Base", "100"): "9", ("MetaMask", "200"): "3"})
+        self.assertEqual(self.db.get_last_discord_message_id("Base", "100"), "9")
+        self.assertEqual(
+            self.db.get_last_discord_message_ids(keys)[("MetaMask", "200")], "3"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import random
+import time
+import unittest
+
+from app.tge_alert_config import DEFAULT_TGE_KEYWORDS, find_keywords
+from app.tge_keyword_matcher import KeywordAutomaton, TgeKeywordMatcher
+
+
+EXTRA_KEYWORDS = [
+    "mainnet", "testnet", "points", "season 2", "staking", "vesting", "unlock",
+    "whitelist", "presale", "launchpad", "binance", "coinbase", "bybit", "okx",
+]
+WORDS = [
+    "gm", "team", "update", "we", "are", "excited", "to", "announce", "the", "new",
+    "community", "event", "join", "our", "channel", "today", "next", "week", "soon",
+]
+
+
+def build_subscriptions(count, seed=7):
+    rng = random.Random(seed)
+    subscriptions = {}
+    for subscriber_id in range(count):
+        keywords = rng.sample(DEFAULT_TGE_KEYWORDS, 6) + rng.sample(EXTRA_KEYWORDS, 3)
+        rng.shuffle(keywords)
+        subscriptions[subscriber_id] = keywords
+    return subscriptions
+
+
+def build_messages(count, seed=11):
+    rng = random.Random(seed)
+    vocabulary = WORDS * 4 + DEFAULT_TGE_KEYWORDS + EXTRA_KEYWORDS
+    return [" ".join(rng.choice(vocabulary) for _ in range(40)).upper() for _ in range(count)]
+
+
+class KeywordAutomatonTest(unittest.TestCase):
+    def test_finds_overlapping_keywords(self):
+        automaton = KeywordAutomaton(["he", "she", "his", "hers", "token launch"])
+        self.assertEqual(automaton.find("ushers"), {"she", "he", "hers"})
+        self.assertEqual(automaton.find("Big TOKEN LAUNCH today"), {"token launch"})
+
+    def test_word_boundary_option(self):
+        automaton = KeywordAutomaton(["tge", "dex"])
+        self.assertEqual(automaton.find("pretge index"), {"tge", "dex"})
+        self.assertEqual(automaton.find("pretge index", word_boundary=True), set())
+        self.assertEqual(automaton.find("pretge, TGE! dex", word_boundary=True), {"tge", "dex"})
+
+
+class TgeKeywordMatcherTest(unittest.TestCase):
+    def test_matches_equal_find_keywords(self):
+        subscriptions = build_subscriptions(300)
+        matcher = TgeKeywordMatcher()
+        matcher.update(subscriptions)
+
+        for message in build_messages(50):
+            matched = matcher.match(message)
+            for subscriber_id, keywords in subscriptions.items():
+                expected = find_keywords(message, keywords)
+                self.assertEqual(matched.get(subscriber_id, []), expected)
+
+    def test_rebuilds_only_when_keywords_change(self):
+        matcher = TgeKeywordMatcher()
+        self.assertTrue(matcher.update({1: ["tge"], 2: ["airdrop"]}))
+        self.assertFalse(matcher.update({2: ["airdrop"], 1: ["TGE"]}))
+        self.assertTrue(matcher.update({1: ["tge"], 2: ["airdrop", "claim"]}))
+        self.assertEqual(matcher.builds, 2)
+        self.assertEqual(matcher.match("claim the airdrop"), {2: ["airdrop", "claim"]})
+
+    @unittest.skipUnless(os.getenv("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to time the matcher")
+    def test_benchmark_against_find_keywords(self):
+        subscriptions = build_subscriptions(3000)
+        messages = build_messages(100)
+
+        started = time.perf_counter()
+        baseline_hits = 0
+        for message in messages:
+            for keywords in subscriptions.values():
+                if find_keywords(message, keywords):
+                    baseline_hits += 1
+        baseline = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matcher = TgeKeywordMatcher()
+        matcher.update(subscriptions)
+        built = time.perf_counter() - started
+        matched_hits = sum(len(matcher.match(message)) for message in messages)
+        compiled = time.perf_counter() - started
+
+        print(
+            f"\n{len(messages)} messages x {len(subscriptions)} subscribers: "
+            f"find_keywords={baseline * 1000:.0f}ms "
+            f"matcher={compiled * 1000:.0f}ms (build {built * 1000:.0f}ms)"
+        )
+        self.assertEqual(matched_hits, baseline_hits)
+
+
+if __name__ == "__main__":
+    unittest.main()
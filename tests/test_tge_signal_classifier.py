@@ -0,0 +1,98 @@
+import json
+import os
+import time
+import unittest
+
+from app.tge_agent import KNOWN_MARKET_TOKENS
+from app.tge_alert_config import DEFAULT_TGE_KEYWORDS, find_keywords
+from app.tge_signal_classifier import TgeSignalClassifier
+
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "discord_messages.json")
+
+
+def load_corpus():
+    with open(FIXTURE, encoding="utf-8") as handle:
+        return [message["content"] for message in json.load(handle)]
+
+
+def legacy_scan(message_content, project_name=""):
+    """The per-message loops TGEAgent ran before the classifier."""
+    keywords_found = find_keywords(message_content, DEFAULT_TGE_KEYWORDS)
+
+    msg_lower = message_content.lower()
+    search_key = None
+    for market_key, token_info in KNOWN_MARKET_TOKENS.items():
+        if any(kw in msg_lower for kw in token_info["keywords"]):
+            search_key = market_key
+            break
+
+    market = None
+    texts_to_check = [project_name.lower(), msg_lower]
+    for token_info in KNOWN_MARKET_TOKENS.values():
+        if any(kw in text for kw in token_info["keywords"] for text in texts_to_check):
+            market = token_info
+            break
+    return keywords_found, search_key, market
+
+
+class TgeSignalClassifierTest(unittest.TestCase):
+    def setUp(self):
+        self.corpus = load_corpus()
+        self.classifier = TgeSignalClassifier(KNOWN_MARKET_TOKENS)
+
+    def test_matches_legacy_scan_on_corpus(self):
+        for project_name in ("", "testagent", "opensea alpha", "mega"):
+            for message in self.corpus:
+                signal = self.classifier.classify(message, project_name)
+                keywords_found, search_key, market = legacy_scan(message, project_name)
+                self.assertEqual(list(signal.keywords_found), keywords_found)
+                self.assertEqual(signal.search_key, search_key)
+                self.assertIs(signal.market, market)
+
+    def test_overlapping_keywords(self):
+        classifier = TgeSignalClassifier(
+            {
+                "megaeth": {"keywords": ["megaeth", "mega"]},
+                "opensea": {"keywords": ["opensea", "sea"]},
+            },
+            tge_keywords=["token launch", "token generation", "tge"],
+        )
+        self.assertEqual(
+            classifier.find("MEGAETH token generation at opensea"),
+            {"megaeth", "mega", "token generation", "opensea", "sea"},
+        )
+        signal = classifier.classify("pretge seaside party", "megaphone")
+        self.assertEqual(signal.keywords_found, ("tge",))
+        self.assertEqual(signal.search_key, "opensea")
+        self.assertEqual(signal.market_key, "megaeth")
+
+    @unittest.skipUnless(os.getenv("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to time the classifier")
+    def test_per_message_latency_benchmark(self):
+        started = time.perf_counter()
+        for message in self.corpus:
+            legacy_scan(message, "testagent")
+        legacy = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for message in self.corpus:
+            self.classifier._classify(message, "testagent")
+        compiled = time.perf_counter() - started
+
+        for message in self.corpus:
+            self.classifier.classify(message, "testagent")
+        started = time.perf_counter()
+        for message in self.corpus:
+            self.classifier.classify(message, "testagent")
+        memoized = time.perf_counter() - started
+
+        per_message = 1e6 / len(self.corpus)
+        print(
+            f"\n{len(self.corpus)} recorded messages: legacy={legacy * per_message:.1f}us/msg "
+            f"compiled={compiled * per_message:.1f}us/msg "
+            f"memoized repeat={memoized * per_message:.1f}us/msg"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import time
+import unittest
+
+from app.trade_queue import TradeQueue, TradeQueueFull
+
+
+class TradeQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def test_orders_per_user_and_runs_users_in_parallel(self):
+        queue = TradeQueue(max_pending=5)
+        events = []
+
+        def job(user, n):
+            async def run():
+                events.append((user, n, "start"))
+                await asyncio.sleep(0.05)
+                events.append((user, n, "end"))
+            return run
+
+        started = time.monotonic()
+        for n in range(3):
+            for user in (1, 2, 3):
+                self.assertEqual(queue.submit(user, job(user, n)), n)
+        self.assertEqual(queue.pending(1), 3)
+        await queue.join()
+        elapsed = time.monotonic() - started
+
+        for user in (1, 2, 3):
+            own = [(n, phase) for u, n, phase in events if u == user]
+            self.assertEqual(own, [(0, "start"), (0, "end"), (1, "start"), (1, "end"), (2, "start"), (2, "end")])
+        # Three users x three 50ms trades take about as long as one user's three.
+        self.assertLess(elapsed, 0.3)
+        self.assertEqual(queue.pending(1), 0)
+
+    async def test_limit_and_failures_do_not_block_the_queue(self):
+        queue = TradeQueue(max_pending=2)
+        done = []
+
+        async def failing():
+            raise RuntimeError("exchange down")
+
+        async def ok():
+            done.append("ok")
+
+        queue.submit(1, failing)
+        queue.submit(1, ok)
+        with self.assertRaises(TradeQueueFull):
+            queue.submit(1, ok)
+        with self.assertLogs("app.trade_queue", level="ERROR"):
+            await queue.join()
+
+        self.assertEqual(done, ["ok"])
+        queue.submit(1, ok)
+        await queue.join()
+        self.assertEqual(done, ["ok", "ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import time
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+from aiohttp.test_utils import TestClient, TestServer
+from telegram import Update, User
+from telegram.ext import Application, ExtBot, TypeHandler
+
+from app.webhook_server import SECRET_HEADER, PerChatUpdateProcessor, WebhookServer, drain
+
+
+SECRET = "test-secret"
+PATH = "/telegram"
+
+
+def message_update(update_id: int, chat_id: int, text: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "user"},
+            "text": text,
+        },
+    }
+
+
+async def fake_get_me(bot, *args, **kwargs):
+    # Bot.initialize() verifies the token with getMe; answer it locally.
+    bot._bot_user = User(id=1, is_bot=True, first_name="bot", username="test_bot")
+    return bot._bot_user
+
+
+class WebhookServerTest(unittest.IsolatedAsyncioTestCase):
+    HANDLER_SECONDS = 0.005
+
+    async def asyncSetUp(self):
+        # IsolatedAsyncioTestCase runs the loop in debug mode, which records a
+        # traceback for every callback and would dominate the throughput figure.
+        asyncio.get_running_loop().set_debug(False)
+
+        patcher = mock.patch.object(ExtBot, "get_me", fake_get_me)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.handled = defaultdict(list)
+        self.active = defaultdict(int)
+        self.max_active_per_chat = 0
+        self.max_active = 0
+        self.all_handled = asyncio.Event()
+        self.expected = 0
+
+        self.application = (
+            Application.builder()
+            .token("123456:TEST")
+            .updater(None)
+            .concurrent_updates(PerChatUpdateProcessor(64))
+            .build()
+        )
+        self.application.add_handler(TypeHandler(Update, self.handler))
+        await self.application.initialize()
+        await self.application.start()
+
+        self.server = WebhookServer(self.application, SECRET, path=PATH)
+        self.client = TestClient(TestServer(self.server.build_app()))
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        if self.application.running:
+            await self.application.stop()
+        await self.application.shutdown()
+
+    async def handler(self, update: Update, context) -> None:
+        chat_id = update.effective_chat.id
+        self.active[chat_id] += 1
+        self.max_active_per_chat = max(self.max_active_per_chat, self.active[chat_id])
+        self.max_active = max(self.max_active, sum(self.active.values()))
+        await asyncio.sleep(self.HANDLER_SECONDS)
+        self.active[chat_id] -= 1
+        self.handled[chat_id].append(update.message.text)
+        if sum(len(texts) for texts in self.handled.values()) == self.expected:
+            self.all_handled.set()
+
+    async def post(self, payload: dict, secret: str = SECRET) -> int:
+        response = await self.client.post(PATH, json=payload, headers={SECRET_HEADER: secret})
+        return response.status
+
+    async def test_rejects_wrong_secret_and_malformed_updates(self):
+        self.assertEqual(await self.post(message_update(1, 10, "hi"), secret="wrong"), 403)
+        response = await self.client.post(PATH, json=message_update(2, 10, "hi"))
+        self.assertEqual(response.status, 403)
+        response = await self.client.post(PATH, data=b"{not json", headers={SECRET_HEADER: SECRET})
+        self.assertEqual(response.status, 400)
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.handled, {})
+        self.assertEqual(self.server.rejected, 2)
+        self.assertEqual(self.server.received, 0)
+
+    async def send_updates(self, chats: int, per_chat: int) -> None:
+        self.expected = chats * per_chat
+
+        async def chat_sender(chat_id: int) -> None:
+            # Telegram delivers one chat's updates in order.
+            for i in range(per_chat):
+                status = await self.post(message_update(chat_id * 1000 + i, chat_id, f"m{i}"))
+                self.assertEqual(status, 200)
+
+        await asyncio.gather(*(chat_sender(chat_id) for chat_id in range(1, chats + 1)))
+        await asyncio.wait_for(self.all_handled.wait(), 10)
+
+    async def test_chats_run_concurrently_in_per_chat_order(self):
+        per_chat = 20
+        await self.send_updates(chats=50, per_chat=per_chat)
+
+        # Handlers overlap across chats but never within one.
+        self.assertEqual(self.max_active_per_chat, 1)
+        self.assertGreater(self.max_active, 1)
+        for texts in self.handled.values():
+            self.assertEqual(texts, [f"m{i}" for i in range(per_chat)])
+
+    @unittest.skipUnless(os.getenv("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to measure webhook throughput")
+    async def test_benchmark_updates_per_second(self):
+        chats, per_chat = 50, 20
+        started = time.perf_counter()
+        await self.send_updates(chats, per_chat)
+        elapsed = time.perf_counter() - started
+
+        sequential = self.expected * self.HANDLER_SECONDS
+        print(
+            f"\nwebhook: {self.expected} updates from {chats} chats in {elapsed:.2f}s "
+            f"({self.expected / elapsed:.0f} updates/sec; one at a time would take >= {sequential:.1f}s)"
+        )
+
+    async def test_drain_finishes_accepted_updates_and_refuses_new_ones(self):
+        self.HANDLER_SECONDS = 0.2
+        self.expected = 10
+        for i in range(self.expected):
+            self.assertEqual(await self.post(message_update(i, 100 + i, "queued")), 200)
+
+        draining = asyncio.create_task(drain(self.application, self.server, timeout=5))
+        await asyncio.sleep(0)
+        self.assertEqual(await self.post(message_update(99, 999, "late")), 503)
+        await draining
+
+        self.assertTrue(self.all_handled.is_set())
+        self.assertEqual(sum(len(texts) for texts in self.handled.values()), 10)
+        self.assertNotIn(999, self.handled)
+
+
+if __name__ == "__main__":
+    unittest.main()
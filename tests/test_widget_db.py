@@ -2,6 +2,7 @@
 import sqlite3
 import tempfile
 import unittest
+from datetime import datetime, timedelta
 
 from app.widget_db import WidgetDatabase
 
@@ -61,6 +62,78 @@ class WidgetDbTest(unittest.TestCase):
         widget = self.widget_db.get_widget_by_id(widget_id)
         self.assertIsNone(widget)
 
+    def test_config_version_cursor_and_next_due(self):
+        first = self.widget_db.create_widget(
+            owner_user_id=1,
+            target_chat_id=10,
+            board_message_id=100,
+            selected_market_ids=["metamask"],
+            interval_seconds=60,
+            enabled=True,
+        )
+        second = self.widget_db.create_widget(
+            owner_user_id=2,
+            target_chat_id=20,
+            board_message_id=200,
+            selected_market_ids=["base"],
+            interval_seconds=60,
+            enabled=True,
+        )
+        cursor = self.widget_db.get_widget_by_id(second)["config_version"]
+
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        stored = self.widget_db.update_render_state(
+            first, "hash", now, heartbeat_at=now, next_due_at=now + timedelta(seconds=60)
+        )
+        self.assertTrue(stored)
+        self.assertEqual(self.widget_db.get_widgets_changed_since(cursor + 1), [])
+
+        self.widget_db.update_widget_interval(second, 300)
+        self.widget_db.set_widget_enabled(first, False)
+        changed = self.widget_db.get_widgets_changed_since(cursor + 1)
+        self.assertEqual([w["widget_id"] for w in changed], [second, first])
+        self.assertFalse(changed[1]["enabled"])
+        self.assertEqual(changed[1]["next_due_at"], now + timedelta(seconds=60))
+
+        self.assertEqual(
+            [w["widget_id"] for w in self.widget_db.get_enabled_widgets_by_due()], [second]
+        )
+        self.assertEqual(self.widget_db.get_enabled_widget_ids(), [second])
+
+        self.widget_db.delete_widget(first)
+        self.assertFalse(self.widget_db.update_render_state(first, "hash", now))
+
+    def test_enabled_versions_and_saved_deadlines(self):
+        first = self.widget_db.create_widget(
+            owner_user_id=1,
+            target_chat_id=10,
+            board_message_id=100,
+            selected_market_ids=["metamask"],
+            interval_seconds=60,
+            enabled=True,
+        )
+        second = self.widget_db.create_widget(
+            owner_user_id=2,
+            target_chat_id=20,
+            board_message_id=200,
+            selected_market_ids=["base"],
+            interval_seconds=60,
+            enabled=False,
+        )
+        versions = self.widget_db.get_enabled_widget_versions()
+        self.assertEqual(list(versions), [first])
+        self.widget_db.update_widget_markets(first, ["base"])
+        self.assertGreater(self.widget_db.get_enabled_widget_versions()[first], versions[first])
+
+        cursor = self.widget_db.get_widget_by_id(first)["config_version"]
+        due_at = datetime(2024, 1, 1, 12, 5, 0)
+        self.widget_db.set_next_due_at({first: due_at, second: due_at})
+        self.assertEqual(self.widget_db.get_widget_by_id(first)["next_due_at"], due_at)
+        self.assertEqual(self.widget_db.get_widget_by_id(second)["next_due_at"], due_at)
+        # Saving a deadline is not a config change.
+        self.assertEqual(self.widget_db.get_widgets_changed_since(cursor + 1), [])
+        self.widget_db.set_next_due_at({})
+
 
 if __name__ == "__main__":
     unittest.main()
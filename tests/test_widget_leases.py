@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from app.widget_db import WidgetDatabase
+from app.widget_leases import WidgetShardLeaser
+
+
+class TempDatabase:
+    def __init__(self, path: str):
+        self.use_postgres = False
+        self.path = path
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class WidgetShardLeaserTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_file = tempfile.NamedTemporaryFile(delete=False)
+        self.tmp_file.close()
+        self.widget_db = WidgetDatabase(TempDatabase(self.tmp_file.name))
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        if os.path.exists(self.tmp_file.name):
+            os.unlink(self.tmp_file.name)
+
+    def leaser(self, worker_id):
+        return WidgetShardLeaser(
+            self.widget_db,
+            worker_id=worker_id,
+            shard_count=16,
+            lease_seconds=30,
+            clock=self.clock,
+        )
+
+    def test_single_worker_owns_every_shard(self):
+        first = self.leaser("a")
+        gained, lost = first.rebalance()
+        self.assertEqual(gained, set(range(16)))
+        self.assertEqual(lost, set())
+        self.assertTrue(first.owns(5) and first.owns(21))
+
+    def test_rebalance_on_join_and_takeover_on_expiry(self):
+        first = self.leaser("a")
+        second = self.leaser("b")
+        first.rebalance()
+
+        second.rebalance()
+        self.assertEqual(second.owned, set())
+
+        self.clock.now += 5
+        _, lost = first.rebalance()
+        self.assertEqual(len(lost), 8)
+        second.rebalance()
+        self.assertEqual(len(first.owned), 8)
+        self.assertEqual(len(second.owned), 8)
+        self.assertFalse(first.owned & second.owned)
+        self.assertEqual((first.live_workers, second.live_workers), (2, 2))
+
+        # "a" stops heartbeating; "b" takes over once the leases expire.
+        self.clock.now += 20
+        second.rebalance()
+        self.assertEqual(len(second.owned), 8)
+        self.clock.now += 15
+        second.rebalance()
+        self.assertEqual(second.owned, set(range(16)))
+
+    def test_renewal_keeps_shards_through_a_long_tick(self):
+        first = self.leaser("a")
+        second = self.leaser("b")
+        first.rebalance()
+
+        # Without renewal "a" stops editing before its leases could be taken over.
+        self.clock.now += 25
+        self.assertFalse(first.owns(3))
+        self.assertEqual(first.renew(), set())
+        self.assertTrue(first.owns(3))
+
+        self.clock.now += 25
+        second.rebalance()
+        self.assertEqual(second.owned, set())
+
+        # Renewals stop long enough for "b" to take over; "a" notices on the next one.
+        self.clock.now += 31
+        second.rebalance()
+        self.assertEqual(second.owned, set(range(16)))
+        self.assertEqual(first.renew(), set(range(16)))
+        self.assertFalse(first.owns(3))
+
+    def test_release_all_frees_shards_immediately(self):
+        first = self.leaser("a")
+        second = self.leaser("b")
+        first.rebalance()
+        first.release_all()
+
+        second.rebalance()
+        self.assertEqual(second.owned, set(range(16)))
+
+    def test_claim_is_exclusive_while_lease_is_live(self):
+        self.widget_db.ensure_shards(1)
+        self.assertTrue(self.widget_db.claim_shard(0, "a", 1_000.0, 30))
+        self.assertFalse(self.widget_db.claim_shard(0, "b", 1_010.0, 30))
+        self.assertTrue(self.widget_db.claim_shard(0, "b", 1_031.0, 30))
+
+
+if __name__ == "__main__":
+    unittest.main()
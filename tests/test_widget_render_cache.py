@@ -0,0 +1,135 @@
+import itertools
+import os
+import time
+import unittest
+from datetime import datetime
+
+from app.widget_markets import snapshots_from_table
+from app.widget_renderer import (
+    WidgetRenderCache,
+    compute_market_hash,
+    render_widget_text,
+)
+
+
+ALIASES = ["opensea", "opinion", "metamask", "base", "abstract", "polymarket"]
+WIDGET_COUNT = 5000
+
+
+def build_table():
+    return {
+        alias: {
+            "alias": alias,
+            "name": f"{alias.title()} Token by March 31, 2026",
+            "yes_value": 0.1 * (index + 1),
+            "no_value": 1 - 0.1 * (index + 1),
+        }
+        for index, alias in enumerate(ALIASES)
+    }
+
+
+def build_widgets(count):
+    selections = [
+        list(combo)
+        for size in (1, 2, 3)
+        for combo in itertools.combinations(ALIASES, size)
+    ]
+    return [
+        {
+            "selected_market_ids": selections[index % len(selections)],
+            "compact_mode": index % 3 != 0,
+        }
+        for index in range(count)
+    ]
+
+
+class WidgetRenderCacheTest(unittest.TestCase):
+    def test_cached_output_matches_direct_render(self):
+        table = build_table()
+        now = datetime(2026, 1, 31, 8, 14)
+        cache = WidgetRenderCache()
+
+        for widget in build_widgets(200):
+            selected = widget["selected_market_ids"]
+            compact_mode = widget["compact_mode"]
+            entry = cache.get(
+                1, selected, compact_mode, lambda: snapshots_from_table(table, selected)
+            )
+            snapshots = snapshots_from_table(table, selected)
+            self.assertEqual(
+                entry["market_hash"], compute_market_hash(snapshots, compact_mode=compact_mode)
+            )
+            self.assertEqual(
+                cache.render_text(entry, now),
+                render_widget_text(snapshots, now, compact_mode=compact_mode),
+            )
+
+    def test_new_snapshot_version_rebuilds(self):
+        table = build_table()
+        cache = WidgetRenderCache()
+        load = lambda: snapshots_from_table(table, ["base"])
+
+        cache.get(1, ["base"], True, load)
+        cache.get(1, ["base"], True, load)
+        cache.get(2, ["base"], True, load)
+        self.assertEqual((cache.builds, cache.hits), (2, 1))
+
+    def test_builds_once_per_distinct_selection(self):
+        table = build_table()
+        widgets = build_widgets(WIDGET_COUNT)
+        now = datetime(2026, 1, 31, 8, 14)
+        cache = WidgetRenderCache()
+
+        for widget in widgets:
+            selected = widget["selected_market_ids"]
+            entry = cache.get(
+                1,
+                selected,
+                widget["compact_mode"],
+                lambda: snapshots_from_table(table, selected),
+            )
+            cache.render_text(entry, now)
+
+        distinct = {
+            (tuple(widget["selected_market_ids"]), widget["compact_mode"]) for widget in widgets
+        }
+        self.assertEqual(cache.builds, len(distinct))
+        self.assertEqual(cache.hits, WIDGET_COUNT - len(distinct))
+
+    @unittest.skipUnless(os.getenv("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to time a render tick")
+    def test_benchmark_render_cost_per_tick(self):
+        table = build_table()
+        widgets = build_widgets(WIDGET_COUNT)
+        now = datetime(2026, 1, 31, 8, 14)
+
+        started = time.perf_counter()
+        for widget in widgets:
+            selected = widget["selected_market_ids"]
+            compact_mode = widget["compact_mode"]
+            snapshots = snapshots_from_table(table, selected)
+            compute_market_hash(snapshots, compact_mode=compact_mode)
+            render_widget_text(snapshots, now, compact_mode=compact_mode)
+        uncached = time.perf_counter() - started
+
+        cache = WidgetRenderCache()
+        started = time.perf_counter()
+        for widget in widgets:
+            selected = widget["selected_market_ids"]
+            entry = cache.get(
+                1,
+                selected,
+                widget["compact_mode"],
+                lambda: snapshots_from_table(table, selected),
+            )
+            cache.render_text(entry, now)
+        cached = time.perf_counter() - started
+
+        print(
+            f"\nrender tick for {WIDGET_COUNT} widgets: "
+            f"uncached={uncached * 1000:.1f}ms cached={cached * 1000:.1f}ms "
+            f"builds={cache.builds}"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
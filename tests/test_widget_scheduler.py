@@ -0,0 +1,127 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from app.widget_scheduler import WidgetDeadlineHeap, WidgetEditScheduler
+
+
+class WidgetEditSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_retry_after_backs_off_only_that_chat(self):
+        scheduler = WidgetEditScheduler(
+            global_edits_per_sec=1000,
+            per_chat_interval_sec=0.001,
+            max_concurrency=8,
+        )
+        scheduler.back_off_chat(1, 30)
+
+        ran = []
+
+        async def job(chat_id):
+            ran.append(chat_id)
+
+        started, deferred = await scheduler.run_all(
+            (chat_id, lambda chat_id=chat_id: job(chat_id)) for chat_id in (1, 2, 3)
+        )
+
+        self.assertEqual(sorted(ran), [2, 3])
+        self.assertEqual((started, deferred), (2, 1))
+        self.assertTrue(scheduler.is_chat_blocked(1))
+        self.assertFalse(scheduler.is_chat_blocked(2))
+
+    async def test_jobs_run_concurrently_up_to_limit(self):
+        scheduler = WidgetEditScheduler(
+            global_edits_per_sec=1000,
+            per_chat_interval_sec=0.001,
+            max_concurrency=4,
+        )
+        active = 0
+        peak = 0
+
+        async def job():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+        started_at = time.monotonic()
+        await scheduler.run_all((chat_id, job) for chat_id in range(12))
+        elapsed = time.monotonic() - started_at
+
+        self.assertEqual(peak, 4)
+        self.assertLess(elapsed, 0.5)
+
+    async def test_global_budget_is_split_between_workers(self):
+        scheduler = WidgetEditScheduler(global_edits_per_sec=24)
+
+        scheduler.share_global_budget(3)
+        self.assertEqual(scheduler.global_limiter.rate_per_sec, 8)
+        self.assertEqual(scheduler.global_limiter.burst, 8)
+        scheduler.share_global_budget(1)
+        self.assertEqual(scheduler.global_limiter.rate_per_sec, 24)
+
+    async def test_busy_chat_does_not_hold_slots_while_waiting(self):
+        scheduler = WidgetEditScheduler(
+            global_edits_per_sec=1000,
+            per_chat_interval_sec=0.2,
+            max_concurrency=2,
+        )
+        ran = []
+        in_flight = {}
+        peak_per_chat = 0
+
+        async def job(chat_id):
+            nonlocal peak_per_chat
+            # Like update_widget_message, each edit takes the chat's slot.
+            await scheduler.acquire(chat_id)
+            in_flight[chat_id] = in_flight.get(chat_id, 0) + 1
+            peak_per_chat = max(peak_per_chat, in_flight[chat_id])
+            ran.append(chat_id)
+            await asyncio.sleep(0)
+            in_flight[chat_id] -= 1
+
+        busy = [(1, lambda: job(1)) for _ in range(3)]
+        others = [(chat_id, lambda chat_id=chat_id: job(chat_id)) for chat_id in range(2, 8)]
+        started, deferred = await scheduler.run_all(busy + others)
+
+        self.assertEqual((started, deferred), (9, 0))
+        self.assertEqual(peak_per_chat, 1)
+        # Every other chat is served while chat 1 waits out its interval.
+        self.assertEqual(ran.index(1), 0)
+        self.assertEqual(sorted(ran[1:7]), list(range(2, 8)))
+        self.assertEqual(ran[7:], [1, 1])
+
+    async def test_per_chat_interval_spaces_edits(self):
+        scheduler = WidgetEditScheduler(
+            global_edits_per_sec=1000,
+            per_chat_interval_sec=0.1,
+            max_concurrency=4,
+        )
+        started_at = time.monotonic()
+        await scheduler.acquire(7)
+        await scheduler.acquire(8)
+        self.assertLess(time.monotonic() - started_at, 0.05)
+        await scheduler.acquire(7)
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.09)
+
+
+class WidgetDeadlineHeapTest(unittest.TestCase):
+    def test_pop_due_returns_earliest_first_and_skips_rescheduled(self):
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        heap = WidgetDeadlineHeap()
+        heap.schedule(1, now + timedelta(seconds=30))
+        heap.schedule(2, now - timedelta(seconds=5))
+        heap.schedule(3, now - timedelta(seconds=10))
+        heap.schedule(2, now + timedelta(seconds=60))
+        heap.remove(1)
+
+        self.assertEqual(heap.pop_due(now), [3])
+        self.assertEqual(heap.next_deadline(), now + timedelta(seconds=60))
+        self.assertEqual(len(heap), 1)
+        self.assertEqual(heap.pop_due(now + timedelta(seconds=60)), [2])
+        self.assertIsNone(heap.next_deadline())
+
+
+if __name__ == "__main__":
+    unittest.main()
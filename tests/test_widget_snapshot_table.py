@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+from app import widget_markets
+
+
+class WidgetSnapshotTableTest(unittest.IsolatedAsyncioTestCase):
+    async def test_union_of_aliases_is_fetched_once(self):
+        fetched = []
+
+        async def fake_fetch(market_id):
+            fetched.append(market_id)
+            return {"title": f"Market {market_id}", "yes_price": 0.4, "no_price": 0.6}
+
+        widgets = [
+            ["metamask", "base"],
+            ["base", "metamask"],
+            ["metamask", "base", "abstract"],
+        ]
+        aliases = [alias for selected in widgets for alias in selected]
+
+        before = widget_markets.get_fetch_count()
+        with mock.patch.object(widget_markets, "fetch_market", side_effect=fake_fetch):
+            table = await widget_markets.get_market_snapshot_table(aliases)
+
+        self.assertEqual(set(table), {"metamask", "base", "abstract"})
+        self.assertEqual(len(fetched), 3)
+        self.assertEqual(widget_markets.get_fetch_count() - before, 3)
+
+        rows = widget_markets.snapshots_from_table(table, ["base", "metamask"])
+        self.assertEqual([row["alias"] for row in rows], ["base", "metamask"])
+        self.assertAlmostEqual(rows[0]["yes_value"], 0.4)
+
+    async def test_failed_fetch_yields_placeholder_row(self):
+        async def failing_fetch(market_id):
+            raise RuntimeError("boom")
+
+        with mock.patch.object(widget_markets, "fetch_market", side_effect=failing_fetch):
+            table = await widget_markets.get_market_snapshot_table(["metamask"])
+
+        self.assertIsNone(table["metamask"]["yes_value"])
+        self.assertIsNone(table["metamask"]["no_value"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from telegram import Bot
+
+from app import widget_worker
+
+
+TOKEN = "123456:TEST"
+EDITS = 8
+
+
+class WidgetBotConnectionPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.active = 0
+        self.peak = 0
+
+        async def get_me(request):
+            return web.json_response(
+                {"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "bot", "username": "test_bot"}}
+            )
+
+        async def edit_message_text(request):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            # Holds the request like a slow Bot API round trip.
+            await asyncio.sleep(0.2)
+            self.active -= 1
+            return web.json_response({"ok": True, "result": True})
+
+        app = web.Application()
+        app.router.add_post(f"/bot{TOKEN}/getMe", get_me)
+        app.router.add_post(f"/bot{TOKEN}/editMessageText", edit_message_text)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+        self.base_url = str(self.server.make_url("/bot"))
+
+    async def edit_concurrently(self, bot: Bot) -> None:
+        async with bot:
+            await asyncio.gather(*(
+                bot.edit_message_text(chat_id=chat_id, message_id=1, text="widget")
+                for chat_id in range(EDITS)
+            ))
+
+    async def test_worker_bot_sends_edits_in_parallel(self):
+        await self.edit_concurrently(widget_worker.build_bot(TOKEN, base_url=self.base_url))
+        self.assertEqual(self.peak, EDITS)
+
+    async def test_default_bot_serializes_edits(self):
+        # Why the worker sizes its pool: PTB's default request has one connection.
+        await self.edit_concurrently(Bot(TOKEN, base_url=self.base_url))
+        self.assertEqual(self.peak, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()